@@ -0,0 +1,664 @@
+"""
+Execution backends for the operations of the companies (agents), i.e. pre_inform, inform and receive.
+"""
+
+from abc import abstractmethod
+import asyncio
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext
+import contextvars
+import functools
+import io
+import multiprocessing
+from multiprocessing.connection import wait
+from multiprocessing.shared_memory import SharedMemory
+import os
+import pickle
+import signal
+import time
+import traceback
+
+from loguru import logger
+
+from mable.profiling import wrap_agent_operation, PROFILE_SECTION_AGENTS, PROFILE_SECTION_COMPANIES
+from mable.simulation_environment import SimulationEngineAware
+
+
+OPERATION_PRE_INFORM = "pre_inform"
+OPERATION_INFORM = "inform"
+OPERATION_RECEIVE = "receive"
+
+RESULT_OK = "ok"
+RESULT_ERROR = "error"
+RESULT_INTERRUPTED = "interrupted"
+
+
+class AgentRuntime(SimulationEngineAware):
+    """
+    Runs the operations of several companies concurrently with a timeout per company.
+    """
+
+    @abstractmethod
+    def run_operations(self, operation_name, companies, args_per_company, timeout=60, profiler=None):
+        """
+        Run one operation for each company concurrently.
+
+        If a company's operation runs into an exception or does not finish in time, a message is logged and the
+        result for the company is None.
+
+        :param operation_name: The name of the operation, e.g. :py:const:`OPERATION_INFORM`.
+        :type operation_name: str
+        :param companies: The companies.
+        :type companies: list[ShippingCompany]
+        :param args_per_company: The positional arguments of the operation for each company.
+        :type args_per_company: list[tuple]
+        :param timeout: The time in seconds every company has to finish the operation. Default is 60 seconds.
+        :type timeout: float
+        :param profiler: A profiler to record the time of the operations. Default is None (no profiling).
+        :type profiler: SimulationProfiler | None
+        :return: The results in the order of the companies.
+        :rtype: list
+        """
+        pass
+
+    def start_operations(self, operation_name, companies, args_per_company, timeout=60, profiler=None):
+        """
+        Start one operation for each company in the background, i.e. without waiting for the operations to finish.
+        The results of the operations are discarded.
+
+        Any later operation of one of the companies first waits for the company's background operation
+        (see :py:func:`wait_for_background_operations`). Each background operation has to finish within the timeout
+        counted from its start.
+
+        The default implementation runs the operations via :py:func:`run_operations`, i.e. not in the background.
+
+        :param operation_name: The name of the operation, e.g. :py:const:`OPERATION_PRE_INFORM`.
+        :type operation_name: str
+        :param companies: The companies.
+        :type companies: list[ShippingCompany]
+        :param args_per_company: The positional arguments of the operation for each company.
+        :type args_per_company: list[tuple]
+        :param timeout: The time in seconds every company has to finish the operation. Default is 60 seconds.
+        :type timeout: float
+        :param profiler: A profiler to record the time of the operations. Default is None (no profiling).
+        :type profiler: SimulationProfiler | None
+        """
+        self.run_operations(operation_name, companies, args_per_company, timeout=timeout, profiler=profiler)
+
+    @property
+    def isolates_background_operations(self):
+        """
+        :return: True if background operations cannot observe the simulation changing while they run.
+            The default implementation of :py:func:`start_operations` does not run the operations in the background
+            and hence isolates them.
+        :rtype: bool
+        """
+        return True
+
+    def wait_for_background_operations(self, companies=None):
+        """
+        Wait until the background operations of the companies have finished or have run out of time.
+
+        :param companies: The companies. Default is None which waits for all background operations.
+        :type companies: list[ShippingCompany] | None
+        """
+        pass
+
+    def close(self):
+        """
+        Release all resources. Called by the engine when the simulation has finished.
+        """
+        pass
+
+
+class _BackgroundOperation:
+    """
+    An operation of a company that runs in the background.
+    """
+
+    def __init__(self, operation_name, company, handle, deadline, timeout):
+        self.operation_name = operation_name
+        self.company = company
+        self.handle = handle
+        self.deadline = deadline
+        self.timeout = timeout
+
+
+def _split_background_operations(background_operations, companies):
+    """
+    :param background_operations: The background operations.
+    :type background_operations: list[_BackgroundOperation]
+    :param companies: The companies or None for all companies.
+    :type companies: list[ShippingCompany] | None
+    :return: The background operations of the companies and all others.
+    :rtype: tuple[list[_BackgroundOperation], list[_BackgroundOperation]]
+    """
+    if companies is None:
+        return background_operations, []
+    company_ids = {id(one_company) for one_company in companies}
+    operations_of_companies = []
+    other_operations = []
+    for one_operation in background_operations:
+        if id(one_operation.company) in company_ids:
+            operations_of_companies.append(one_operation)
+        else:
+            other_operations.append(one_operation)
+    return operations_of_companies, other_operations
+
+
+class ThreadAgentRuntime(AgentRuntime):
+    """
+    Runs the operations in threads of the main process. Operations that time out are abandoned but their threads
+    keep running until the operations finish.
+
+    The runtime keeps one event loop and one pool of worker threads for all operations of a simulation.
+    Since abandoned operations still occupy their threads, the pool is replaced after an operation has timed out.
+
+    :param max_workers: The maximum number of worker threads. Default is None which uses one thread per company
+        such that no operation waits for another operation's thread and each timeout only covers the operation's
+        own run time. With fewer threads the timeout also includes the time waiting for a thread.
+    :type max_workers: int | None
+    """
+
+    def __init__(self, max_workers=None):
+        super().__init__()
+        self._max_workers = max_workers
+        self._loop = None
+        self._executor = None
+        self._executor_size = 0
+        self._has_abandoned_operations = False
+        self._background_operations = []
+
+    @property
+    def isolates_background_operations(self):
+        """
+        :return: False since background operations run in threads that read the live simulation.
+        :rtype: bool
+        """
+        return False
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_loop"] = None
+        state["_executor"] = None
+        state["_executor_size"] = 0
+        state["_has_abandoned_operations"] = False
+        state["_background_operations"] = []
+        return state
+
+    def _get_loop(self):
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    def _get_executor(self, number_of_operations):
+        """
+        :param number_of_operations: The number of operations that are about to run.
+        :type number_of_operations: int
+        :return: The pool of worker threads. A new pool is created if there is none, if operations have been
+            abandoned or if the pool has no fixed size and is too small.
+        :rtype: ThreadPoolExecutor
+        """
+        if self._max_workers is not None:
+            required_size = self._max_workers
+        else:
+            required_size = number_of_operations
+            if self._engine is not None:
+                required_size = max(required_size, len(self._engine.shipping_companies))
+        required_size = max(required_size, 1)
+        if (self._executor is None
+                or self._has_abandoned_operations
+                or (self._max_workers is None and self._executor_size < required_size)):
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=required_size, thread_name_prefix="agent")
+            self._executor_size = required_size
+            self._has_abandoned_operations = False
+        return self._executor
+
+    def run_operations(self, operation_name, companies, args_per_company, timeout=60, profiler=None):
+        self.wait_for_background_operations(companies)
+        executor = self._get_executor(len(companies))
+        return self._get_loop().run_until_complete(
+            self._run_all_operations(executor, operation_name, companies, args_per_company, timeout, profiler))
+
+    async def _run_all_operations(self, executor, operation_name, companies, args_per_company, timeout, profiler):
+        return await asyncio.gather(*[
+            self._run_operation(executor, operation_name, one_company, one_args, timeout, profiler)
+            for one_company, one_args in zip(companies, args_per_company)])
+
+    @staticmethod
+    def _get_operation(operation_name, company, args, profiler):
+        operation = wrap_agent_operation(profiler, company, operation_name, getattr(company, operation_name))
+        # Run in a copy of the current context as asyncio.to_thread does.
+        return functools.partial(contextvars.copy_context().run, operation, *args)
+
+    async def _run_operation(self, executor, operation_name, company, args, timeout, profiler):
+        result = None
+        operation = self._get_operation(operation_name, company, args, profiler)
+        try:
+            result = await asyncio.wait_for(asyncio.get_running_loop().run_in_executor(executor, operation),
+                                            timeout=timeout)
+        except asyncio.TimeoutError:
+            self._has_abandoned_operations = True
+            logger.warning(f"Company {company.name} was stopped from operating '{operation_name}'"
+                           f" after {timeout} seconds.")
+        except Exception:
+            logger.error(f"Company {company.name} ran into an exception while operating '{operation_name}'.")
+        return result
+
+    def start_operations(self, operation_name, companies, args_per_company, timeout=60, profiler=None):
+        self.wait_for_background_operations(companies)
+        executor = self._get_executor(len(companies))
+        deadline = time.perf_counter() + timeout
+        for one_company, one_args in zip(companies, args_per_company):
+            future = executor.submit(self._get_operation(operation_name, one_company, one_args, profiler))
+            self._background_operations.append(
+                _BackgroundOperation(operation_name, one_company, future, deadline, timeout))
+
+    def wait_for_background_operations(self, companies=None):
+        if len(self._background_operations) == 0:
+            return
+        waiting_operations, self._background_operations = _split_background_operations(
+            self._background_operations, companies)
+        for one_operation in waiting_operations:
+            try:
+                one_operation.handle.result(timeout=max(one_operation.deadline - time.perf_counter(), 0))
+            except concurrent.futures.TimeoutError:
+                self._has_abandoned_operations = True
+                logger.warning(f"Company {one_operation.company.name} was stopped from operating"
+                               f" '{one_operation.operation_name}' after {one_operation.timeout} seconds.")
+            except Exception:
+                logger.error(f"Company {one_operation.company.name} ran into an exception while operating"
+                             f" '{one_operation.operation_name}'.")
+
+    def close(self):
+        self._background_operations = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._executor_size = 0
+            self._has_abandoned_operations = False
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+
+
+def default_agent_runtime(agent_runtime=None):
+    """
+    Context manager for operations that run with a given runtime or, if none is given, a temporary
+    :py:class:`ThreadAgentRuntime` which is closed on exit. A given runtime is not closed.
+
+    :param agent_runtime: The runtime or None.
+    :type agent_runtime: AgentRuntime | None
+    :return: A context manager that provides the runtime.
+    """
+    if agent_runtime is not None:
+        return nullcontext(agent_runtime)
+    return closing(ThreadAgentRuntime())
+
+
+class _EngineReferences:
+    """
+    Pickles objects of a simulation such that the engine, the world, the network, the ports, the companies and
+    the vessels are only referenced. Unpickling resolves these references to the respective objects of the
+    engine in the unpickling process.
+    """
+
+    def __init__(self, engine):
+        network = engine.world.network
+        self._objects = {"engine": engine, "world": engine.world, "network": network}
+        for one_port in getattr(network, "ports", []):
+            self._objects[("port", one_port.name)] = one_port
+        for company_index, one_company in enumerate(engine.shipping_companies):
+            self._objects[("company", company_index)] = one_company
+            for vessel_index, one_vessel in enumerate(one_company.fleet):
+                self._objects[("vessel", company_index, vessel_index)] = one_vessel
+        self._persistent_ids = {id(one_object): pid for pid, one_object in self._objects.items()}
+
+    def get_company_index(self, company):
+        """
+        :param company: A company of the engine.
+        :type company: ShippingCompany
+        :return: The index of the company in the engine's companies.
+        :rtype: int
+        """
+        return self._persistent_ids[id(company)][1]
+
+    def dumps(self, obj):
+        buffer = io.BytesIO()
+        pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = lambda o: self._persistent_ids.get(id(o))
+        pickler.dump(obj)
+        return buffer.getvalue()
+
+    def loads(self, data):
+        unpickler = pickle.Unpickler(io.BytesIO(data))
+        unpickler.persistent_load = lambda pid: self._objects[tuple(pid) if isinstance(pid, list) else pid]
+        return unpickler.load()
+
+
+class _AgentOperationInterrupted(Exception):
+    """
+    Raised in an agent worker when the main process interrupts the current operation.
+    """
+    pass
+
+
+_worker_is_operating = False
+
+
+def _interrupt_agent_operation(signal_number, frame):
+    if _worker_is_operating:
+        raise _AgentOperationInterrupted()
+
+
+def _run_agent_worker(connection, engine, company_index):
+    """
+    The main loop of an agent worker process. The process is forked from the main process and hence has its own
+    copy of the engine, including the network and the company.
+
+    Every message consists of the operation name, the name and size of the shared memory with the current view of
+    the simulation (time and all vessels) and the pickled arguments. The view is applied before the operation is
+    run. The reply consists of the result status, the pickled result (or an error description) and the CPU time.
+
+    :param connection: The connection to the main process.
+    :param engine: The (copy of the) engine.
+    :type engine: SimulationEngine
+    :param company_index: The index of the worker's company in the engine's companies.
+    :type company_index: int
+    """
+    global _worker_is_operating
+    signal.signal(signal.SIGUSR1, _interrupt_agent_operation)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    references = _EngineReferences(engine)
+    company = engine.shipping_companies[company_index]
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        operation_name, view_name, view_size, args_data = message
+        cpu_start = time.process_time()
+        try:
+            view_memory = SharedMemory(name=view_name)
+            try:
+                view = references.loads(bytes(view_memory.buf[:view_size]))
+            finally:
+                view_memory.close()
+            engine.world.set_current_time(view["time"])
+            for one_company, fleet_states in zip(engine.shipping_companies, view["fleets"]):
+                for one_vessel, one_vessel_state in zip(one_company.fleet, fleet_states):
+                    one_vessel.__dict__.update(one_vessel_state)
+            args = references.loads(args_data)
+            _worker_is_operating = True
+            try:
+                result = getattr(company, operation_name)(*args)
+            finally:
+                _worker_is_operating = False
+            if operation_name == OPERATION_RECEIVE:
+                result = engine.pop_new_schedules(company)
+            reply = (RESULT_OK, references.dumps(result))
+        except _AgentOperationInterrupted:
+            reply = (RESULT_INTERRUPTED, None)
+        except Exception:
+            reply = (RESULT_ERROR, traceback.format_exc())
+        connection.send(reply + (time.process_time() - cpu_start,))
+
+
+class _AgentWorker:
+    """
+    The main process' handle of an agent worker process.
+    """
+
+    def __init__(self, process, connection):
+        self.process = process
+        self.connection = connection
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class _OperationBatch:
+    """
+    Operations that were sent to the workers together and share one view in shared memory.
+    """
+
+    def __init__(self, operation_name, companies, view_memory, timeout, profiler):
+        self.operation_name = operation_name
+        self.companies = companies
+        self.view_memory = view_memory
+        self.timeout = timeout
+        self.profiler = profiler
+        self.start_time = time.perf_counter()
+        self.results = [None] * len(companies)
+        self.pending = {}
+
+    def release(self):
+        """
+        Release the shared memory of the view.
+        """
+        if self.view_memory is not None:
+            self.view_memory.close()
+            self.view_memory.unlink()
+            self.view_memory = None
+
+
+class ProcessAgentRuntime(AgentRuntime):
+    """
+    Runs the operations of each company in a persistent worker process that is forked from the main process when
+    the company's first operation is run. Hence, the workers start with a copy of the simulation including the
+    network, which is used for all routing of the company.
+
+    Before each operation, the current view of the simulation (time and state of all vessels) is placed in shared
+    memory from which all workers update their copies. Schedules that a company applies in 'receive' are sent back
+    and added to the engine.
+
+    If an operation does not finish in time, the operation is interrupted. If the worker does not respond to the
+    interrupt within a grace period it is killed and a new worker is forked with the next operation. In this case
+    the company's state is the state of the company in the main process, i.e. the state at the start of the
+    simulation.
+
+    Requires the 'fork' start method, i.e. a POSIX system.
+    """
+
+    def __init__(self, interrupt_grace_period=1):
+        """
+        :param interrupt_grace_period: The time in seconds an interrupted worker has to stop the operation before
+            it is killed. Default is 1 second.
+        :type interrupt_grace_period: float
+        :raises ValueError: If the 'fork' start method is not available.
+        """
+        super().__init__()
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise ValueError("Process isolated agents require the 'fork' start method.")
+        self._interrupt_grace_period = interrupt_grace_period
+        self._workers = {}
+        self._references = None
+        self._background_batches = []
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_workers"] = {}
+        state["_references"] = None
+        state["_background_batches"] = []
+        return state
+
+    @property
+    def isolates_background_operations(self):
+        """
+        :return: True since the workers operate on their own copy of the simulation.
+        :rtype: bool
+        """
+        return True
+
+    def _get_references(self):
+        if self._references is None:
+            self._references = _EngineReferences(self._engine)
+        return self._references
+
+    def _get_worker(self, company_index):
+        worker = self._workers.get(company_index)
+        if worker is None or not worker.process.is_alive():
+            context = multiprocessing.get_context("fork")
+            parent_connection, child_connection = context.Pipe()
+            company = self._engine.shipping_companies[company_index]
+            process = context.Process(target=_run_agent_worker,
+                                      args=(child_connection, self._engine, company_index),
+                                      name=f"Agent worker {company.name}",
+                                      daemon=True)
+            process.start()
+            child_connection.close()
+            worker = _AgentWorker(process, parent_connection)
+            self._workers[company_index] = worker
+        return worker
+
+    def _get_view(self):
+        """
+        :return: The time and the state of all vessels of all companies.
+        :rtype: dict
+        """
+        return {
+            "time": self._engine.world.current_time,
+            "fleets": [[one_vessel.__dict__ for one_vessel in one_company.fleet]
+                       for one_company in self._engine.shipping_companies]
+        }
+
+    def run_operations(self, operation_name, companies, args_per_company, timeout=60, profiler=None):
+        self.wait_for_background_operations(companies)
+        batch = self._send_operations(operation_name, companies, args_per_company, timeout, profiler)
+        return self._collect_operations(batch)
+
+    def start_operations(self, operation_name, companies, args_per_company, timeout=60, profiler=None):
+        self.wait_for_background_operations(companies)
+        self._background_batches.append(
+            self._send_operations(operation_name, companies, args_per_company, timeout, profiler))
+
+    def wait_for_background_operations(self, companies=None):
+        if len(self._background_batches) == 0:
+            return
+        company_ids = None if companies is None else {id(one_company) for one_company in companies}
+        remaining_batches = []
+        for one_batch in self._background_batches:
+            if company_ids is None or any(id(one_company) in company_ids for one_company in one_batch.companies):
+                self._collect_operations(one_batch)
+            else:
+                remaining_batches.append(one_batch)
+        self._background_batches = remaining_batches
+
+    def _send_operations(self, operation_name, companies, args_per_company, timeout, profiler):
+        """
+        Place the current view in shared memory and send the operations to the workers.
+
+        :return: The batch of sent operations.
+        :rtype: _OperationBatch
+        """
+        references = self._get_references()
+        view_data = references.dumps(self._get_view())
+        view_memory = SharedMemory(create=True, size=max(len(view_data), 1))
+        batch = _OperationBatch(operation_name, companies, view_memory, timeout, profiler)
+        try:
+            view_memory.buf[:len(view_data)] = view_data
+            for one_result_index, (one_company, one_args) in enumerate(zip(companies, args_per_company)):
+                company_index = references.get_company_index(one_company)
+                worker = self._get_worker(company_index)
+                worker.connection.send((operation_name, view_memory.name, len(view_data), references.dumps(one_args)))
+                batch.pending[worker.connection] = (one_result_index, company_index, one_company)
+        except BaseException:
+            batch.release()
+            raise
+        return batch
+
+    def _collect_operations(self, batch):
+        """
+        Receive the results of a batch of operations until the batch's deadline and interrupt the workers that
+        have not finished by then.
+
+        :param batch: The batch.
+        :type batch: _OperationBatch
+        :return: The results in the order of the batch's companies.
+        :rtype: list
+        """
+        try:
+            deadline = batch.start_time + batch.timeout
+            while len(batch.pending) > 0:
+                ready_connections = wait(list(batch.pending.keys()), timeout=max(deadline - time.perf_counter(), 0))
+                if len(ready_connections) == 0:
+                    break
+                for one_connection in ready_connections:
+                    one_result_index, company_index, one_company = batch.pending.pop(one_connection)
+                    batch.results[one_result_index] = self._receive_result(
+                        batch.operation_name, company_index, one_company, time.perf_counter() - batch.start_time,
+                        batch.profiler)
+            for one_result_index, company_index, one_company in batch.pending.values():
+                logger.warning(f"Company {one_company.name} was stopped from operating '{batch.operation_name}'"
+                               f" after {batch.timeout} seconds.")
+                self._interrupt_worker(company_index)
+            batch.pending = {}
+        finally:
+            batch.release()
+        return batch.results
+
+    def _receive_result(self, operation_name, company_index, company, wall_time, profiler):
+        result = None
+        worker = self._workers[company_index]
+        try:
+            status, payload, cpu_time = worker.connection.recv()
+        except EOFError:
+            logger.error(f"The worker of company {company.name} died while operating '{operation_name}'.")
+            worker.kill()
+            del self._workers[company_index]
+            return result
+        if profiler is not None:
+            profiler.add(PROFILE_SECTION_AGENTS, operation_name, wall_time, cpu_time)
+            profiler.add(PROFILE_SECTION_COMPANIES, f"{company.name}.{operation_name}", wall_time, cpu_time)
+        if status == RESULT_OK:
+            result = self._get_references().loads(payload)
+            if operation_name == OPERATION_RECEIVE:
+                for one_time, one_schedules in result.items():
+                    self._engine.add_new_schedules(company, one_schedules, one_time)
+                result = None
+        else:
+            logger.error(f"Company {company.name} ran into an exception while operating '{operation_name}'.")
+            logger.debug(payload)
+        return result
+
+    def _interrupt_worker(self, company_index):
+        """
+        Interrupt the current operation of a worker and kill the worker if it does not stop in time.
+
+        :param company_index: The index of the worker's company.
+        :type company_index: int
+        """
+        worker = self._workers[company_index]
+        try:
+            os.kill(worker.process.pid, signal.SIGUSR1)
+            is_stopped = worker.connection.poll(self._interrupt_grace_period)
+            if is_stopped:
+                worker.connection.recv()
+        except (OSError, EOFError):
+            is_stopped = False
+        if not is_stopped:
+            worker.kill()
+            del self._workers[company_index]
+
+    def close(self):
+        for one_batch in self._background_batches:
+            one_batch.release()
+        self._background_batches = []
+        for one_worker in self._workers.values():
+            try:
+                one_worker.connection.send(None)
+            except OSError:
+                pass
+            one_worker.process.join(self._interrupt_grace_period)
+            if one_worker.process.is_alive():
+                one_worker.kill()
+            else:
+                one_worker.connection.close()
+        self._workers = {}
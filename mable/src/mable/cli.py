@@ -10,6 +10,8 @@ import argcomplete
 from loguru import logger
 from prettytable import PrettyTable
 
+from mable.metrics import get_company_performance
+
 
 class ArgumentParserExtensions:
     """
@@ -70,20 +72,12 @@ def task_metrics_overview(parsed_args):
     print(f"Overview for {metrics_file_name}.")
     with open(metrics_file_name, "r") as f:
         metrics = json.load(f)
-    for one_company_key in metrics["company_metrics"]:
-        company_name = metrics["company_names"][one_company_key]
-        print(f"Company {company_name}")
-        cost = 0
-        if "fuel_cost" in metrics["company_metrics"][one_company_key]:
-            cost = metrics["company_metrics"][one_company_key]["fuel_cost"]
-        penalty = metrics["global_metrics"]["penalty"][one_company_key]
-        revenue = 0
-        all_outcomes = metrics["global_metrics"]["auction_outcomes"]
-        all_outcomes_company_per_round = [d[one_company_key] for d in all_outcomes if one_company_key in d]
-        all_outcomes_company = [x for sublist in all_outcomes_company_per_round for x in sublist]
-        all_payments = [d["payment"] for d in all_outcomes_company]
-        revenue += sum(all_payments)
-        income = revenue - cost - penalty
+    for one_company_performance in get_company_performance(metrics).values():
+        print(f"Company {one_company_performance['name']}")
+        cost = one_company_performance["cost"]
+        penalty = one_company_performance["penalty"]
+        revenue = one_company_performance["revenue"]
+        income = one_company_performance["income"]
         table = PrettyTable()
         table.field_names = ["Name", "Value"]
         table.align["Value"] = "r"
@@ -94,6 +88,36 @@ def task_metrics_overview(parsed_args):
         print(table)
 
 
+def task_profile_overview(parsed_args):
+    """
+    Generate an overview of where the time of a profiled simulation went.
+
+    :param parsed_args:
+        The parameter from the arg parser.
+        - file: str: the name of the profile file.
+    :type parsed_args: dict
+    """
+    profile_file_name = parsed_args["file"]
+    print(f"Profile for {profile_file_name}.")
+    with open(profile_file_name, "r") as f:
+        profile = json.load(f)
+    for section, section_entries in profile.items():
+        print(f"Section {section}")
+        total_wall_time = sum(entry["wall_time"] for entry in section_entries.values())
+        table = PrettyTable()
+        table.field_names = ["Name", "Count", "Wall Time (s)", "CPU Time (s)", "Wall Time per Call (ms)", "Share"]
+        for field_name in table.field_names[1:]:
+            table.align[field_name] = "r"
+        table.align["Name"] = "l"
+        sorted_entries = sorted(section_entries.items(), key=lambda item: item[1]["wall_time"], reverse=True)
+        for key, entry in sorted_entries:
+            time_per_call = entry["wall_time"] / entry["count"] * 1000 if entry["count"] > 0 else 0
+            share = entry["wall_time"] / total_wall_time if total_wall_time > 0 else 0
+            table.add_row([key, entry["count"], round(entry["wall_time"], 3), round(entry["cpu_time"], 3),
+                           round(time_per_call, 3), f"{share:.1%}"])
+        print(table)
+
+
 def select_task(parsed_args):
     """
     Calls the respective function for the task as specified by the cmd args.
@@ -104,6 +128,8 @@ def select_task(parsed_args):
     task = parsed_args["task"]
     if task == "overview":
         task_metrics_overview(parsed_args)
+    elif task == "profile":
+        task_profile_overview(parsed_args)
     else:
         logger.error(f"Unknown task {task}")
 
@@ -137,6 +163,17 @@ def main():
         type=lambda x: ArgumentParserExtensions.is_valid_file(x, overview_parser),
         help="Filename for which to produce the overview."
     )
+    # Profile
+    profile_parser = task_parsers.add_parser(
+        'profile',
+        parents=[],
+        help='Show where the time of a profiled simulation went.'
+    )
+    profile_parser.add_argument(
+        'file',
+        type=lambda x: ArgumentParserExtensions.is_valid_file(x, profile_parser),
+        help="Profile filename for which to produce the overview."
+    )
     argcomplete.autocomplete(parser)
     args = parser.parse_args()
     args = vars(args)
@@ -1,4 +1,3 @@
-import asyncio
 import importlib.util
 import pathlib
 from pathlib import Path
@@ -7,6 +6,7 @@ import sys
 
 import loguru
 
+from mable.agent_runtime import OPERATION_RECEIVE
 from mable.cargo_bidding import TradingCompany
 from mable.engine import SimulationEngine
 from mable.event_management import CargoAnnouncementEvent, CargoEvent, FirstCargoAnnouncementEvent
@@ -14,6 +14,7 @@ from mable.extensions.cargo_distributions import DistributionShipping
 from mable.extensions.fuel_emissions import FuelClassFactory, FuelSimulationFactory
 from mable.shipping_market import AuctionMarket, StaticShipping, AuctionAllocationResult
 from mable.simulation_de_serialisation import SimulationSpecification
+from mable.transportation_scheduling import ArraySchedule
 import mable.instructions as instructions
 
 if TYPE_CHECKING:
@@ -25,6 +26,16 @@ logger = loguru.logger
 
 class AuctionSimulationEngine(SimulationEngine):
 
+    def run_until_next_auction(self):
+        """
+        Run the simulation until right before the next auction, e.g. to take a snapshot of or fork the simulation
+        before the auction. See :py:func:`SimulationEngine.run_until`.
+
+        :return: The next auction event or None if no events are left.
+        :rtype: AuctionCargoEvent | None
+        """
+        return self.run_until(lambda event: isinstance(event, AuctionCargoEvent))
+
     def _set_up_trades(self):
         if isinstance(self.shipping, DistributionShipping):
             for one_time in self._shipping.get_trading_times():
@@ -84,35 +95,27 @@ class AuctionCargoEvent(CargoEvent):
         engine.headquarters.get_companies()  # Update vessel locations before informing companies
         all_trades = engine.shipping.get_trades(self.time)
         distribution_ledger = engine.market.distribute_trades(
-            self.time, all_trades, engine.shipping_companies, timeout=engine.global_agent_timeout)
+            self.time, all_trades, engine.shipping_companies, timeout=engine.global_agent_timeout,
+            profiler=engine.profiler, agent_runtime=engine.agent_runtime)
         all_allocated_contracts_per_company = [distribution_ledger[k] for k in distribution_ledger.keys()]
         all_allocated_trades = [contract.trade
                                 for on_company_trades in all_allocated_contracts_per_company
                                 for contract in on_company_trades]
-        unallocated_trades = [trade for trade in all_trades if trade not in all_allocated_trades]
+        all_allocated_trade_ids = {id(trade) for trade in all_allocated_trades}
+        unallocated_trades = [trade for trade in all_trades if id(trade) not in all_allocated_trade_ids]
         self._allocation_result = AuctionAllocationResult(distribution_ledger, unallocated_trades)
         num_awarded_trades = len(all_allocated_trades)
         self.info = f"Awarded {num_awarded_trades}/{len(all_trades)} trades"
-        for current_company in engine.shipping_companies:
-            asyncio.run(self._company_receive_timeout(
-                current_company, distribution_ledger, timeout=engine.global_agent_timeout))
+        # All companies share one read-only copy of the ledger.
+        sanitised_ledger_view = distribution_ledger.sanitised_ledger_view
+        engine.agent_runtime.run_operations(
+            OPERATION_RECEIVE, engine.shipping_companies,
+            [(distribution_ledger.get_trades_for_company_copy(current_company), sanitised_ledger_view)
+             for current_company in engine.shipping_companies],
+            timeout=engine.global_agent_timeout, profiler=engine.profiler)
         engine.apply_new_schedules(distribution_ledger)
         return distribution_ledger
 
-    @staticmethod
-    async def _company_receive_timeout(company, distribution_ledger, timeout=60):
-        try:
-            await asyncio.wait_for(
-                asyncio.to_thread(
-                    company.receive,
-                    distribution_ledger.get_trades_for_company_copy(company),
-                    distribution_ledger.sanitised_ledger),
-                timeout=timeout
-            )
-        except asyncio.TimeoutError:
-            logger.warning(f"Company {company.name} was stopped from operating 'receive' after {timeout} seconds.")
-        except Exception as e:
-            logger.error(f"Company {company.name} ran into an exception while operating 'receive'.")
 
 class AuctionClassFactory(FuelClassFactory):
 
@@ -155,6 +158,17 @@ class AuctionClassFactory(FuelClassFactory):
             return FuelClassFactory.generate_shipping(*args, **kwargs)
 
 
+class ArrayScheduleAuctionClassFactory(AuctionClassFactory):
+    """
+    An :py:class:`AuctionClassFactory` whose vessels' schedules are
+    :py:class:`mable.transportation_scheduling.ArraySchedule`.
+    """
+
+    @staticmethod
+    def generate_schedule(*args, **kwargs):
+        return ArraySchedule(*args, **kwargs)
+
+
 class CompetitionBuilder(FuelSimulationFactory):
 
     def generate_shipping_companies(self, *args, **kwargs):
@@ -2,7 +2,7 @@
 Safe distribution of information to companies.
 """
 import copy
-from typing import TYPE_CHECKING, Dict, List
+from typing import TYPE_CHECKING, Dict, List, Set
 
 from loguru import logger
 
@@ -139,24 +139,63 @@ class MarketAuthority:
 
     def __init__(self):
         self._contracts_per_company: Dict[ShippingCompany, List[Contract]] = {}
+        self._contract_index_per_company: Dict[ShippingCompany, Dict[Trade, Contract]] = {}
+        self._fulfilled_trades_per_company: Dict[ShippingCompany, Set[Trade]] = {}
 
     @property
     def contracts_per_company(self):
         """
-        :return: All contracts for all companies.
+        :return: All contracts for all companies. Contracts must only be added via :py:func:`add_allocation_results`.
         :rtype: Dict[ShippingCompany, List[Contract]]
         """
         return self._contracts_per_company
 
+    def get_contract(self, trade, company):
+        """
+        :param trade: The trade.
+        :type trade: Trade
+        :param company: The company.
+        :type company: ShippingCompany
+        :return: The company's contract for the trade or None if the trade was not awarded to the company.
+        :rtype: Contract | None
+        """
+        return self._contract_index_per_company.get(company, {}).get(trade)
+
+    def is_trade_awarded(self, trade, company):
+        """
+        :param trade: The trade.
+        :type trade: Trade
+        :param company: The company.
+        :type company: ShippingCompany
+        :return: True if the trade was awarded to the company.
+        :rtype: bool
+        """
+        return trade in self._contract_index_per_company.get(company, {})
+
+    def is_trade_fulfilled(self, trade, company):
+        """
+        :param trade: The trade.
+        :type trade: Trade
+        :param company: The company.
+        :type company: ShippingCompany
+        :return: True if the company fulfilled its contract for the trade.
+        :rtype: bool
+        """
+        return trade in self._fulfilled_trades_per_company.get(company, set())
+
     def trade_fulfilled(self, trade, company):
         """
         :param trade: The trade.
         :type trade: Trade
         :param company: The company fulfilling the trade.
         :type company: ShippingCompany
+        :raises ValueError: If the trade was not awarded to the company.
         """
-        contract_for_trade = next(c for c in self._contracts_per_company[company] if c.trade == trade)
+        contract_for_trade = self.get_contract(trade, company)
+        if contract_for_trade is None:
+            raise ValueError(f"Company {company.name} has no contract for trade {trade}.")
         contract_for_trade.fulfilled = True
+        self._fulfilled_trades_per_company.setdefault(company, set()).add(trade)
         logger.debug(f"Fulfilled contract: {contract_for_trade}")
 
     def add_allocation_results(self, allocation_results):
@@ -167,4 +206,10 @@ class MarketAuthority:
         for one_company in allocation_results.ledger.keys():
             if not one_company in self._contracts_per_company:
                 self._contracts_per_company[one_company] = []
-            self._contracts_per_company[one_company].extend(allocation_results.ledger[one_company])
+                self._contract_index_per_company[one_company] = {}
+            new_contracts = allocation_results.ledger[one_company]
+            self._contracts_per_company[one_company].extend(new_contracts)
+            contract_index = self._contract_index_per_company[one_company]
+            for one_contract in new_contracts:
+                # Keep the first contract for a trade as the search over the contracts did.
+                contract_index.setdefault(one_contract.trade, one_contract)
@@ -5,11 +5,15 @@ Module of the main engine that runs the simulation (loop).
 from __future__ import annotations
 
 from abc import abstractmethod
+import copy
 from typing import TYPE_CHECKING, Dict
 
 from loguru import logger
 
-from mable.event_management import EventExecutionData
+from mable.agent_runtime import ThreadAgentRuntime
+from mable.event_management import EventExecutionData, VesselEvent
+from mable.profiling import (SimulationProfiler, measure, PROFILE_SECTION_EVENTS, PROFILE_SECTION_OBSERVERS,
+                             PROFILE_SECTION_ENGINE)
 from mable.competition.information import CompanyHeadquarters, MarketAuthority
 
 if TYPE_CHECKING:
@@ -59,7 +63,8 @@ class SimulationEngine:
 
     def __init__(self, world, shipping_companies, cargo_generation, cargo_market, class_factory,
                  pre_run_cmds=None, post_run_cmds=None, output_directory=None, global_agent_timeout=60,
-                 info=None):
+                 info=None, profile=False, recorder=None, batch_events=False, agent_runtime=None,
+                 background_pre_inform=False):
         """
         Constructor.
 
@@ -89,10 +94,29 @@ class SimulationEngine:
         :type global_agent_timeout: int
         :param info: Any information on the type or setting of the simulation.
         :type info: str | dict
+        :param profile: If True, the wall and CPU time of events, observers, agent operations and schedule
+            application are recorded in :py:attr:`SimulationEngine.profiler`.
+        :type profile: bool
+        :param recorder: A recorder to record the run into a log for replays. Default is None (no recording).
+        :type recorder: mable.simulation_recording.SimulationRecorder | None
+        :param batch_events: If True, events that occur at the same time are processed in batches, see
+            :py:func:`SimulationEngine.step_batch`. Default is False.
+        :type batch_events: bool
+        :param agent_runtime: The backend that runs the companies' operations. Default is None which applies a
+            :py:class:`mable.agent_runtime.ThreadAgentRuntime`.
+        :type agent_runtime: mable.agent_runtime.AgentRuntime | None
+        :param background_pre_inform: If True, the companies' pre_inform operations run in the background while the
+            simulation continues until the companies' next operation, e.g. the inform of the announced auction.
+            Requires an agent runtime that isolates background operations from the simulation, e.g.
+            :py:class:`mable.agent_runtime.ProcessAgentRuntime`. Default is False.
+        :type background_pre_inform: bool
+        :raises ValueError: If background_pre_inform is True but the agent runtime does not isolate background
+            operations (see :py:attr:`mable.agent_runtime.AgentRuntime.isolates_background_operations`).
         """
         super().__init__()
         self._info = info
         self._event_observer = []
+        self._event_observer_dispatch_table = {}
         self._world = world
         self._shipping_companies = shipping_companies
         self._shipping = cargo_generation
@@ -111,6 +135,23 @@ class SimulationEngine:
         self._global_agent_timeout = global_agent_timeout
         self._market_authority = MarketAuthority()
         self._new_schedules = {}
+        self._vessel_company_index = None
+        self._has_started = False
+        self._has_finished = False
+        self._profiler = None
+        if profile:
+            self._profiler = SimulationProfiler()
+        self._recorder = recorder
+        self._batch_events = batch_events
+        self._agent_runtime = agent_runtime
+        if self._agent_runtime is None:
+            self._agent_runtime = ThreadAgentRuntime()
+        self._agent_runtime.set_engine(self)
+        if background_pre_inform and not self._agent_runtime.isolates_background_operations:
+            raise ValueError("Background pre_inform requires an agent runtime that isolates background operations"
+                             " from the simulation, e.g. ProcessAgentRuntime,"
+                             f" not {type(self._agent_runtime).__name__}.")
+        self._background_pre_inform = background_pre_inform
 
     @property
     def headquarters(self):
@@ -128,6 +169,46 @@ class SimulationEngine:
     def info(self):
         return self._info
 
+    @property
+    def profiler(self):
+        """
+        :return: The profiler or None if profiling is disabled.
+        :rtype: SimulationProfiler | None
+        """
+        return self._profiler
+
+    @property
+    def agent_runtime(self):
+        """
+        :return: The backend that runs the companies' operations.
+        :rtype: mable.agent_runtime.AgentRuntime
+        """
+        return self._agent_runtime
+
+    @property
+    def background_pre_inform(self):
+        """
+        :return: True if the companies' pre_inform operations run in the background.
+        :rtype: bool
+        """
+        return self._background_pre_inform
+
+    @property
+    def batch_events(self):
+        """
+        :return: True if events that occur at the same time are processed in batches.
+        :rtype: bool
+        """
+        return self._batch_events
+
+    @property
+    def recorder(self):
+        """
+        :return: The recorder or None if the run is not recorded.
+        :rtype: mable.simulation_recording.SimulationRecorder | None
+        """
+        return self._recorder
+
     def _pre_run(self):
         self._set_up_trades()
         for f in self._pre_run_cmds:
@@ -158,7 +239,8 @@ class SimulationEngine:
         if self._world.do_events_exists():
             next_event = self._world.get_next_event()
             data = EventExecutionData()
-            event_action_result = next_event.event_action(self)
+            with measure(self._profiler, PROFILE_SECTION_EVENTS, type(next_event).__name__):
+                event_action_result = next_event.event_action(self)
             data.action_data = event_action_result
         return next_event, data
 
@@ -168,15 +250,181 @@ class SimulationEngine:
 
         Start with adding all cargo events into the event queue.
         """
-        self._pre_run()
-        while self._world.do_events_exists():
+        self.run_until()
+
+    def run_until(self, stop_condition=None):
+        """
+        Run a simulation until the next event fulfils the stop condition or no events are left to deal with.
+        The pre run commands are executed on the first call and the post run commands once no events are left.
+
+        For example, to stop right before the next auction:
+
+        .. code-block:: python
+
+            engine.run_until(lambda event: isinstance(event, AuctionCargoEvent))
+
+        :param stop_condition: A function that receives the next event and returns True if the run should stop before
+            the event is processed. If None, the simulation runs until no events are left.
+        :type stop_condition: Callable[[Event], bool] | None
+        :return: The next (unprocessed) event or None if no events are left.
+        :rtype: Event | None
+        """
+        self._start()
+        next_event = self._world.peek_next_event()
+        while next_event is not None and (stop_condition is None or not stop_condition(next_event)):
+            if self._batch_events:
+                self.step_batch(stop_condition)
+            else:
+                self.step()
+            next_event = self._world.peek_next_event()
+        if next_event is None:
+            self._finish()
+        return next_event
+
+    def step(self):
+        """
+        Process the next event and notify the observers about it. The pre run commands are executed if the
+        simulation has not started yet.
+
+        :return: The processed event or None if no events were left.
+        :rtype: Event | None
+        """
+        self._start()
+        next_event, data = None, None
+        if self._world.do_events_exists():
             next_event, data = self._process_next_event()
             self.notify_event_observer(next_event, data)
-        self._post_run()
+        return next_event
+
+    def step_batch(self, stop_condition=None):
+        """
+        Process the next events that occur at the same time and notify the observers about them as one batch
+        (see :py:func:`mable.event_management.EventObserver.notify_batch`). The pre run commands are executed if the
+        simulation has not started yet.
+
+        A batch contains at most one event per vessel, so that the observers see each vessel in the state right
+        after its event. Further events at the same time are processed in the next batch.
+
+        :param stop_condition: A function that receives the next event and returns True if the batch should end
+            before the event is processed. The first event of the batch is always processed.
+        :type stop_condition: Callable[[Event], bool] | None
+        :return: The processed events. Empty if no events were left.
+        :rtype: list[Event]
+        """
+        self._start()
+        batch = []
+        batch_vessel_ids = set()
+        next_event = self._world.peek_next_event()
+        batch_time = None if next_event is None else next_event.time
+        while (next_event is not None
+               and next_event.time == batch_time
+               and (len(batch) == 0 or stop_condition is None or not stop_condition(next_event))):
+            if isinstance(next_event, VesselEvent):
+                if id(next_event.vessel) in batch_vessel_ids:
+                    break
+                batch_vessel_ids.add(id(next_event.vessel))
+            batch.append(self._process_next_event())
+            next_event = self._world.peek_next_event()
+        self.notify_event_observer_batch(batch)
+        return [one_event for one_event, _ in batch]
+
+    def _start(self):
+        """
+        Execute the pre run if the simulation has not started yet.
+        """
+        if not self._has_started:
+            self._has_started = True
+            if self._recorder is not None:
+                self._recorder.start(self)
+            self._pre_run()
+
+    def _finish(self):
+        """
+        Execute the post run if the simulation has not finished yet.
+        """
+        if not self._has_finished:
+            self._has_finished = True
+            if self._recorder is not None:
+                self._recorder.finish(self)
+            self._agent_runtime.close()
+            self._post_run()
+
+    def _get_snapshot_shared_objects(self):
+        """
+        The objects that are shared between an engine and its snapshots and forks instead of being copied.
+        These are objects that do not change over the course of a simulation (or cannot be copied), i.e. the
+        network including its ports, the class factory and the logger.
+
+        :return: The shared objects.
+        :rtype: list
+        """
+        shared_objects = [self._class_factory, logger]
+        if self._world is not None:
+            network = self._world.network
+            shared_objects.append(network)
+            shared_objects.extend(getattr(network, "ports", []))
+        return shared_objects
+
+    def _get_snapshot_memo(self):
+        """
+        A deepcopy memo that maps all shared objects to themselves.
+
+        :return: The memo.
+        :rtype: dict
+        """
+        return {id(one_object): one_object for one_object in self._get_snapshot_shared_objects()}
+
+    def snapshot(self):
+        """
+        Capture the current state of the simulation. This includes the world (clock, event queue and random),
+        companies with vessels and schedules, the market authority and the observers, e.g. metrics collectors.
+        Objects that do not change over the course of a simulation (see
+        :py:func:`SimulationEngine._get_snapshot_shared_objects`) are shared instead of copied.
+
+        All state, including the companies' state, has to be deep-copyable.
+
+        :return: The snapshot.
+        :rtype: SimulationSnapshot
+        """
+        engine_copy = copy.deepcopy(self, self._get_snapshot_memo())
+        return SimulationSnapshot(engine_copy)
+
+    def restore(self, snapshot):
+        """
+        Reset the simulation to the state of a snapshot. The snapshot stays unaffected and can be restored again.
+
+        Objects of the simulation (e.g. vessels or observers) are replaced by copies. Hence, references to such
+        objects that were obtained before the restore refer to objects that are no longer part of the simulation.
+        This includes the agent runtime: the current runtime is closed, i.e. its worker threads or processes are
+        released, and the restored runtime starts its workers with the next operation.
+
+        :param snapshot: The snapshot.
+        :type snapshot: SimulationSnapshot
+        """
+        snapshot_engine = snapshot.engine
+        memo = self._get_snapshot_memo()
+        memo[id(snapshot_engine)] = self
+        restored_state = copy.deepcopy(snapshot_engine.__dict__, memo)
+        self._agent_runtime.close()
+        self.__dict__.update(restored_state)
+
+    def fork(self):
+        """
+        Create an independent copy of the simulation in its current state, e.g. to evaluate an alternative outcome
+        of the next auction. Running the fork does not affect this simulation and vice versa.
+        See :py:func:`SimulationEngine.snapshot` for what is copied.
+
+        The fork gets its own agent runtime without any of this simulation's worker threads or processes.
+        It starts its workers with its first operation and closes them when the fork's run finishes.
+
+        :return: The copy of the simulation.
+        :rtype: SimulationEngine
+        """
+        return copy.deepcopy(self, self._get_snapshot_memo())
 
     def add_new_schedules(self, company, schedules, time):
         """
-        Adds new vessel schedules to be applied.
+        Adds new vessel schedules to be applied. May be called by several companies concurrently.
 
         :param company: The company which owns the vessels.
         :type company: ShippingCompany
@@ -185,9 +433,22 @@ class SimulationEngine:
         :param time: The time the schedules are added.
         :type time: int
         """
-        if time not in self._new_schedules:
-            self._new_schedules[time] = {}
-        self._new_schedules[time][company] = schedules
+        self._new_schedules.setdefault(time, {})[company] = schedules
+
+    def pop_new_schedules(self, company):
+        """
+        Removes and returns the new schedules a company has added but which have not been applied yet.
+
+        :param company: The company.
+        :type company: ShippingCompany
+        :return: The schedules per time they were added.
+        :rtype: Dict[int, Dict[Vessel, Schedule]]
+        """
+        company_schedules = {}
+        for one_time, schedules_per_company in self._new_schedules.items():
+            if company in schedules_per_company:
+                company_schedules[one_time] = schedules_per_company.pop(company)
+        return company_schedules
 
     def apply_new_schedules(self, distribution_ledger):
         """
@@ -196,28 +457,40 @@ class SimulationEngine:
         :param distribution_ledger: The outcome of the last auction.
         :type distribution_ledger: AuctionLedger
         """
+        with measure(self._profiler, PROFILE_SECTION_ENGINE, "apply_new_schedules"):
+            self._apply_new_schedules(distribution_ledger)
+
+    def _apply_new_schedules(self, distribution_ledger):
         if self.world.current_time in self._new_schedules:
             current_new_schedules = self._new_schedules[self.world.current_time]
         else:
             current_new_schedules = {}
+        # Companies add their schedules concurrently. Apply them in the order of the companies to stay deterministic.
+        company_order = {id(one_company): i for i, one_company in enumerate(self._shipping_companies or [])}
+        current_new_schedules = dict(sorted(current_new_schedules.items(),
+                                            key=lambda item: company_order.get(id(item[0]), len(company_order))))
         while len(current_new_schedules) > 0:
             one_company = next(iter(current_new_schedules.keys()))
             schedules_for_company = current_new_schedules[one_company]
             trades_in_all_schedule = [s.get_scheduled_trades() for s in schedules_for_company.values()]
             trades_in_all_schedule = [t for trades_in_one_schedule in trades_in_all_schedule for t in trades_in_one_schedule]
             if len(set(trades_in_all_schedule)) == len(trades_in_all_schedule):
+                trades_currently_awarded_to_company = {c.trade for c in distribution_ledger.ledger.get(one_company, [])}
                 for one_vessel in schedules_for_company.keys():
                     schedule_for_vessel = schedules_for_company[one_vessel]
-                    if schedule_for_vessel.verify_schedule():
-                        trades_previously_awarded_to_company = [c.trade for c in self.market_authority.contracts_per_company.get(one_company, [])]
-                        trades_currently_awarded_to_company = [c.trade for c in distribution_ledger.ledger.get(one_company, [])]
-                        trades_awarded_to_company = trades_previously_awarded_to_company + trades_currently_awarded_to_company
+                    with measure(self._profiler, PROFILE_SECTION_ENGINE, "verify_schedule"):
+                        is_schedule_valid = schedule_for_vessel.verify_schedule()
+                    if is_schedule_valid:
                         trades_in_schedule = [t for t in schedule_for_vessel.get_scheduled_trades()]
                         all_scheduled_trades_awarded_individually = [
-                            t in trades_awarded_to_company for t in trades_in_schedule]
+                            t in trades_currently_awarded_to_company
+                            or self.market_authority.is_trade_awarded(t, one_company)
+                            for t in trades_in_schedule]
                         all_scheduled_trades_awarded = all(all_scheduled_trades_awarded_individually)
                         if all_scheduled_trades_awarded:
                             one_vessel.schedule = schedule_for_vessel
+                            if self._recorder is not None:
+                                self._recorder.record_schedule(self, one_vessel, schedule_for_vessel)
                         else:
                             logger.warning(f"For company {one_company.name} and vessel {one_vessel.name}"
                                            f" the schedule was rejected since (an) unawarded trade(a) was/were scheduled.")
@@ -256,6 +529,17 @@ class SimulationEngine:
         """
         return self._shipping_companies
 
+    def update_vessel_company_index(self):
+        """
+        (Re)build the index of vessels to the companies they belong to. The index is rebuilt automatically by
+        :py:meth:`find_company_for_vessel` if a vessel is missing or no longer in the fleet of the indexed company.
+        """
+        vessel_company_index = {}
+        for one_company in reversed(self._shipping_companies or []):
+            for one_vessel in one_company.fleet:
+                vessel_company_index[one_vessel] = one_company
+        self._vessel_company_index = vessel_company_index
+
     def find_company_for_vessel(self, vessel):
         """
         Find the company the vessel belongs to.
@@ -263,14 +547,14 @@ class SimulationEngine:
         :param vessel: The vessel.
         :type vessel: Vessel
         :return: The company
+        :raises ValueError: If no company has the vessel in its fleet.
         """
         company = None
-        i = 0
-        while i < len(self.shipping_companies) and company is None:
-            one_company = self.shipping_companies[i]
-            if vessel in one_company.fleet:
-                company = one_company
-            i += 1
+        if self._vessel_company_index is not None:
+            company = self._vessel_company_index.get(vessel)
+        if company is None or vessel not in company.fleet:
+            self.update_vessel_company_index()
+            company = self._vessel_company_index.get(vessel)
         if company is None:
             raise ValueError(f"No company found for vessel {vessel}")
         return company
@@ -318,6 +602,7 @@ class SimulationEngine:
             The observer to add.
         """
         self._event_observer.append(observer)
+        self._event_observer_dispatch_table = {}
 
     def unregister_event_observer(self, observer: EventObserver):
         """
@@ -326,6 +611,26 @@ class SimulationEngine:
             The observer to remove.
         """
         self._event_observer.remove(observer)
+        self._event_observer_dispatch_table = {}
+
+    def get_event_observers_for_event_type(self, event_type):
+        """
+        Return all current event observers that observe events of the specified type, i.e. all observers
+        that have the type or one of its super classes in their
+        :py:const:`EventObserver.OBSERVED_EVENT_TYPES`. The result is cached per event type until an observer is
+        registered or unregistered.
+
+        :param event_type: The event type.
+        :type event_type: type
+        :return: The observers in the order of registration.
+        :rtype: list[EventObserver]
+        """
+        observers = self._event_observer_dispatch_table.get(event_type)
+        if observers is None:
+            observers = [one_observer for one_observer in self._event_observer
+                         if issubclass(event_type, one_observer.OBSERVED_EVENT_TYPES)]
+            self._event_observer_dispatch_table[event_type] = observers
+        return observers
 
     def notify_event_observer(self, event, data):
         """
@@ -335,7 +640,62 @@ class SimulationEngine:
         :param data: EventExecutionData
             Additional data in conjunction with the event. E.g. data that was produced or changes that were made.
         """
-        logger.debug(f"Notify {len(self._event_observer)} event observers about event: {event}")
+        if self._recorder is not None:
+            self._recorder.record_event(self, event, data)
+        observers = self.get_event_observers_for_event_type(type(event))
+        logger.opt(lazy=True).debug("Notify {} event observers about event: {}", lambda: len(observers), lambda: event)
+        for one_observer in observers:
+            logger.opt(lazy=True).debug("Notify event observer {}: {}", lambda: type(one_observer).__name__, lambda: event)
+            with measure(self._profiler, PROFILE_SECTION_OBSERVERS, type(one_observer).__name__):
+                one_observer.notify(self, event, data)
+
+    def notify_event_observer_batch(self, events_and_data):
+        """
+        Notify observers about several events that have occurred at the same time. Every observer is notified once
+        about all events of the batch it observes (in the order of the events).
+
+        :param events_and_data: The events and their data.
+        :type events_and_data: list[tuple[Event, EventExecutionData]]
+        """
+        batch_per_observer = {}
+        for one_event, one_data in events_and_data:
+            if self._recorder is not None:
+                self._recorder.record_event(self, one_event, one_data)
+            for one_observer in self.get_event_observers_for_event_type(type(one_event)):
+                batch_per_observer.setdefault(id(one_observer), []).append((one_event, one_data))
+        logger.opt(lazy=True).debug("Notify event observers about a batch of {} events", lambda: len(events_and_data))
         for one_observer in self._event_observer:
-            logger.debug(f"Notify event observer {type(one_observer).__name__}: {event}")
-            one_observer.notify(self, event, data)
+            observer_batch = batch_per_observer.get(id(one_observer))
+            if observer_batch is not None:
+                with measure(self._profiler, PROFILE_SECTION_OBSERVERS, type(one_observer).__name__):
+                    one_observer.notify_batch(self, observer_batch)
+
+
+class SimulationSnapshot:
+    """
+    The captured state of a simulation. See :py:func:`SimulationEngine.snapshot`.
+    """
+
+    def __init__(self, engine):
+        """
+        :param engine: A copy of the engine at the time of the snapshot. The copy is never run.
+        :type engine: SimulationEngine
+        """
+        super().__init__()
+        self._engine = engine
+
+    @property
+    def engine(self):
+        """
+        :return: The copy of the engine at the time of the snapshot.
+        :rtype: SimulationEngine
+        """
+        return self._engine
+
+    @property
+    def time(self):
+        """
+        :return: The simulation time of the snapshot.
+        :rtype: float
+        """
+        return self._engine.world.current_time
@@ -4,8 +4,9 @@ Event management module.
 
 from abc import abstractmethod
 from dataclasses import dataclass, field
+import heapq
 import math
-from queue import PriorityQueue
+from queue import Empty
 from typing import Any, TYPE_CHECKING, List
 
 from loguru import logger
@@ -29,12 +30,13 @@ class Event:
         """
         :param time: The occurrence time of the event.
         :type time: float
-        :param info: Some info on the event for logging etc.
+        :param info: Some info on the event for logging etc. If None, the info is built on first access
+            via :py:func:`Event._build_info`.
         :type info: str
         """
         super().__init__()
         self._time = time
-        self.info = info
+        self._info = info
 
     @property
     def time(self):
@@ -46,6 +48,31 @@ class Event:
         """
         return self._time
 
+    @property
+    def info(self):
+        """
+        Some info on the event for logging etc. Unless set explicitly, the info is built once on first access.
+
+        :return: The info.
+        :rtype: str
+        """
+        if self._info is None:
+            self._info = self._build_info()
+        return self._info
+
+    @info.setter
+    def info(self, info):
+        self._info = info
+
+    def _build_info(self):
+        """
+        Build the event's info. No info (None) on default.
+
+        :return: The info.
+        :rtype: str | None
+        """
+        return None
+
     def added_to_queue(self, engine):
         """
         Called when the event is added to the queue. Does nothing on default.
@@ -76,7 +103,9 @@ class Event:
             False if any of the event specifying information is different, True otherwise.
         """
         are_same = False
-        if (isinstance(other, Event)
+        if self is other:
+            are_same = True
+        elif (isinstance(other, Event)
                 and self.time == other.time
                 and self.info == other.info):
             are_same = True
@@ -102,7 +131,9 @@ class FirstCargoAnnouncementEvent(Event):
         """
         all_trades_later = engine.shipping.get_trades(self._cargo_available_time_second_cargo)
         engine.market.inform_future_trades(
-            all_trades_later, self._cargo_available_time_second_cargo, engine.shipping_companies)
+            all_trades_later, self._cargo_available_time_second_cargo, engine.shipping_companies,
+            profiler=engine.profiler, agent_runtime=engine.agent_runtime,
+            background=engine.background_pre_inform)
         self.info = (f"#Trades: {len(all_trades_later)}."
                      f" For time {format_time(self._cargo_available_time_second_cargo)}")
         engine.world.event_queue.put(engine.class_factory.generate_event_cargo(0))
@@ -126,7 +157,9 @@ class CargoAnnouncementEvent(Event):
         :type engine: SimulationEngine
         """
         all_trades = engine.shipping.get_trades(self._cargo_available_time)
-        engine.market.inform_future_trades(all_trades, self._cargo_available_time, engine.shipping_companies)
+        engine.market.inform_future_trades(all_trades, self._cargo_available_time, engine.shipping_companies,
+                                           profiler=engine.profiler, agent_runtime=engine.agent_runtime,
+                                           background=engine.background_pre_inform)
         self.info = f"#Trades: {len(all_trades)}. For time {format_time(self._cargo_available_time)}"
         engine.world.event_queue.put(engine.class_factory.generate_event_cargo(self._cargo_available_time))
 
@@ -150,7 +183,9 @@ class CargoEvent(Event):
         all_trades = engine.shipping.get_trades(self.time)
         self.info = f"#Trades: {len(all_trades)}"
         engine.headquarters.get_companies()
-        distribution_info = engine.market.distribute_trades(self.time, all_trades, engine.shipping_companies)
+        distribution_info = engine.market.distribute_trades(
+            self.time, all_trades, engine.shipping_companies, timeout=engine.global_agent_timeout,
+            profiler=engine.profiler, agent_runtime=engine.agent_runtime)
         return distribution_info
 
 
@@ -300,7 +335,9 @@ class VesselLocationInformationEvent(VesselEvent):
         """
         super().__init__(time, vessel)
         self._location = location
-        self.info = f"{self._vessel._engine.find_company_for_vessel(self._vessel).name}'s {self._vessel.name} in {self._location.name}"
+
+    def _build_info(self):
+        return f"{self._vessel._engine.find_company_for_vessel(self._vessel).name}'s {self._vessel.name} in {self._location.name}"
 
     @property
     def location(self):
@@ -341,8 +378,10 @@ class TravelEvent(VesselEvent):
         self._origin = origin
         self._destination = destination
         self._is_laden = False
-        self.info = (f"{destination} travel (Vessel [name: {vessel.name}]: "
-                     f"{origin}->{destination})")
+
+    def _build_info(self):
+        return (f"{self._destination} travel (Vessel [name: {self._vessel.name}]: "
+                f"{self._origin}->{self._destination})")
 
     @property
     def location(self):
@@ -411,7 +450,9 @@ class IdleEvent(VesselEvent):
         """
         super().__init__(time, vessel)
         self._location = location
-        self.info = f"{location} idling (Vessel [name: {vessel.name}])"
+
+    def _build_info(self):
+        return f"{self._location} idling (Vessel [name: {self._vessel.name}])"
 
     @property
     def location(self):
@@ -464,13 +505,17 @@ class VesselCargoEvent(VesselEvent):
         super().__init__(time, vessel)
         self._trade = trade
         self._is_pickup = is_pickup
-        if is_pickup:
-            self.info = (f"{trade.origin_port} pick up (Vessel [name: {vessel.name}], Trade [{trade.cargo_type}, "
-                         f"{trade.amount}]: {trade.origin_port}->{trade.destination_port})")
+
+    def _build_info(self):
+        trade = self._trade
+        if self._is_pickup:
+            info = (f"{trade.origin_port} pick up (Vessel [name: {self._vessel.name}], Trade [{trade.cargo_type}, "
+                    f"{trade.amount}]: {trade.origin_port}->{trade.destination_port})")
         else:
-            self.info = (f"{trade.destination_port} drop off (Vessel [name: {vessel.name}],"
-                         f" Trade [{trade.cargo_type}, {trade.amount}]: "
-                         f"{trade.origin_port}->{trade.destination_port})")
+            info = (f"{trade.destination_port} drop off (Vessel [name: {self._vessel.name}],"
+                    f" Trade [{trade.cargo_type}, {trade.amount}]: "
+                    f"{trade.origin_port}->{trade.destination_port})")
+        return info
 
     @property
     def is_pickup(self):
@@ -614,18 +659,41 @@ class CargoTransferEvent(VesselCargoEvent):
 class EventItem:
     """
     Event wrapper for EventQueue.
+
+    Items are ordered by time and, for events with the same time, by the order in which they were added to the queue.
     """
     time: float
+    sequence: int
     event: Event = field(compare=False)
+    removed: bool = field(default=False, compare=False)
 
 
-class EventQueue(SimulationEngineAware, PriorityQueue[EventItem]):
+class EventQueue(SimulationEngineAware):
     """
     Priority Queue for events.
+
+    The queue is a binary heap of :py:class:`EventItem`. Removed events are only marked as removed (lazy deletion)
+    and are discarded once they reach the top of the heap. Events with the same time are returned in the order in
+    which they were added.
+
+    Live items are additionally indexed by event identity, by time and by vessel (for :py:class:`VesselEvent`).
+    Since equal events always have the same time, lookups of equal events only compare events of the same time.
+    """
+
+    COMPACTION_MIN_REMOVED = 64
+    """
+    Number of removed items that may additionally remain in the heap before it is compacted. The heap is compacted
+    once it holds more than twice as many items as there are events in the queue plus this number.
     """
 
     def __init__(self):
         super().__init__()
+        self._heap = []
+        self._next_sequence = 0
+        self._items_by_event_id = {}
+        self._items_by_time = {}
+        self._items_by_vessel = {}
+        self._number_live_items = 0
 
     def put(self, event: Event, block=True, timeout=None):
         """
@@ -633,8 +701,8 @@ class EventQueue(SimulationEngineAware, PriorityQueue[EventItem]):
 
         :param event: The event.
         :type event: Event
-        :param block: See :py:func:`PriorityQueue.put`
-        :param timeout: See :py:func:`PriorityQueue.put`
+        :param block: Unused. Kept for compatibility with :py:func:`PriorityQueue.put`.
+        :param timeout: Unused. Kept for compatibility with :py:func:`PriorityQueue.put`.
         :raises ValueError: if the event's time is infinite.
         :raises ValueError: if the event's time is in the past.
         """
@@ -644,40 +712,83 @@ class EventQueue(SimulationEngineAware, PriorityQueue[EventItem]):
         # if event.time < self._engine.world.current_time:
         #     raise ValueError(f"Event {event} in the past. Current time: {self._engine.world.current_time}")
         event.added_to_queue(self._engine)
-        event_item = EventItem(event.time, event)
-        logger.debug(f"Added event to queue: {event_item}.")
-        super().put(event_item, block, timeout)
+        event_item = EventItem(event.time, self._next_sequence, event)
+        self._next_sequence += 1
+        logger.opt(lazy=True).debug("Added event to queue: {}.", lambda: event_item)
+        heapq.heappush(self._heap, event_item)
+        self._register_item(event_item)
 
     def get(self, block=True, timeout=None):
         """
         Removes and returns the next event from the queue.
 
-        :param block: See :py:func:`PriorityQueue.get`
-        :param timeout: See :py:func:`PriorityQueue.get`
+        :param block: Unused. Kept for compatibility with :py:func:`PriorityQueue.get`.
+        :param timeout: Unused. Kept for compatibility with :py:func:`PriorityQueue.get`.
         :return: The event.
         :rtype: Event
+        :raises queue.Empty: If the queue is empty.
         """
-        event_item = super().get(block, timeout)
-        event = event_item.event
-        return event
+        self._discard_removed_head()
+        if not self._heap:
+            raise Empty
+        event_item = heapq.heappop(self._heap)
+        self._unregister_item(event_item)
+        return event_item.event
+
+    def peek(self):
+        """
+        Returns the next event without removing it from the queue.
+
+        :return: The event or None if the queue is empty.
+        :rtype: Event | None
+        """
+        self._discard_removed_head()
+        next_event = None
+        if self._heap:
+            next_event = self._heap[0].event
+        return next_event
+
+    def empty(self):
+        """
+        :return: True if the queue contains no events and False otherwise.
+        :rtype: bool
+        """
+        return self._number_live_items == 0
+
+    def qsize(self):
+        """
+        :return: The number of events in the queue.
+        :rtype: int
+        """
+        return self._number_live_items
+
+    def __len__(self):
+        return self._number_live_items
 
     def remove(self, event_s):
         """
         Removes one or more events from the queue.
 
+        The events are looked up by identity. If an event instance is not in the queue, an equal event is removed
+        instead.
+
         :param event_s: The event or a list of events.
         :type event_s: Event | List[Event]
         """
         if not isinstance(event_s, list):
             event_s = [event_s]
         for one_event in event_s:
-            event_to_remove = EventItem(one_event.time, one_event)
-            try:
-                self.queue.remove(event_to_remove)
-                logger.debug(f"Removed event from queue: {event_to_remove}.")
-            except ValueError:
-                logger.warning(f"Tried to remove event which is not in the queue: {event_to_remove}.")
-
+            event_item = self._find_item(one_event)
+            if event_item is not None:
+                event_item.removed = True
+                self._unregister_item(event_item)
+                logger.opt(lazy=True).debug("Removed event from queue: {}.", lambda: event_item)
+            else:
+                logger.warning(f"Tried to remove event which is not in the queue: {one_event}.")
+        self._discard_removed_head()
+        if len(self._heap) > 2 * self._number_live_items + self.COMPACTION_MIN_REMOVED:
+            self._heap = [one_item for one_item in self._heap if not one_item.removed]
+            heapq.heapify(self._heap)
 
     def purge(self, vessel):
         """
@@ -686,13 +797,97 @@ class EventQueue(SimulationEngineAware, PriorityQueue[EventItem]):
         :param vessel: The vessel.
         :type vessel: Vessel
         """
-        vessels_events = []
-        for event_item in self.queue:
-            event = event_item.event
-            if isinstance(event, VesselEvent):
-                if event.vessel == vessel:
-                    vessels_events.append(event)
-        self.remove(vessels_events)
+        vessels_events = [one_item.event for one_item in self._items_by_vessel.get(vessel, [])]
+        if len(vessels_events) > 0:
+            self.remove(vessels_events)
+
+    def _find_item(self, event):
+        """
+        Find the queue item of an event. An item holding the same instance is preferred over one holding an equal
+        event.
+
+        :param event: The event.
+        :type event: Event
+        :return: The item or None if no such event is in the queue.
+        :rtype: EventItem | None
+        """
+        found_item = None
+        items_of_instance = self._items_by_event_id.get(id(event))
+        if items_of_instance:
+            found_item = items_of_instance[0]
+        else:
+            items_at_time = self._items_by_time.get(event.time, [])
+            found_item = next((one_item for one_item in items_at_time if one_item.event == event), None)
+        return found_item
+
+    def _register_item(self, event_item):
+        """
+        Add an item to the lookups of live items.
+
+        :param event_item: The item.
+        :type event_item: EventItem
+        """
+        event = event_item.event
+        self._items_by_event_id.setdefault(id(event), []).append(event_item)
+        self._items_by_time.setdefault(event_item.time, []).append(event_item)
+        if isinstance(event, VesselEvent):
+            self._items_by_vessel.setdefault(event.vessel, []).append(event_item)
+        self._number_live_items += 1
+
+    def _unregister_item(self, event_item):
+        """
+        Remove an item from the lookups of live items.
+
+        :param event_item: The item.
+        :type event_item: EventItem
+        """
+        event = event_item.event
+        self._remove_from_index(self._items_by_event_id, id(event), event_item)
+        self._remove_from_index(self._items_by_time, event_item.time, event_item)
+        if isinstance(event, VesselEvent):
+            self._remove_from_index(self._items_by_vessel, event.vessel, event_item)
+        self._number_live_items -= 1
+
+    @staticmethod
+    def _remove_from_index(index, key, event_item):
+        """
+        Remove an item from the list of items under a key of an index and drop the key if no items remain.
+
+        :param index: The index.
+        :type index: dict
+        :param key: The key.
+        :param event_item: The item.
+        :type event_item: EventItem
+        """
+        items = index[key]
+        items.remove(event_item)
+        if not items:
+            del index[key]
+
+    def _discard_removed_head(self):
+        """
+        Pop items that are marked as removed from the top of the heap.
+        """
+        while self._heap and self._heap[0].removed:
+            heapq.heappop(self._heap)
+
+    def __getstate__(self):
+        """
+        The identity index is keyed by the events' ids and therefore not part of the state when the queue is copied
+        or pickled.
+        """
+        state = self.__dict__.copy()
+        del state["_items_by_event_id"]
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the state and rebuilds the identity index.
+        """
+        self.__dict__.update(state)
+        self._items_by_event_id = {}
+        for one_item in self:
+            self._items_by_event_id.setdefault(id(one_item.event), []).append(one_item)
 
     def __contains__(self, event):
         """
@@ -703,15 +898,7 @@ class EventQueue(SimulationEngineAware, PriorityQueue[EventItem]):
         :return: True if such an event is in the queue and False otherwise.
         :rtype: bool
         """
-        i = 0
-        found_event = False
-        event_item = EventItem(event.time, event)
-        while i < len(self.queue) and not found_event:
-            current_event_item = self.queue[i]
-            if event_item == current_event_item:
-                found_event = True
-            i += 1
-        return found_event
+        return self._find_item(event) is not None
 
     def __getitem__(self, event):
         """
@@ -723,30 +910,28 @@ class EventQueue(SimulationEngineAware, PriorityQueue[EventItem]):
         :rtype: bool
         :raises ValueError: If no such event is in the queue.
         """
-        i = 0
-        found_event = None
-        event_item = EventItem(event.time, event)
-        while i < len(self.queue) and not found_event:
-            current_event_item = self.queue[i]
-            if event_item == current_event_item:
-                found_event = current_event_item.event
-            i += 1
-        if found_event is None:
+        event_item = self._find_item(event)
+        if event_item is None:
             raise ValueError(event)
-        return found_event
+        return event_item.event
 
     def __iter__(self):
         """
-        :return: An iterator over the current events.
+        :return: An iterator over the current events' items (in no particular order).
         """
-        return iter(self.queue)
+        return (one_item for one_item in self._heap if not one_item.removed)
 
 
 class EventObserver:
     """
     An observer of event occurrences.
+
+    The engine only notifies an observer about events that are instances of (a subclass of) one of the types in
+    :py:const:`EventObserver.OBSERVED_EVENT_TYPES`.
     """
 
+    OBSERVED_EVENT_TYPES = (Event,)
+
     @abstractmethod
     def notify(self, engine, event, data):
         """
@@ -761,6 +946,20 @@ class EventObserver:
         """
         pass
 
+    def notify_batch(self, engine, events_and_data):
+        """
+        Notify this observer of several events that occurred at the same time. Only called if the engine processes
+        events in batches. All events of the batch have been executed before the observers are notified.
+        The default notifies about each event in turn via :py:func:`EventObserver.notify`.
+
+        :param engine: Simulation engine.
+        :type engine: SimulationEngine
+        :param events_and_data: The events (in order of their execution) and their execution data.
+        :type events_and_data: list[tuple[Event, EventExecutionData]]
+        """
+        for one_event, one_data in events_and_data:
+            self.notify(engine, one_event, one_data)
+
 
 @dataclass
 class EventExecutionData:
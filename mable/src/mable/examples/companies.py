@@ -52,7 +52,7 @@ class MyArchEnemy(TradingCompany):
             j = 0
             while j < len(self._fleet) and not is_assigned:
                 current_vessel = self.fleet[j]
-                current_vessel_schedule = schedules.get(current_vessel, current_vessel.schedule)
+                current_vessel_schedule = schedules.get(current_vessel, current_vessel.schedule_view)
                 new_schedule = current_vessel_schedule.copy()
                 new_schedule.add_transportation(current_trade)
                 if new_schedule.verify_schedule():
@@ -110,21 +110,14 @@ class TheScheduler(TradingCompany):
             j = 0
             while j < len(self._fleet) and not is_assigned:
                 current_vessel = self._fleet[j]
-                current_vessel_schedule = schedules.get(current_vessel, current_vessel.schedule)
-                new_schedule = current_vessel_schedule.copy()
-                insertion_points = new_schedule.get_insertion_points()[-8:]
+                current_vessel_schedule = schedules.get(current_vessel, current_vessel.schedule_view)
+                insertions = current_vessel_schedule.evaluate_insertions(current_trade)
                 shortest_schedule = None
-                for k in range(len(insertion_points)):
-                    idx_pick_up = insertion_points[k]
-                    insertion_point_after_idx_k = insertion_points[k:]
-                    for m in range(len(insertion_point_after_idx_k)):
-                        idx_drop_off = insertion_point_after_idx_k[m]
-                        new_schedule_test = new_schedule.copy()
-                        new_schedule_test.add_transportation(current_trade, idx_pick_up, idx_drop_off)
-                        if (shortest_schedule is None
-                                or new_schedule_test.completion_time() < shortest_schedule.completion_time()):
-                            if new_schedule_test.verify_schedule():
-                                shortest_schedule = new_schedule_test
+                if len(insertions) > 0:
+                    shortest_insertion = min(insertions, key=lambda one_insertion: one_insertion.completion_time)
+                    shortest_schedule = current_vessel_schedule.copy()
+                    shortest_schedule.add_transportation(
+                        current_trade, shortest_insertion.pick_up, shortest_insertion.drop_off)
                 if shortest_schedule is not None:
                     total_costs = self.predict_cost(current_vessel, current_trade)
                     schedules[current_vessel] = shortest_schedule
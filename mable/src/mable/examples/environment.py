@@ -1,3 +1,4 @@
+from concurrent.futures import ProcessPoolExecutor
 import os.path
 import json
 import threading
@@ -8,15 +9,18 @@ from datetime import datetime
 
 from loguru import logger
 
+from mable.agent_runtime import ProcessAgentRuntime
 import mable.extensions.world_ports as world_ports
-from mable.competition.generation import CompetitionBuilder, AuctionClassFactory
+from mable.competition.generation import CompetitionBuilder, AuctionClassFactory, ArrayScheduleAuctionClassFactory
 from mable.engine import SimulationEngine
 from mable.event_management import IdleEvent
 from mable.examples import fleets
 from mable.extensions.fuel_emissions import FuelSpecsBuilder, VesselWithEngine
+from mable.metrics import aggregate_company_performance
 from mable.observers import (
     LogRunner, AuctionMetricsObserver, EventFuelPrintObserver, MetricsObserver, AuctionOutcomePrintObserver,
     TradeDeliveryObserver, AuctionOutcomeObserver)
+from mable.simulation_recording import SimulationRecorder, SimulationReplayEngine
 from mable.simulation_space.universe import Location
 from mable.util import JsonAbleEncoder
 
@@ -130,7 +134,8 @@ def _generate_environment(specifications_builder, trade_occurrence_frequency,
 
 
 def generate_simulation(specifications_builder, show_detailed_auction_outcome=False, output_directory=".",
-                        global_agent_timeout=60, info=None):
+                        global_agent_timeout=60, info=None, export_metrics=True, profile=False, record=False,
+                        batch_events=False, isolate_agents=False, background_pre_inform=False, array_schedules=False):
     """
     Generate a simulation from a specifications.
 
@@ -146,24 +151,95 @@ def generate_simulation(specifications_builder, show_detailed_auction_outcome=Fa
     :return: The simulation instance.
     :param info: Any information on the simulation.
     :type info: str | dict
+    :param export_metrics: Export the metrics to the output directory at the end of the simulation. Default is True.
+    :type export_metrics: bool
+    :param profile: Record the time spent on events, observers, agent operations and schedule application. The
+        profile is exported next to the metrics and can be summarised via 'mable profile <file>'. Default is False.
+    :type profile: bool
+    :param record: Record the run into a log in the output directory which can be replayed via
+        :py:func:`replay_simulation`. Default is False.
+    :type record: bool
+    :param batch_events: Process events that occur at the same time in batches
+        (see :py:func:`mable.engine.SimulationEngine.step_batch`). Default is False.
+    :type batch_events: bool
+    :param isolate_agents: Run every company in its own worker process whose operations are interrupted (or the
+        process is killed) when they time out (see :py:class:`mable.agent_runtime.ProcessAgentRuntime`).
+        Default is False, i.e. the companies run in threads of the main process.
+    :type isolate_agents: bool
+    :param background_pre_inform: Let the companies process announced trades ('pre_inform') in the background while
+        the simulation continues until their next operation. Requires isolate_agents. Default is False.
+    :type background_pre_inform: bool
+    :param array_schedules: Use :py:class:`mable.transportation_scheduling.ArraySchedule` instead of networkx based
+        schedules for the vessels. Default is False.
+    :type array_schedules: bool
     :rtype: SimulationEngine
-    :raises ValueError: If the output directory does not exist.
+    :raises ValueError: If the output directory does not exist or background_pre_inform is used without
+        isolate_agents.
     """
     if not pathlib.Path(output_directory).is_dir():
         raise ValueError(f"Output directory '{output_directory}' not found.")
+    if background_pre_inform and not isolate_agents:
+        raise ValueError("Background pre_inform requires isolate_agents.")
     specifications = specifications_builder.build()
-    sim_factory = CompetitionBuilder(AuctionClassFactory(), specifications)
+    class_factory = AuctionClassFactory()
+    if array_schedules:
+        class_factory = ArrayScheduleAuctionClassFactory()
+    sim_factory = CompetitionBuilder(class_factory, specifications)
     pre_run = ([LogRunner(logger, "---Pre Run Start---")]
                + SimulationEngine.PRE_RUN_CMDS
                + [LogRunner(logger, "--Run Start (Pre Run Finished)---")])
-    post_run = [LogRunner(logger, "--Run Finished---"), _export_stats]
+    post_run = [LogRunner(logger, "--Run Finished---")]
+    if export_metrics:
+        post_run.append(_export_stats)
+    recorder = None
+    if record:
+        timestamp = datetime.today().strftime("%Y-%m-%d-%H-%M-%S")
+        recorder = SimulationRecorder(pathlib.Path(output_directory) / f"recording_competition_{timestamp}.mablelog")
+    agent_runtime = None
+    if isolate_agents:
+        agent_runtime = ProcessAgentRuntime()
     sim = sim_factory.generate_engine(pre_run_cmds=pre_run, post_run_cmds=post_run, output_directory=output_directory,
-                                      global_agent_timeout=global_agent_timeout, info=info)
+                                      global_agent_timeout=global_agent_timeout, info=info, profile=profile,
+                                      recorder=recorder, batch_events=batch_events, agent_runtime=agent_runtime,
+                                      background_pre_inform=background_pre_inform)
     _activate_stats_collection(sim, show_detailed_auction_outcome)
     _activate_contract_fulfillment_check(sim)
     return sim
 
 
+def replay_simulation(file_path, show_detailed_auction_outcome=False, output_directory=".", export_metrics=True,
+                      profile=False):
+    """
+    Generate a replay of a simulation that was recorded via :py:func:`generate_simulation` with record=True.
+    The replay collects the same metrics (including idle times and penalties) as the recorded simulation without
+    running any companies or determining routes.
+
+    :param file_path: The path of the recording.
+    :type file_path: str | pathlib.Path
+    :param show_detailed_auction_outcome: Log the outcomes of auctions in detail.
+    :type show_detailed_auction_outcome: bool
+    :param output_directory: A directory to save the replay output files.
+    :type output_directory: str
+    :param export_metrics: Export the metrics to the output directory at the end of the replay. Default is True.
+    :type export_metrics: bool
+    :param profile: Record the time spent on events and observers. Default is False.
+    :type profile: bool
+    :return: The replay instance.
+    :rtype: SimulationReplayEngine
+    :raises ValueError: If the output directory does not exist or the file is no simulation recording.
+    """
+    if not pathlib.Path(output_directory).is_dir():
+        raise ValueError(f"Output directory '{output_directory}' not found.")
+    post_run = [LogRunner(logger, "--Replay Finished---")]
+    if export_metrics:
+        post_run.append(_export_stats)
+    replay = SimulationReplayEngine(file_path, post_run_cmds=post_run, output_directory=output_directory,
+                                    profile=profile)
+    _activate_stats_collection(replay, show_detailed_auction_outcome)
+    _activate_contract_fulfillment_check(replay)
+    return replay
+
+
 def _activate_stats_collection(simulation, show_detailed_auction_outcome=False):
     """
     Add the observers for stats collection.
@@ -193,7 +269,7 @@ def _activate_contract_fulfillment_check(simulation):
 
 def _export_stats(simulation):
     """
-    Export metrics to json.
+    Export metrics and, if the simulation was profiled, the profile to json.
 
     :param simulation: The simulation of which the metrics will be exported.
     :type simulation: SimulationEngine
@@ -202,15 +278,149 @@ def _export_stats(simulation):
     for one_event_observer in simulation.get_event_observers():
         timestamp = datetime.today().strftime("%Y-%m-%d-%H-%M-%S")
         if isinstance(one_event_observer, MetricsObserver):
-            _calculate_idle_times(simulation, one_event_observer)
-            metrics = one_event_observer.metrics.to_json()
-            metrics["global_metrics"]["penalty"] = _calculate_penalty(simulation, one_event_observer)
-            metrics["info"] = simulation.info
+            metrics = _compile_metrics(simulation, one_event_observer)
             file_name = f"metrics_competition_{id(one_event_observer)}_{timestamp}.json"
-            file_path = pathlib.Path(simulation.output_directory) / file_name
-            with open(file_path, "w") as metrics_file:
-                json.dump(metrics, metrics_file, indent=4, cls=JsonAbleEncoder)
-            logger.info(f"Metrics exported to {file_path}")
+            _write_metrics(simulation, metrics, file_name)
+    timestamp = datetime.today().strftime("%Y-%m-%d-%H-%M-%S")
+    _write_profile(simulation, f"profile_competition_{timestamp}.json")
+
+
+def _compile_metrics(simulation, metrics_observer):
+    """
+    Complete the metrics of a finished simulation with the idle times, penalties and the simulation info.
+
+    Should only be called once per observer since the idle times are added to the observer's metrics.
+
+    :param simulation: The simulation.
+    :type simulation: SimulationEngine
+    :param metrics_observer: The observer that collected the metrics.
+    :type metrics_observer: MetricsObserver
+    :return: The metrics.
+    :rtype: dict
+    """
+    _calculate_idle_times(simulation, metrics_observer)
+    metrics = metrics_observer.metrics.to_json()
+    metrics["global_metrics"]["penalty"] = _calculate_penalty(simulation, metrics_observer)
+    metrics["info"] = simulation.info
+    return metrics
+
+
+def _write_metrics(simulation, metrics, file_name):
+    """
+    Write metrics to a json file in the simulation's output directory.
+
+    :param simulation: The simulation.
+    :type simulation: SimulationEngine
+    :param metrics: The metrics.
+    :type metrics: dict
+    :param file_name: The name of the file.
+    :type file_name: str
+    """
+    file_path = pathlib.Path(simulation.output_directory) / file_name
+    with open(file_path, "w") as metrics_file:
+        json.dump(metrics, metrics_file, indent=4, cls=JsonAbleEncoder)
+    logger.info(f"Metrics exported to {file_path}")
+
+
+def _write_profile(simulation, file_name):
+    """
+    Write the profile of a simulation to a json file in the simulation's output directory.
+    Nothing is written if the simulation was not profiled.
+
+    :param simulation: The simulation.
+    :type simulation: SimulationEngine
+    :param file_name: The name of the file.
+    :type file_name: str
+    """
+    if simulation.profiler is None:
+        return
+    file_path = pathlib.Path(simulation.output_directory) / file_name
+    with open(file_path, "w") as profile_file:
+        json.dump(simulation.profiler, profile_file, indent=4, cls=JsonAbleEncoder)
+    logger.info(f"Profile exported to {file_path}")
+
+
+def run_simulations(specifications_builder_factory, seeds, max_workers=None, output_directory=".", **kwargs):
+    """
+    Run one simulation per seed in parallel processes and aggregate the simulations' metrics.
+
+    Each simulation is generated via :py:func:`generate_simulation` from the specifications builder returned by
+    the factory with the random seed set to the run's seed. The metrics of every run are exported to the
+    output directory as 'metrics_competition_seed_<seed>_<timestamp>.json'. Routing data is only loaded once per
+    worker process.
+
+    Example:
+
+    .. code-block:: python
+
+        def build_specifications():
+            specifications_builder = environment.get_specification_builder(trades_per_occurrence=5, num_auctions=12)
+            specifications_builder.add_company(MyCompany.Data(MyCompany, fleets.example_fleet_1(), "My Company"))
+            return specifications_builder
+
+        if __name__ == '__main__':
+            results = environment.run_simulations(build_specifications, seeds=range(100))
+
+    :param specifications_builder_factory: A function without arguments that returns a specifications builder, e.g.
+        the result of :py:func:`get_specification_builder` with added companies. Since the factory is sent to the
+        worker processes it must be picklable, e.g. a module level function.
+    :type specifications_builder_factory: Callable[[], FuelSpecsBuilder]
+    :param seeds: The seeds. One simulation is run per seed.
+    :type seeds: Iterable[int]
+    :param max_workers: The maximum number of worker processes. If None, the number of processors is used.
+    :type max_workers: int | None
+    :param output_directory: A directory to save the simulations' output files.
+    :type output_directory: str
+    :param kwargs: Further keyword arguments for :py:func:`generate_simulation` except export_metrics, which is
+        managed by the runner, i.e. the runner always exports the metrics of each run as described above.
+    :return: The metrics (as exported to json) per seed under "runs" and the aggregated performance
+        (see :py:func:`mable.metrics.aggregate_company_performance`) under "summary".
+    :rtype: dict
+    :raises ValueError: If the output directory does not exist or export_metrics is passed.
+    """
+    if not pathlib.Path(output_directory).is_dir():
+        raise ValueError(f"Output directory '{output_directory}' not found.")
+    if "export_metrics" in kwargs:
+        raise ValueError("The export of the metrics is managed by run_simulations and cannot be set.")
+    seeds = list(seeds)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_run_simulation_for_seed, specifications_builder_factory, one_seed,
+                                   output_directory, kwargs)
+                   for one_seed in seeds]
+        metrics_per_seed = {one_seed: one_future.result() for one_seed, one_future in zip(seeds, futures)}
+    results = {
+        "runs": metrics_per_seed,
+        "summary": aggregate_company_performance(metrics_per_seed)
+    }
+    return results
+
+
+def _run_simulation_for_seed(specifications_builder_factory, seed, output_directory, simulation_kwargs):
+    """
+    Generate and run one simulation. Used as the worker function of :py:func:`run_simulations`.
+
+    :param specifications_builder_factory: The factory of the specifications builder.
+    :type specifications_builder_factory: Callable[[], FuelSpecsBuilder]
+    :param seed: The seed.
+    :type seed: int
+    :param output_directory: The output directory.
+    :type output_directory: str
+    :param simulation_kwargs: Keyword arguments for :py:func:`generate_simulation`.
+    :type simulation_kwargs: dict
+    :return: The simulation's metrics as exported to json.
+    :rtype: dict
+    """
+    specifications_builder = specifications_builder_factory()
+    specifications_builder.add_random_specifications(seed=seed)
+    simulation = generate_simulation(specifications_builder, output_directory=output_directory,
+                                     export_metrics=False, **simulation_kwargs)
+    simulation.run()
+    metrics_observer = next(o for o in simulation.get_event_observers() if isinstance(o, AuctionMetricsObserver))
+    metrics = _compile_metrics(simulation, metrics_observer)
+    timestamp = datetime.today().strftime("%Y-%m-%d-%H-%M-%S")
+    _write_metrics(simulation, metrics, f"metrics_competition_seed_{seed}_{timestamp}.json")
+    _write_profile(simulation, f"profile_competition_seed_{seed}_{timestamp}.json")
+    return json.loads(json.dumps(metrics, cls=JsonAbleEncoder))
 
 
 def _check_threads(_):
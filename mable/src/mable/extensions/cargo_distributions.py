@@ -2,7 +2,6 @@
 Extension to generate and transport cargoes based on cargo frequency and amount distributions
 and associated changes to shipping.
 """
-import pickle
 from typing import Tuple
 
 import numpy as np
@@ -10,7 +9,7 @@ import pandas as pd
 import loguru
 
 from mable.shipping_market import TimeWindowTrade
-from mable.extensions.world_ports import LatLongFactory
+from mable.extensions.world_ports import LatLongFactory, load_precomputed_routes
 from mable.event_management import ArrivalEvent
 from mable.simulation_generation import SimulationBuilder
 from mable.shipping_market import Shipping
@@ -118,8 +117,7 @@ class DistributionShipping(Shipping):
                      f" cargo events.")
         precomputed_routes = None
         if not precomputed_routes_file is None:
-            with open(precomputed_routes_file, "rb") as f:
-                precomputed_routes = pickle.load(f)
+            precomputed_routes = load_precomputed_routes(precomputed_routes_file)
         for i in range(0, simulation_length + 1, trade_occurrence_frequency):
             pickup_period_days = (i/24, (i + trade_occurrence_frequency - 1)/24)
             cargoes_generated = self.sample_cargoes_from_port_distributions(
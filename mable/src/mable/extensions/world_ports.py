@@ -162,6 +162,27 @@ def get_index_or_default(search_list, search_term, default=0):
     return idx
 
 
+_PRECOMPUTED_ROUTES_CACHE = {}
+
+
+def load_precomputed_routes(path):
+    """
+    Load precomputed routes from a pickle file. The file is only read once per process; subsequent calls for the same
+    file return a (shallow) copy of the already loaded routes. Hence, adding routes to the returned dict does not
+    affect other callers, e.g. other simulations run in the same process.
+
+    :param path: The path of the precomputed routes file.
+    :type path: str
+    :return: The routes.
+    :rtype: dict
+    """
+    cache_key = os.path.abspath(path)
+    if cache_key not in _PRECOMPUTED_ROUTES_CACHE:
+        with open(path, 'rb') as file:
+            _PRECOMPUTED_ROUTES_CACHE[cache_key] = pickle.load(file)
+    return dict(_PRECOMPUTED_ROUTES_CACHE[cache_key])
+
+
 def get_ports(path):
     """
     Retrieve the ports from a csv file.
@@ -202,8 +223,7 @@ class LatLongShippingNetwork(NetworkWithPortDict):
         self._precomputed_routes_file = precomputed_routes_file
         self._precomputed_routes = None
         if self._precomputed_routes_file is not None:
-            with open(self._precomputed_routes_file, 'rb') as file:
-                self._precomputed_routes = pickle.load(file)
+            self._precomputed_routes = load_precomputed_routes(self._precomputed_routes_file)
         self._graph_file = graph_file
         # canals
         self.canals = {
@@ -2,6 +2,8 @@
 A module to support the collection of metrics for a simulation.
 """
 
+import numpy as np
+
 from mable.simulation_environment import SimulationEngineAware
 from mable.util import JsonAble
 
@@ -9,6 +11,69 @@ FUEL_CONSUMPTION_KEY = "fuel_consumption"
 CO2_EMISSIONS_KEY = "co2_emissions"
 FUEL_COST_KEY = "fuel_cost"
 VESSEL_ROUTE_KEY = "route"
+PERFORMANCE_MEASURES = ("cost", "penalty", "revenue", "income")
+
+
+def get_company_performance(metrics):
+    """
+    Determine the cost, penalty, revenue and income of each company from exported metrics.
+
+    :param metrics: The metrics as exported to JSON (see :py:func:`mable.examples.environment.generate_simulation`),
+        i.e. with string keys.
+    :type metrics: dict
+    :return: Per company key the company's name and performance measures
+        (see :py:const:`PERFORMANCE_MEASURES`).
+    :rtype: dict[str, dict]
+    """
+    performance = {}
+    all_outcomes = metrics["global_metrics"].get("auction_outcomes", [])
+    for one_company_key in metrics["company_metrics"]:
+        cost = metrics["company_metrics"][one_company_key].get(FUEL_COST_KEY, 0)
+        penalty = metrics["global_metrics"]["penalty"][one_company_key]
+        all_outcomes_company_per_round = [d[one_company_key] for d in all_outcomes if one_company_key in d]
+        all_outcomes_company = [x for sublist in all_outcomes_company_per_round for x in sublist]
+        revenue = sum(d["payment"] for d in all_outcomes_company)
+        income = revenue - cost - penalty
+        performance[one_company_key] = {
+            "name": metrics["company_names"][one_company_key],
+            "cost": cost,
+            "penalty": penalty,
+            "revenue": revenue,
+            "income": income
+        }
+    return performance
+
+
+def aggregate_company_performance(metrics_per_run):
+    """
+    Aggregate the companies' performance over several runs, e.g. runs with different seeds.
+    Companies are matched by name.
+
+    :param metrics_per_run: The exported metrics (see :py:func:`get_company_performance`) per run.
+    :type metrics_per_run: dict
+    :return: Per company name and performance measure the mean, standard deviation, minimum and maximum
+        over all runs in which the company took part.
+    :rtype: dict[str, dict[str, dict[str, float]]]
+    """
+    values_per_company = {}
+    for one_run_metrics in metrics_per_run.values():
+        for one_company_performance in get_company_performance(one_run_metrics).values():
+            company_values = values_per_company.setdefault(
+                one_company_performance["name"], {m: [] for m in PERFORMANCE_MEASURES})
+            for one_measure in PERFORMANCE_MEASURES:
+                company_values[one_measure].append(one_company_performance[one_measure])
+    summary = {}
+    for one_company_name, company_values in values_per_company.items():
+        summary[one_company_name] = {}
+        for one_measure, values in company_values.items():
+            values = np.array(values, dtype=float)
+            summary[one_company_name][one_measure] = {
+                "mean": float(values.mean()),
+                "std": float(values.std()),
+                "min": float(values.min()),
+                "max": float(values.max())
+            }
+    return summary
 
 
 class VesselKey(JsonAble):
@@ -182,10 +247,9 @@ class MetricsCollector(JsonAble, SimulationEngineAware):
         except KeyError as key_error:
             if create_both_ids_if_not_exists:
                 if company is None:
-                    shipping_companies = self._engine.shipping_companies
                     try:
-                        company = next((c for c in shipping_companies if vessel in c.fleet))
-                    except StopIteration:
+                        company = self._engine.find_company_for_vessel(vessel)
+                    except ValueError:
                         raise ValueError("neither company specified nor company knows for vessel.")
                 vessel_id = self._get_next_vessel_id(company, vessel)
                 self._company_names[self._company_ids.get(company)] = company.name
@@ -33,6 +33,8 @@ class TradeDeliveryObserver(EventObserver):
     An observer that logs completed trades.
     """
 
+    OBSERVED_EVENT_TYPES = (CargoTransferEvent,)
+
     def notify(self, engine, event, data):
         if isinstance(event, CargoTransferEvent) and event.is_drop_off:
             company_for_vessel = engine.find_company_for_vessel(event.vessel)
@@ -45,6 +47,8 @@ class AuctionOutcomeObserver(EventObserver):
     An observer that logs allocated trades.
     """
 
+    OBSERVED_EVENT_TYPES = (AuctionCargoEvent,)
+
     def notify(self, engine, event, data):
         if isinstance(event, AuctionCargoEvent):
             engine.market_authority.add_allocation_results(event.allocation_result)
@@ -56,6 +60,8 @@ class AuctionOutcomePrintObserver(EventObserver):
     :py:func:`mable.competition.generation.AuctionCargoEvent`.
     """
 
+    OBSERVED_EVENT_TYPES = (AuctionCargoEvent,)
+
     def __init__(self, logger):
         self._logger = logger
 
@@ -82,6 +88,8 @@ class AuctionOutcomePrintObserver(EventObserver):
 
 class MetricsObserver(EventObserver):
 
+    OBSERVED_EVENT_TYPES = (VesselEvent,)
+
     def __init__(self):
         super().__init__()
         self._metrics = GlobalMetricsCollector()
@@ -144,6 +152,8 @@ class MetricsObserver(EventObserver):
 
 class AuctionMetricsObserver(MetricsObserver):
 
+    OBSERVED_EVENT_TYPES = (VesselEvent, AuctionCargoEvent)
+
     def notify(self, engine, event, data):
         super().notify(engine, event, data)
         if isinstance(event, AuctionCargoEvent):
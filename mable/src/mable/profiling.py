@@ -0,0 +1,180 @@
+"""
+Opt-in instrumentation to find out where the time of a simulation run goes.
+"""
+
+from contextlib import contextmanager, nullcontext
+import functools
+import threading
+import time
+
+from mable.util import JsonAble
+
+
+PROFILE_SECTION_EVENTS = "events"
+PROFILE_SECTION_OBSERVERS = "observers"
+PROFILE_SECTION_AGENTS = "agents"
+PROFILE_SECTION_COMPANIES = "companies"
+PROFILE_SECTION_ENGINE = "engine"
+
+
+class ProfileEntry(JsonAble):
+    """
+    Accumulated timings of one measured operation.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+    def add(self, wall_time, cpu_time):
+        """
+        Add one measurement.
+
+        :param wall_time: The elapsed wall clock time in seconds.
+        :type wall_time: float
+        :param cpu_time: The elapsed CPU time of the measuring thread in seconds.
+        :type cpu_time: float
+        """
+        self.count += 1
+        self.wall_time += wall_time
+        self.cpu_time += cpu_time
+
+    def to_json(self):
+        return {"count": self.count, "wall_time": self.wall_time, "cpu_time": self.cpu_time}
+
+
+class SimulationProfiler(JsonAble):
+    """
+    Records wall and CPU time per section (e.g. events or observers) and key (e.g. the event class name).
+
+    CPU time is measured per thread so that measurements of agent operations, which run in worker threads,
+    are not distorted by the main thread.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self):
+        """
+        :return: The entries per section and key.
+        :rtype: dict[str, dict[str, ProfileEntry]]
+        """
+        return self._entries
+
+    def add(self, section, key, wall_time, cpu_time):
+        """
+        Add one measurement.
+
+        :param section: The section, e.g. :py:const:`PROFILE_SECTION_EVENTS`.
+        :type section: str
+        :param key: The measured operation within the section, e.g. the name of an event class.
+        :type key: str
+        :param wall_time: The elapsed wall clock time in seconds.
+        :type wall_time: float
+        :param cpu_time: The elapsed CPU time in seconds.
+        :type cpu_time: float
+        """
+        with self._lock:
+            section_entries = self._entries.setdefault(section, {})
+            if key not in section_entries:
+                section_entries[key] = ProfileEntry()
+            section_entries[key].add(wall_time, cpu_time)
+
+    @contextmanager
+    def measure(self, section, key):
+        """
+        Context manager that measures the enclosed block.
+
+        :param section: The section.
+        :type section: str
+        :param key: The measured operation within the section.
+        :type key: str
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.add(section, key, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+
+    def wrap(self, func, *measurements):
+        """
+        Wrap a function such that every call is measured in the thread the function runs in.
+
+        :param func: The function.
+        :type func: Callable
+        :param measurements: Pairs of section and key. The call is recorded under each of them.
+        :type measurements: tuple[str, str]
+        :return: The wrapped function.
+        :rtype: Callable
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                wall_time = time.perf_counter() - wall_start
+                cpu_time = time.thread_time() - cpu_start
+                for section, key in measurements:
+                    self.add(section, key, wall_time, cpu_time)
+        return wrapper
+
+    def to_json(self):
+        with self._lock:
+            return {section: {key: entry.to_json() for key, entry in section_entries.items()}
+                    for section, section_entries in self._entries.items()}
+
+
+def measure(profiler, section, key):
+    """
+    Measure a block if a profiler is given.
+
+    :param profiler: The profiler or None if profiling is disabled.
+    :type profiler: SimulationProfiler | None
+    :param section: The section.
+    :type section: str
+    :param key: The measured operation within the section.
+    :type key: str
+    :return: A context manager.
+    """
+    if profiler is None:
+        return nullcontext()
+    return profiler.measure(section, key)
+
+
+def wrap_agent_operation(profiler, company, operation_name, func):
+    """
+    Wrap an agent operation to be measured per operation and per company if a profiler is given.
+
+    :param profiler: The profiler or None if profiling is disabled.
+    :type profiler: SimulationProfiler | None
+    :param company: The company whose operation is measured.
+    :type company: mable.transport_operation.ShippingCompany
+    :param operation_name: The name of the operation, e.g. 'inform'.
+    :type operation_name: str
+    :param func: The operation.
+    :type func: Callable
+    :return: The (wrapped) operation.
+    :rtype: Callable
+    """
+    if profiler is None:
+        return func
+    return profiler.wrap(func,
+                         (PROFILE_SECTION_AGENTS, operation_name),
+                         (PROFILE_SECTION_COMPANIES, f"{company.name}.{operation_name}"))
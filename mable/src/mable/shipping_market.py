@@ -1,17 +1,21 @@
 """
 All cargo generation and distribution related classes.
 """
-import asyncio
 import copy
+import inspect
 from abc import abstractmethod
 from enum import Enum
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Union, Hashable, TYPE_CHECKING, List, Dict
 import math
 
 import attrs
 import loguru
+import numpy as np
 
 from mable.util import JsonAble
+from mable.agent_runtime import default_agent_runtime, OPERATION_PRE_INFORM, OPERATION_INFORM, OPERATION_RECEIVE
 from mable.simulation_space.universe import Port
 from mable.simulation_environment import SimulationEngineAware
 
@@ -40,6 +44,7 @@ class Shipping(SimulationEngineAware):
         super().__init__()
         self._all_trades = {}
         self._occurred_trades = {}
+        self._number_of_trades = 0
         self.initialise_trades(*args, **kwargs)
 
     @abstractmethod
@@ -52,14 +57,31 @@ class Shipping(SimulationEngineAware):
     def add_to_all_trades(self, trades):
         """
         Add all trades from a list of trades to the list of known shippable trades.
+        Every trade is assigned a unique trade id (see :py:attr:`Trade.trade_id`).
         :param trades:
         :type trades: List[Time
         :return:
         """
         for one_trade in trades:
-            if one_trade.time not in self._all_trades:
-                self._all_trades[one_trade.time] = []
-            self._all_trades[one_trade.time].append(one_trade)
+            self._add_trade(one_trade)
+
+    def _add_trade(self, trade):
+        """
+        Add a trade to the known shippable trades and assign it the next trade id.
+
+        The trade must not have been hashed before since its hash changes with the id (see :py:class:`Trade`).
+
+        :param trade: The trade.
+        :type trade: Trade
+        :raises ValueError: If the trade already has an id, i.e. is already registered.
+        """
+        if trade.trade_id is not None:
+            raise ValueError(f"Trade {trade.trade_id} is already registered.")
+        trade.trade_id = self._number_of_trades
+        self._number_of_trades += 1
+        if trade.time not in self._all_trades:
+            self._all_trades[trade.time] = []
+        self._all_trades[trade.time].append(trade)
 
     def get_trading_times(self):
         """
@@ -84,17 +106,36 @@ class Shipping(SimulationEngineAware):
         else:
             if time in self._all_trades:
                 trades = self._all_trades[time]
-                all_occurring_trades = [
-                    t for t in trades
-                    if self._engine.world.random.choice([0, 1], p=[1 - t.probability, t.probability])]
+                is_realised = self._sample_realisations(trades)
+                all_occurring_trades = [t for t, t_is_realised in zip(trades, is_realised) if t_is_realised]
                 logger.info(f"{len(all_occurring_trades)} trades of a total of {len(trades)} trades realised (time: {time}).")
-                for one_trade in [t for t in trades if t not in all_occurring_trades]:
-                    one_trade.status = TradeStatus.NOT_REALISED
+                for one_trade, one_trade_is_realised in zip(trades, is_realised):
+                    if not one_trade_is_realised:
+                        one_trade.status = TradeStatus.NOT_REALISED
                 self._occurred_trades[time] = all_occurring_trades
             else:
                 all_occurring_trades = []
         return all_occurring_trades
 
+    def _sample_realisations(self, trades):
+        """
+        Sample for all trades at once whether they are realised according to their probabilities.
+
+        The result is the same as sampling each trade with `random.choice([0, 1], p=[1 - p, p])` in order, i.e.
+        one uniform sample per trade which is compared to the cumulative probability of the trade not being realised.
+
+        :param trades: The trades.
+        :type trades: List[Trade]
+        :return: Whether each trade is realised.
+        :rtype: np.ndarray
+        """
+        probabilities = np.array([t.probability for t in trades], dtype=float)
+        if np.any((probabilities < 0) | (probabilities > 1)):
+            raise ValueError("Trade probabilities must be between 0 and 1.")
+        probabilities_not_realised = 1 - probabilities
+        uniform_samples = self._engine.world.random.random_sample(len(trades))
+        return uniform_samples >= probabilities_not_realised / (probabilities_not_realised + probabilities)
+
 
 class TradeStatus(Enum):
     UNKNOWN = 1
@@ -103,7 +144,18 @@ class TradeStatus(Enum):
     REJECTED = 4
 
 
-@attrs.define(kw_only=True)
+def _reject_trade_id_reassignment(trade, attribute, trade_id):
+    """
+    Allows to set the id of a trade which has no id and rejects changing the id of a trade which has one.
+
+    :raises ValueError: If the trade already has a different id.
+    """
+    if trade.trade_id is not None and trade_id != trade.trade_id:
+        raise ValueError(f"The id of trade {trade.trade_id} cannot be changed.")
+    return trade_id
+
+
+@attrs.define(kw_only=True, eq=False)
 class Trade(JsonAble):
     """
     A trade opportunity specifying a cargo that shall be transported.
@@ -118,6 +170,14 @@ class Trade(JsonAble):
     :type cargo_type: Hashable
     :param time: The time that trade becomes available for allocation or a market etc.
     :type time: int
+    :param trade_id: A unique id of the trade within a simulation which is assigned by the :py:class:`Shipping`
+        when the trade is generated. Bids are matched to trades by this id. Once set, the id cannot be changed.
+    :type trade_id: int | None
+
+    Trades with an id are equal if their ids are equal, e.g. a trade and its copies. Trades without an id are equal
+    if they are of the same class and all attributes are equal. A trade with an id never equals a trade without one.
+    Since the hash of a trade changes when it gets its id, trades without an id must not be hashed, e.g. put in sets
+    or used as dictionary keys, before they are registered with the :py:class:`Shipping`.
     """
     origin_port: Union[Port, str]
     destination_port: Union[Port, str]
@@ -126,6 +186,20 @@ class Trade(JsonAble):
     time: int = 0
     probability: float = 1
     status: TradeStatus = TradeStatus.UNKNOWN
+    trade_id: int = attrs.field(default=None, on_setattr=_reject_trade_id_reassignment)
+
+    def __eq__(self, other):
+        if not isinstance(other, Trade):
+            return NotImplemented
+        if self.trade_id is not None or other.trade_id is not None:
+            return self.trade_id == other.trade_id
+        return (self.__class__ is other.__class__
+                and all(getattr(self, a.name) == getattr(other, a.name) for a in attrs.fields(self.__class__)))
+
+    def __hash__(self):
+        if self.trade_id is not None:
+            return hash(self.trade_id)
+        return hash((self.origin_port, self.destination_port, self.amount, self.cargo_type, self.time))
 
     def to_json(self):
         # noinspection PyTypeChecker
@@ -133,7 +207,7 @@ class Trade(JsonAble):
         return attrs.asdict(self)
 
 
-@attrs.define(kw_only=True)
+@attrs.define(kw_only=True, eq=False)
 class TimeWindowTrade(Trade):
     """
     A trade with time windows.
@@ -237,10 +311,6 @@ class TimeWindowTrade(Trade):
         return [self.earliest_pickup_clean, self.latest_pickup_clean,
                 self.earliest_drop_off_clean, self.latest_drop_off_clean]
 
-    def __hash__(self):
-        hash_value = hash(f"super.__hash__(self) {self.time_window}")
-        return hash_value
-
 
 class StaticShipping(Shipping):
     """
@@ -260,9 +330,7 @@ class StaticShipping(Shipping):
             one_trade["origin_port"] = kwargs["world"].network.get_port(one_trade["origin_port"])
             one_trade["destination_port"] = kwargs["world"].network.get_port(one_trade["destination_port"])
             one_trade = kwargs["class_factory"].generate_trade(**one_trade)
-            if one_trade.time not in self._all_trades:
-                self._all_trades[one_trade.time] = []
-            self._all_trades[one_trade.time].append(one_trade)
+            self._add_trade(one_trade)
 
 
 class Market:
@@ -299,7 +367,7 @@ class SimpleMarket(Market, SimulationEngineAware):
         super().__init__()
 
     @staticmethod
-    def distribute_trades(time, trades, shipping_companies):
+    def distribute_trades(time, trades, shipping_companies, timeout=60, profiler=None, agent_runtime=None):
         """
         Distribute trades to the first shipping company. The company is first informed about all trades and is expected
         to return a list of requested trades which are then directly allocated to the company.
@@ -310,10 +378,20 @@ class SimpleMarket(Market, SimulationEngineAware):
             The list of trades.
         :param shipping_companies: [ShippingCompany]
             The list of shipping companies.
+        :param timeout: The time to give the company for each operation. Default is 60 seconds.
+        :type timeout: int
+        :param profiler: A profiler to record the time of the company's operations. Default is None (no profiling).
+        :type profiler: SimulationProfiler | None
+        :param agent_runtime: The backend to run the company's operations. Default is None which applies a
+            :py:class:`mable.agent_runtime.ThreadAgentRuntime`.
+        :type agent_runtime: AgentRuntime | None
         """
         first_company = shipping_companies[0]
-        request = first_company.inform(trades)
-        first_company.receive(request)
+        with default_agent_runtime(agent_runtime) as agent_runtime:
+            request = agent_runtime.run_operations(
+                OPERATION_INFORM, [first_company], [(trades,)], timeout=timeout, profiler=profiler)[0]
+            agent_runtime.run_operations(
+                OPERATION_RECEIVE, [first_company], [(request,)], timeout=timeout, profiler=profiler)
 
 
 @attrs.define(kw_only=True)
@@ -329,8 +407,20 @@ class Contract(JsonAble):
     trade: Trade
     fulfilled: bool = False
 
-    def copy(self):
-        return copy.deepcopy(self)
+    def copy(self, share_ports=False):
+        """
+        :param share_ports: If True, the copy references the same ports as the contract's trade instead of copies of
+            them. Ports are not changed during a simulation and are by far the most expensive part of the copy.
+            Default is False.
+        :type share_ports: bool
+        :return: A deep copy of the contract.
+        :rtype: Contract
+        """
+        memo = {}
+        if share_ports:
+            memo[id(self.trade.origin_port)] = self.trade.origin_port
+            memo[id(self.trade.destination_port)] = self.trade.destination_port
+        return copy.deepcopy(self, memo)
 
     def to_json(self):
         # noinspection PyTypeChecker
@@ -338,6 +428,106 @@ class Contract(JsonAble):
         return attrs.asdict(self)
 
 
+def _get_read_only(value):
+    """
+    :param value: Any value.
+    :return: The value if it is immutable (or a port). Otherwise, a read-only version of the value, i.e. lists and
+        tuples as tuples of read-only values, sets as frozen sets, dictionaries as read-only mappings and attrs
+        instances, e.g. trades, as :py:class:`ReadOnlyProxy`.
+    """
+    if isinstance(value, (list, tuple)):
+        value = tuple(_get_read_only(one_value) for one_value in value)
+    elif isinstance(value, set):
+        value = frozenset(value)
+    elif isinstance(value, dict):
+        value = MappingProxyType(value)
+    elif attrs.has(type(value)):
+        value = ReadOnlyProxy(value)
+    return value
+
+
+class ReadOnlyProxy(JsonAble):
+    """
+    A read-only proxy of an attrs instance, e.g. a contract that is shared by several companies.
+
+    Attributes and properties are read from the proxied object, whereby mutable values are read-only as well
+    (trades are proxies, lists are tuples etc.). Setting or deleting attributes raises an AttributeError and so does
+    accessing methods of the proxied object since they might change the object.
+    Use :py:func:`ReadOnlyProxy.copy` to obtain a changeable copy of the proxied object.
+
+    The proxy compares and hashes like the proxied object but it is not an instance of the proxied object's class,
+    i.e. isinstance(proxy, Contract) is False.
+
+    :param target: The proxied object.
+    """
+
+    __slots__ = ("_target",)
+
+    def __init__(self, target):
+        super().__init__()
+        object.__setattr__(self, "_target", target)
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if inspect.ismethod(value):
+            raise AttributeError(f"The method '{name}' of the read-only {type(self._target).__name__} is not"
+                                 f" available. Use a copy instead.")
+        return _get_read_only(value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self._target).__name__} is read-only.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self._target).__name__} is read-only.")
+
+    def __eq__(self, other):
+        if type(other) is ReadOnlyProxy:
+            other = other._target
+        return self._target == other
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __repr__(self):
+        return f"ReadOnlyProxy({self._target!r})"
+
+    def __reduce__(self):
+        return ReadOnlyProxy, (self._target,)
+
+    def copy(self):
+        """
+        :return: A changeable deep copy of the proxied object.
+        """
+        return copy.deepcopy(self._target)
+
+    def to_json(self):
+        return self._target.to_json()
+
+
+class LedgerView(Mapping):
+    """
+    A read-only mapping of company names to tuples of contracts.
+
+    :param contracts_per_company: The contracts per company name.
+    :type contracts_per_company: dict[str, tuple[ReadOnlyProxy, ...]]
+    """
+
+    def __init__(self, contracts_per_company):
+        self._contracts_per_company = contracts_per_company
+
+    def __getitem__(self, company_name):
+        return self._contracts_per_company[company_name]
+
+    def __iter__(self):
+        return iter(self._contracts_per_company)
+
+    def __len__(self):
+        return len(self._contracts_per_company)
+
+    def __repr__(self):
+        return f"LedgerView({self._contracts_per_company!r})"
+
+
 class AuctionLedger:
     """
     A ledger that collects the auction outcomes.
@@ -349,6 +539,7 @@ class AuctionLedger:
         :type shipping_companies: List[TradingCompany]
         """
         self._ledger = {one_company: [] for one_company in shipping_companies}
+        self._sanitised_ledger_view = None
 
     @property
     def ledger(self):
@@ -362,23 +553,42 @@ class AuctionLedger:
     def sanitised_ledger(self):
         """
         A full copy of the ledger as a dict of the trades indexed by the company names.
+        The copied contracts reference the original ports (see :py:func:`Contract.copy`).
 
         :return: The ledger.
         :rtype: Dict[str, List[Contract]]
         """
-        sanitised_ledger = {k.name: [c.copy() for c in self._ledger[k]] for k in self._ledger}
+        sanitised_ledger = {k.name: [c.copy(share_ports=True) for c in self._ledger[k]] for k in self._ledger}
         return sanitised_ledger
 
+    @property
+    def sanitised_ledger_view(self):
+        """
+        A read-only copy of the ledger as a mapping of tuples of the contracts indexed by the company names.
+        The copy is made on first access, i.e. once the auction is complete, and is shared by all companies.
+        Hence, the contracts are read-only proxies (see :py:class:`ReadOnlyProxy`) of the copies and not
+        :py:class:`Contract` instances.
+
+        :return: The ledger view.
+        :rtype: LedgerView
+        """
+        if self._sanitised_ledger_view is None:
+            self._sanitised_ledger_view = LedgerView(
+                {k.name: tuple(ReadOnlyProxy(c.copy(share_ports=True)) for c in self._ledger[k])
+                 for k in self._ledger})
+        return self._sanitised_ledger_view
+
     def get_trades_for_company_copy(self, shipping_company):
         """
         The trades allocated to a specific company.
+        The copied contracts reference the original ports (see :py:func:`Contract.copy`).
 
         :param shipping_company: The specific company.
         :type shipping_company: TradingCompany
-        :return: A lost of the trades.
-        :rtype: List[Trade]
+        :return: A list of copies of the company's contracts.
+        :rtype: List[Contract]
         """
-        trades = [copy.deepcopy(t) for t in self[shipping_company]]
+        trades = [t.copy(share_ports=True) for t in self[shipping_company]]
         return trades
 
     def __getitem__(self, shipping_company):
@@ -394,6 +604,7 @@ class AuctionLedger:
         :return:
         """
         self._ledger[shipping_company].append(value)
+        self._sanitised_ledger_view = None
 
     @property
     def keys(self):
@@ -405,22 +616,115 @@ class AuctionAllocationResult:
     unallocated_trades: List[Trade]
 
 
+class ClearingEngine:
+    """
+    Determines the winners and payments of an auction from a matrix of bids.
+    """
+
+    @abstractmethod
+    def clear(self, bid_matrix):
+        """
+        Clear an auction.
+
+        :param bid_matrix: The bid amounts with one row per company and one column per trade.
+            Trades for which a company did not bid are inf.
+        :type bid_matrix: np.ndarray
+        :return: The index of the winning company per trade (-1 if the trade is not allocated)
+            and the payment per trade.
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        pass
+
+
+class SecondPriceClearingEngine(ClearingEngine):
+    """
+    Clears all trades of an auction at once on a second price basis.
+
+    The lowest bid wins and ties are won by the company that comes first. The payment is the second-lowest bid
+    or the winning bid if there is only one bid for the trade.
+    """
+
+    def clear(self, bid_matrix):
+        number_of_companies, number_of_trades = bid_matrix.shape
+        if number_of_companies == 0 or number_of_trades == 0:
+            return np.full(number_of_trades, -1, dtype=int), np.full(number_of_trades, np.nan)
+        trade_indices = np.arange(number_of_trades)
+        winners = np.argmin(bid_matrix, axis=0)
+        lowest_bids = bid_matrix[winners, trade_indices]
+        if number_of_companies > 1:
+            second_lowest_bids = np.partition(bid_matrix, 1, axis=0)[1]
+        else:
+            second_lowest_bids = np.full(number_of_trades, np.inf)
+        payments = np.where(np.isinf(second_lowest_bids), lowest_bids, second_lowest_bids)
+        winners = np.where(np.isinf(lowest_bids), -1, winners)
+        return winners, payments
+
+
 class AuctionMarket(Market, SimulationEngineAware):
     """
     A market which auctions of trades.
+
+    :param clearing_engine: The clearing engine to determine the auction outcomes.
+        Default is None which applies a :py:class:`SecondPriceClearingEngine`.
+    :type clearing_engine: ClearingEngine | None
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, clearing_engine=None, **kwargs):
         super().__init__()
+        if clearing_engine is None:
+            clearing_engine = SecondPriceClearingEngine()
+        self._clearing_engine = clearing_engine
+
+    @property
+    def clearing_engine(self):
+        """
+        :return: The clearing engine to determine the auction outcomes.
+        :rtype: ClearingEngine
+        """
+        return self._clearing_engine
 
     @staticmethod
-    def _get_trade_index(trade, all_trades):
-        return all_trades.index(trade)
+    def _get_trade_indices(all_trades):
+        """
+        Index the trades of an auction by their trade ids.
+
+        :param all_trades: The trades.
+        :type all_trades: list[Trade]
+        :return: The index of each trade per trade id. Trades without an id are not included.
+        :rtype: dict[int, int]
+        """
+        return {one_trade.trade_id: i for i, one_trade in enumerate(all_trades) if one_trade.trade_id is not None}
+
+    @staticmethod
+    def _get_trade_index(trade, all_trades, trade_indices):
+        """
+        Find the index of a trade of an auction.
+
+        Trades with an id are looked up by their id. Trades without an id (e.g. trades that were not generated
+        by a :py:class:`Shipping`) are looked up by equality.
+
+        :param trade: The trade to find.
+        :type trade: Trade
+        :param all_trades: The trades of the auction.
+        :type all_trades: list[Trade]
+        :param trade_indices: The index of each trade per trade id, see :py:func:`_get_trade_indices`.
+        :type trade_indices: dict[int, int]
+        :return: The index or None if the trade is not part of the auction.
+        :rtype: int | None
+        """
+        trade_id = getattr(trade, "trade_id", None)
+        if trade_id is not None:
+            return trade_indices.get(trade_id)
+        try:
+            return all_trades.index(trade)
+        except ValueError:
+            return None
 
     @staticmethod
-    def inform_future_trades(trades, time, shipping_companies, timeout=60):
+    def inform_future_trades(trades, time, shipping_companies, timeout=60, profiler=None, agent_runtime=None,
+                             background=False):
         """
-        Informs the shipping companies of upcoming trades.
+        Informs the shipping companies of upcoming trades. All companies are informed concurrently.
 
         :param trades: The list of trades.
         :type trades: List[Trade]
@@ -429,18 +733,40 @@ class AuctionMarket(Market, SimulationEngineAware):
         :type shipping_companies: List[ShippingCompany]
         :param timeout: The time to give every company to process the trade information. Default is 60 seconds.
         :type timeout: int
-        """
-        for current_company in shipping_companies:
-            asyncio.run(AuctionMarket._company_pre_inform_timeout(
-                current_company, trades, time, timeout=timeout))
-
-    @staticmethod
-    def distribute_trades(time, trades, shipping_companies, timeout=60):
+        :param profiler: A profiler to record the time of the companies' operations. Default is None (no profiling).
+        :type profiler: SimulationProfiler | None
+        :param agent_runtime: The backend to run the companies' operations. Default is None which applies a
+            :py:class:`mable.agent_runtime.ThreadAgentRuntime`.
+        :type agent_runtime: AgentRuntime | None
+        :param background: If True, the companies are informed in the background, i.e. this returns immediately and
+            the companies' next operations wait for the information to be processed.
+            Requires an agent runtime. Default is False.
+        :type background: bool
+        :raises ValueError: If background is True but no agent runtime is given.
+        """
+        if background:
+            if agent_runtime is None:
+                raise ValueError("Informing in the background requires an agent runtime.")
+            agent_runtime.start_operations(OPERATION_PRE_INFORM, shipping_companies,
+                                           [(trades, time)] * len(shipping_companies), timeout=timeout,
+                                           profiler=profiler)
+            return
+        with default_agent_runtime(agent_runtime) as agent_runtime:
+            agent_runtime.run_operations(OPERATION_PRE_INFORM, shipping_companies,
+                                         [(trades, time)] * len(shipping_companies), timeout=timeout,
+                                         profiler=profiler)
+
+    def distribute_trades(self, time, trades, shipping_companies, timeout=60, profiler=None, agent_runtime=None):
         """
         Distribute trades on a second price auction basis. The shipping companies are
         informed (ShippingCompany.receive) of the trades they get allocated via Contracts. All allocations
         are also returned.
 
+        All companies are asked for their bids (ShippingCompany.inform) concurrently, each with its own timeout.
+        The bids are collected in a matrix of companies and trades which is cleared by the market's clearing engine
+        (see :py:attr:`clearing_engine`).
+        If a company bids several times for the same trade only its lowest bid is considered.
+
         :param time: The time of occurrence.
         :type time: float
         :param trades: The list of trades.
@@ -449,54 +775,43 @@ class AuctionMarket(Market, SimulationEngineAware):
         :type shipping_companies: list[TradingCompany]
         :param timeout: The time to give every company to process the trade information. Default is 60 seconds.
         :type timeout: int
+        :param profiler: A profiler to record the time of the companies' operations. Default is None (no profiling).
+        :type profiler: SimulationProfiler | None
+        :param agent_runtime: The backend to run the companies' operations. Default is None which applies a
+            :py:class:`mable.agent_runtime.ThreadAgentRuntime`.
+        :type agent_runtime: AgentRuntime | None
         :return: All allocated traded per company.
         :rtype: AuctionLedger
         """
-        all_bids_per_trade = {i: [] for i in range(len(trades))}
+        bid_company_indices = []
+        bid_trade_indices = []
+        bid_amounts = []
+        trade_indices = AuctionMarket._get_trade_indices(trades)
         ledger = AuctionLedger(shipping_companies)
-        for current_company in shipping_companies:
-            company_bids = asyncio.run(AuctionMarket._company_inform_timeout(
-                current_company, trades, timeout=timeout))
+        with default_agent_runtime(agent_runtime) as agent_runtime:
+            all_company_bids = agent_runtime.run_operations(
+                OPERATION_INFORM, shipping_companies, [(trades[:],) for _ in shipping_companies],
+                timeout=timeout, profiler=profiler)
+        for company_index, (current_company, company_bids) in enumerate(zip(shipping_companies, all_company_bids)):
+            if company_bids is None:
+                company_bids = []
             for one_bid in company_bids:
+                trade_index = AuctionMarket._get_trade_index(one_bid.trade, trades, trade_indices)
+                if trade_index is None:
+                    logger.warning(f"Company {current_company.name} bid for a trade that is not part of the auction"
+                                   f" (time: {time}). The bid is ignored.")
+                    continue
                 one_bid.company = current_company
-                all_bids_per_trade[AuctionMarket._get_trade_index(one_bid.trade, trades)].append(one_bid)
-        for one_trade in trades:
-            all_bids_for_current_trade = all_bids_per_trade[AuctionMarket._get_trade_index(one_trade, trades)]
-            if len(all_bids_for_current_trade) > 0:
-                all_bids_for_current_trade_sorted = sorted(all_bids_for_current_trade, key=lambda b: b.amount)
-                smallest_bid_company = all_bids_for_current_trade_sorted[0].company
-                if len(all_bids_for_current_trade_sorted) > 1:
-                    payment = all_bids_for_current_trade_sorted[1].amount
-                else:
-                    payment = all_bids_for_current_trade_sorted[0].amount
-                trade_contract = Contract(payment=payment, trade=one_trade)
-                ledger[smallest_bid_company].append(trade_contract)
+                bid_company_indices.append(company_index)
+                bid_trade_indices.append(trade_index)
+                bid_amounts.append(one_bid.amount)
+        bid_matrix = np.full((len(shipping_companies), len(trades)), np.inf)
+        # fmin ignores NaN bids and keeps the lowest bid if a company bids several times for a trade.
+        np.fmin.at(bid_matrix,
+                   (np.array(bid_company_indices, dtype=int), np.array(bid_trade_indices, dtype=int)),
+                   np.array(bid_amounts, dtype=float))
+        winners, payments = self._clearing_engine.clear(bid_matrix)
+        for trade_index in np.flatnonzero(winners >= 0):
+            trade_contract = Contract(payment=float(payments[trade_index]), trade=trades[trade_index])
+            ledger[shipping_companies[winners[trade_index]]].append(trade_contract)
         return ledger
-
-    @staticmethod
-    async def _company_inform_timeout(company, trades, timeout=60):
-        company_bids = []
-        try:
-            company_bids = await asyncio.wait_for(
-                asyncio.to_thread(company.inform, trades[:]),
-                timeout=timeout
-            )
-        except asyncio.TimeoutError:
-            logger.warning(f"Company {company.name} was stopped from operating 'inform' after {timeout} seconds.")
-        except Exception as e:
-            logger.error(f"Company {company.name} ran into an exception while operating 'inform'.")
-        return company_bids
-
-    @staticmethod
-    async def _company_pre_inform_timeout(company, trades, time, timeout=60):
-        company_bids = []
-        try:
-            await asyncio.wait_for(
-                asyncio.to_thread(company.pre_inform, trades, time),
-                timeout=timeout
-            )
-        except asyncio.TimeoutError:
-            logger.warning(f"Company {company.name} was stopped from operating 'pre_inform' after {timeout} seconds.")
-        except Exception as e:
-            logger.error(f"Company {company.name} ran into an exception while operating 'pre_inform'.")
-        return company_bids
@@ -86,6 +86,14 @@ class World(SimulationEngineAware):
             are_events_left = False
         return are_events_left
 
+    def peek_next_event(self):
+        """
+        Return the next event of the queue without removing it.
+
+        :return: The event or None if there are no events left.
+        """
+        return self._event_queue.peek()
+
     def get_next_event(self):
         """
         Removes and return the next event of the queue. Also sets the current time to the time of the
@@ -105,6 +113,17 @@ class World(SimulationEngineAware):
         """
         return self._current_time
 
+    def set_current_time(self, current_time):
+        """
+        **WARNING**: Part of internal simulation logic. Only allowed to be called by the simulation!
+
+        Set the current time, e.g. in the copy of a world that mirrors another world.
+
+        :param current_time: The current time.
+        :type current_time: float
+        """
+        self._current_time = current_time
+
     def set_engine(self, engine):
         """
         Make the simulation engine know to the world and the event queue.
@@ -10,6 +10,7 @@ from mable.engine import SimulationEngine
 from mable.simulation_space.universe import Port, Location
 from mable.simulation_space.structure import UnitShippingNetwork
 from mable.transport_operation import SimpleCompany, SimpleVessel, CargoCapacity
+from mable.transportation_scheduling import Schedule
 from mable.shipping_market import StaticShipping, SimpleMarket, Trade
 from mable.event_management import ArrivalEvent, CargoTransferEvent, IdleEvent, TravelEvent, EventQueue, \
     VesselLocationInformationEvent, CargoEvent
@@ -44,7 +45,8 @@ class SimulationBuilder:
     def generate_engine(self, *args, **kwargs):
         """
         Generates an engine from the specifications by generating all units in turn.
-        Order: random, network, world, shipping_companies, shipping(cargo generation), market (shipping allocation).
+        Order: random, network, world, shipping_companies, schedules, shipping(cargo generation),
+        market (shipping allocation).
         :return:
             The simulation engine.
         """
@@ -52,6 +54,7 @@ class SimulationBuilder:
             .generate_network()\
             .generate_world()\
             .generate_shipping_companies()\
+            .generate_schedules()\
             .generate_shipping()\
             .generate_market()
         simulation_engine = self._class_factory.generate_engine(self._world, self._companies, self._shipping,
@@ -218,6 +221,22 @@ class SimulationBuilder:
         kwargs["capacities_and_loading_rates"] = all_cargo_capacities
         return self._class_factory.generate_vessel(**kwargs)
 
+    def generate_schedules(self, *args, **kwargs):
+        """
+        Generates the (empty) schedules of all vessels based on the class factory's
+        :py:func:`ClassFactory.generate_schedule`.
+        :param args:
+            Positional args.
+        :param kwargs:
+            Keyword args.
+        :return:
+            self
+        """
+        for one_company in self._companies:
+            for one_vessel in one_company.fleet:
+                one_vessel.reset_schedule(self._class_factory.generate_schedule(one_vessel, 0))
+        return self
+
     def generate_shipping(self, *args, **kwargs):
         """
         Generates the shipping (cargo generation) unit based on the specification information and the
@@ -375,6 +394,20 @@ class ClassFactory:
         """
         return SimpleVessel(*args, **kwargs)
 
+    @staticmethod
+    def generate_schedule(*args, **kwargs):
+        """
+        Generates the schedule of a vessel. Default: py:class:`mable.transportation_scheduling.Schedule`.
+        Copies of a schedule, e.g. the ones the companies use to plan, have the same type.
+        :param args:
+            Positional args.
+        :param kwargs:
+            Keyword args.
+        :return:
+            The schedule.
+        """
+        return Schedule(*args, **kwargs)
+
     @staticmethod
     def generate_cargo_capacity(*args, **kwargs):
         """
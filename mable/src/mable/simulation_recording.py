@@ -0,0 +1,548 @@
+"""
+Recording of simulation runs into an append-only binary log and replaying such logs without companies or routing.
+
+A log is a stream of pickled records. Each record is pickled with a fresh pickle memo such that it captures the
+state of its objects at the time of recording, e.g. whether a contract is fulfilled, and the recorder does not keep
+the recorded objects alive. The engine, the world, the network, the companies and, once the fleets are recorded,
+the vessels and ports are stored as references and are identical objects in the replay. Other objects that occur
+in several records, e.g. trades, are separate but equal copies in the replay.
+
+**Warning**: *Loading a log unpickles its content. Only replay logs from trusted sources.*
+"""
+
+import pickle
+
+from loguru import logger
+
+from mable.engine import SimulationEngine
+from mable.event_management import EventQueue, VesselEvent
+from mable.simulation_environment import World
+from mable.simulation_space.structure import NetworkWithPortDict
+from mable.transport_operation import ShippingCompany
+
+
+RECORDING_FORMAT_VERSION = 2
+
+RECORD_HEADER = "header"
+RECORD_FLEETS = "fleets"
+RECORD_EVENT = "event"
+RECORD_DISTANCES = "distances"
+RECORD_SCHEDULE = "schedule"
+RECORD_FINISH = "finish"
+
+PERSISTENT_ID_ENGINE = "engine"
+PERSISTENT_ID_WORLD = "world"
+PERSISTENT_ID_NETWORK = "network"
+PERSISTENT_ID_COMPANY = "company"
+PERSISTENT_ID_VESSEL = "vessel"
+PERSISTENT_ID_PORT = "port"
+
+
+def get_location_key(location):
+    """
+    The key under which distances from and to a location are recorded.
+
+    :param location: A location, a port or the name of a port.
+    :type location: Location | OnJourney | str
+    :return: The name of the location if it has one. Otherwise, the representation of the location.
+    :rtype: str
+    """
+    if isinstance(location, str):
+        key = location
+    elif getattr(location, "name", None) is not None:
+        key = location.name
+    else:
+        key = repr(location)
+    return key
+
+
+class _RecordPickler(pickle.Pickler):
+    """
+    A pickler that stores references to the engine, the world, the network and the companies (and, after
+    :py:func:`reference_fleets`, the vessels and ports) instead of the objects themselves.
+    """
+
+    def __init__(self, file, engine):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._persistent_ids = {
+            id(engine): PERSISTENT_ID_ENGINE,
+            id(engine.world): PERSISTENT_ID_WORLD,
+            id(engine.world.network): PERSISTENT_ID_NETWORK
+        }
+        for company_index, one_company in enumerate(engine.shipping_companies):
+            self._persistent_ids[id(one_company)] = (PERSISTENT_ID_COMPANY, company_index)
+
+    def reference_fleets(self, engine):
+        """
+        Store references to the vessels and ports from now on instead of the objects themselves.
+
+        :param engine: The simulation engine.
+        :type engine: SimulationEngine
+        """
+        for company_index, one_company in enumerate(engine.shipping_companies):
+            for vessel_index, one_vessel in enumerate(one_company.fleet):
+                self._persistent_ids[id(one_vessel)] = (PERSISTENT_ID_VESSEL, company_index, vessel_index)
+        for one_port in engine.world.network.ports:
+            self._persistent_ids[id(one_port)] = (PERSISTENT_ID_PORT, one_port.name)
+
+    def persistent_id(self, obj):
+        return self._persistent_ids.get(id(obj))
+
+
+class _RecordUnpickler(pickle.Unpickler):
+    """
+    An unpickler that resolves the references of :py:class:`_RecordPickler` to the objects of a replay.
+    """
+
+    def __init__(self, file, persistent_objects):
+        super().__init__(file)
+        self._persistent_objects = persistent_objects
+
+    def persistent_load(self, pid):
+        if isinstance(pid, list):
+            pid = tuple(pid)
+        if pid not in self._persistent_objects:
+            raise pickle.UnpicklingError(f"Unknown persistent id {pid} in simulation recording.")
+        return self._persistent_objects[pid]
+
+
+class _DistanceRecordingEngine:
+    """
+    Stands in for the engine when an event determines its distance so that all distance requests are recorded.
+    Acts as its own world and network.
+    """
+
+    def __init__(self, engine, recorder):
+        self._engine = engine
+        self._recorder = recorder
+
+    @property
+    def world(self):
+        return self
+
+    @property
+    def network(self):
+        return self
+
+    def get_distance(self, location_one, location_two):
+        return self._recorder.record_distance(self._engine, location_one, location_two)
+
+
+class SimulationRecorder:
+    """
+    Records the processed events, their execution data, the applied schedules and the distances needed to
+    evaluate the events into a binary log. See :py:class:`SimulationReplayEngine` to replay a log.
+
+    The recorder is passed to the engine (:py:class:`mable.engine.SimulationEngine`) which calls the recording
+    functions. Copies of a recorder, e.g. in snapshots or forks of an engine, do not record.
+    """
+
+    def __init__(self, file_path):
+        """
+        :param file_path: The path of the log file. An existing file will be overwritten.
+        :type file_path: str | pathlib.Path
+        """
+        super().__init__()
+        self._file_path = file_path
+        self._file = None
+        self._pickler = None
+        self._distances = {}
+        self._new_distances = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_file_path"] = None
+        state["_file"] = None
+        state["_pickler"] = None
+        return state
+
+    @property
+    def file_path(self):
+        """
+        :return: The path of the log file.
+        :rtype: str | pathlib.Path
+        """
+        return self._file_path
+
+    @property
+    def is_recording(self):
+        """
+        :return: True if the recording has started and is not finished.
+        :rtype: bool
+        """
+        return self._pickler is not None
+
+    def _write(self, record):
+        self._pickler.dump(record)
+        self._pickler.clear_memo()
+
+    def start(self, engine):
+        """
+        Start the recording with the header, i.e. the info of the simulation, the companies' names, the ports and
+        the vessels.
+
+        :param engine: The simulation engine.
+        :type engine: SimulationEngine
+        """
+        if self._file_path is None or self.is_recording:
+            return
+        self._file = open(self._file_path, "wb")
+        self._pickler = _RecordPickler(self._file, engine)
+        header = {
+            "format_version": RECORDING_FORMAT_VERSION,
+            "info": engine.info,
+            "company_names": [one_company.name for one_company in engine.shipping_companies]
+        }
+        self._write((RECORD_HEADER, header))
+        fleets = [one_company.fleet for one_company in engine.shipping_companies]
+        self._write((RECORD_FLEETS, engine.world.network.ports, fleets))
+        self._pickler.reference_fleets(engine)
+
+    def record_distance(self, engine, location_one, location_two):
+        """
+        Determine a distance via the engine's network and record it.
+
+        :param engine: The simulation engine.
+        :type engine: SimulationEngine
+        :param location_one: The first location.
+        :param location_two: The second location.
+        :return: The distance.
+        :rtype: float
+        """
+        key = (get_location_key(location_one), get_location_key(location_two))
+        if key not in self._distances:
+            distance = engine.world.network.get_distance(location_one, location_two)
+            self._distances[key] = distance
+            self._new_distances[key] = distance
+        return self._distances[key]
+
+    def _write_new_distances(self):
+        if len(self._new_distances) > 0:
+            self._write((RECORD_DISTANCES, self._new_distances))
+            self._new_distances = {}
+
+    def record_event(self, engine, event, data):
+        """
+        Record an event about which the observers are notified. For vessel events, the state of the vessel, i.e.
+        location, load and if the event was logged in the journey log, and the event's distance are recorded.
+
+        :param engine: The simulation engine.
+        :type engine: SimulationEngine
+        :param event: The event.
+        :type event: Event
+        :param data: The data from the event's execution.
+        :type data: EventExecutionData | None
+        """
+        if not self.is_recording:
+            return
+        vessel_state = None
+        if isinstance(event, VesselEvent):
+            vessel = event.vessel
+            event.distance(_DistanceRecordingEngine(engine, self))
+            load = {one_cargo_type: vessel.current_load(one_cargo_type)
+                    for one_cargo_type in vessel.loadable_cargo_types()}
+            is_logged = len(vessel.journey_log) > 0 and vessel.journey_log[-1] is event
+            vessel_state = (vessel.location, load, is_logged)
+        self._write_new_distances()
+        self._write((RECORD_EVENT, engine.world.current_time, event, data, vessel_state))
+
+    def record_schedule(self, engine, vessel, schedule):
+        """
+        Record a schedule that is applied to a vessel.
+
+        :param engine: The simulation engine.
+        :type engine: SimulationEngine
+        :param vessel: The vessel.
+        :type vessel: Vessel
+        :param schedule: The schedule.
+        :type schedule: Schedule
+        """
+        if not self.is_recording:
+            return
+        self._write((RECORD_SCHEDULE, engine.world.current_time, vessel, schedule.get_simple_schedule()))
+
+    def finish(self, engine):
+        """
+        Finish the recording. Records the distances to evaluate unfulfilled contracts, i.e. from every vessel of
+        a company to the origin of each of the company's contracts and between the origin and destination of
+        each contract.
+
+        :param engine: The simulation engine.
+        :type engine: SimulationEngine
+        """
+        if not self.is_recording:
+            return
+        for one_company, contracts in engine.market_authority.contracts_per_company.items():
+            for one_contract in contracts:
+                trade = one_contract.trade
+                self.record_distance(engine, trade.origin_port, trade.destination_port)
+                for one_vessel in one_company.fleet:
+                    self.record_distance(engine, one_vessel.location, trade.origin_port)
+        self._write_new_distances()
+        self._write((RECORD_FINISH, engine.world.current_time))
+        self.close()
+        logger.info(f"Simulation recorded to {self._file_path}")
+
+    def close(self):
+        """
+        Close the log file.
+        """
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._pickler = None
+
+
+class SimulationRecordReader:
+    """
+    Reads the records of a log written by :py:class:`SimulationRecorder`.
+    """
+
+    def __init__(self, file_path, persistent_objects):
+        """
+        :param file_path: The path of the log file.
+        :type file_path: str | pathlib.Path
+        :param persistent_objects: The objects that replace the engine, the world, the network, the companies, the
+            vessels and the ports. Companies can be added after the header was read, vessels and ports after the
+            fleets were read.
+        :type persistent_objects: dict
+        """
+        super().__init__()
+        self._file = open(file_path, "rb")
+        self._persistent_objects = persistent_objects
+
+    def read(self):
+        """
+        Read the next record.
+
+        :return: The record or None if the end of the log is reached.
+        :rtype: tuple | None
+        """
+        if self._file is None:
+            return None
+        # Every record was pickled with a fresh memo and is hence read with a fresh unpickler.
+        try:
+            record = _RecordUnpickler(self._file, self._persistent_objects).load()
+        except EOFError:
+            record = None
+            self.close()
+        return record
+
+    def close(self):
+        """
+        Close the log file.
+        """
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+
+
+class ReplayNetwork(NetworkWithPortDict):
+    """
+    A network that only knows the recorded distances.
+    """
+
+    def __init__(self, ports=None):
+        super().__init__(ports)
+        self._distances = {}
+
+    def add_ports(self, ports):
+        """
+        Add ports.
+
+        :param ports: The ports.
+        :type ports: list[Port]
+        """
+        self._ports.update(self._create_port_dict(ports))
+
+    def add_distances(self, distances):
+        """
+        Add recorded distances.
+
+        :param distances: The distances by the keys (see :py:func:`get_location_key`) of the two locations.
+        :type distances: dict[tuple[str, str], float]
+        """
+        self._distances.update(distances)
+
+    def get_distance(self, location_one, location_two):
+        """
+        The recorded distance between two locations.
+
+        :param location_one: The first location.
+        :param location_two: The second location.
+        :return: The distance.
+        :rtype: float
+        :raises ValueError: If the distance was not recorded.
+        """
+        key = (get_location_key(location_one), get_location_key(location_two))
+        if key not in self._distances:
+            raise ValueError(f"The distance between {key[0]} and {key[1]} was not recorded.")
+        return self._distances[key]
+
+    def get_journey_location(self, journey, vessel, current_time):
+        raise ValueError("Journey locations are not available in a replay.")
+
+
+class ReplayWorld(World):
+    """
+    A world that takes its events from a simulation log instead of an event queue.
+    """
+
+    def __init__(self, network, reader):
+        """
+        :param network: The replay network.
+        :type network: ReplayNetwork
+        :param reader: The reader of the log.
+        :type reader: SimulationRecordReader
+        """
+        super().__init__(network, EventQueue(), None)
+        self._reader = reader
+        self._next_event_record = None
+        self._applied_schedules = []
+
+    @property
+    def applied_schedules(self):
+        """
+        :return: The applied schedules up to the current time as tuples of time, vessel and simple schedule
+            (see :py:func:`mable.transportation_scheduling.Schedule.get_simple_schedule`).
+        :rtype: list[tuple[float, Vessel, list]]
+        """
+        return self._applied_schedules
+
+    def _read_until_next_event(self):
+        """
+        Apply all records up to the next event record.
+
+        :return: The next event record or None if no events are left.
+        :rtype: tuple | None
+        """
+        while self._next_event_record is None:
+            record = self._reader.read()
+            if record is None:
+                break
+            record_type = record[0]
+            if record_type == RECORD_EVENT:
+                self._next_event_record = record
+            elif record_type == RECORD_DISTANCES:
+                self._network.add_distances(record[1])
+            elif record_type == RECORD_SCHEDULE:
+                self._applied_schedules.append(record[1:])
+            elif record_type == RECORD_FINISH:
+                self._current_time = record[1]
+            else:
+                raise ValueError(f"Unknown record type '{record_type}' in simulation recording.")
+        return self._next_event_record
+
+    def do_events_exists(self):
+        return self._read_until_next_event() is not None
+
+    def peek_next_event(self):
+        next_event_record = self._read_until_next_event()
+        next_event = None
+        if next_event_record is not None:
+            next_event = next_event_record[2]
+        return next_event
+
+    def get_next_event(self):
+        return self.get_next_event_record()[2]
+
+    def get_next_event_record(self):
+        """
+        Removes and returns the next event record. Also sets the current time to the time of the record.
+
+        :return: The record consisting of the record type, the time, the event, the event's execution data and
+            the state of the event's vessel (or None).
+        :rtype: tuple
+        :raises ValueError: If no events are left.
+        """
+        next_event_record = self._read_until_next_event()
+        if next_event_record is None:
+            raise ValueError("No events left in simulation recording.")
+        self._next_event_record = None
+        self._current_time = next_event_record[1]
+        return next_event_record
+
+
+class SimulationReplayEngine(SimulationEngine):
+    """
+    An engine that replays a log written by :py:class:`SimulationRecorder`. The observers are notified about the
+    recorded events without any companies acting or routes being determined. Vessels are restored from the log
+    and their location, load and journey log are updated as recorded before the observers are notified.
+    The companies are plain :py:class:`mable.transport_operation.ShippingCompany` instances that only carry
+    the name and the fleet.
+    """
+
+    def __init__(self, file_path, pre_run_cmds=None, post_run_cmds=None, output_directory=None, profile=False):
+        """
+        :param file_path: The path of the log file.
+        :type file_path: str | pathlib.Path
+        :param pre_run_cmds: Commands to be executed before the replay. Default is no commands.
+        :param post_run_cmds: Commands to be executed after the replay. Default is no commands.
+        :param output_directory: The directory for output files. If None, the working directory is used.
+        :type output_directory: str | None
+        :param profile: If True, the time of events and observers is recorded.
+        :type profile: bool
+        :raises ValueError: If the log is not a simulation recording of a supported format.
+        """
+        network = ReplayNetwork()
+        persistent_objects = {PERSISTENT_ID_ENGINE: self, PERSISTENT_ID_NETWORK: network}
+        reader = SimulationRecordReader(file_path, persistent_objects)
+        header_record = reader.read()
+        if header_record is None or header_record[0] != RECORD_HEADER:
+            raise ValueError(f"File {file_path} is not a simulation recording.")
+        header = header_record[1]
+        if header["format_version"] != RECORDING_FORMAT_VERSION:
+            raise ValueError(f"Unsupported simulation recording format version {header['format_version']}.")
+        companies = [ShippingCompany([], one_name) for one_name in header["company_names"]]
+        for company_index, one_company in enumerate(companies):
+            persistent_objects[(PERSISTENT_ID_COMPANY, company_index)] = one_company
+        world = ReplayWorld(network, reader)
+        persistent_objects[PERSISTENT_ID_WORLD] = world
+        fleets_record = reader.read()
+        if fleets_record is None or fleets_record[0] != RECORD_FLEETS:
+            raise ValueError(f"Simulation recording {file_path} has no fleets.")
+        _, ports, fleets = fleets_record
+        network.add_ports(ports)
+        for one_port in ports:
+            persistent_objects[(PERSISTENT_ID_PORT, one_port.name)] = one_port
+        for company_index, (one_company, one_fleet) in enumerate(zip(companies, fleets)):
+            one_company.fleet.extend(one_fleet)
+            for vessel_index, one_vessel in enumerate(one_fleet):
+                persistent_objects[(PERSISTENT_ID_VESSEL, company_index, vessel_index)] = one_vessel
+        if pre_run_cmds is None:
+            pre_run_cmds = []
+        if post_run_cmds is None:
+            post_run_cmds = []
+        super().__init__(world, companies, None, None, None, pre_run_cmds=pre_run_cmds, post_run_cmds=post_run_cmds,
+                         output_directory=output_directory, info=header["info"], profile=profile)
+        world.set_engine(self)
+        network.set_engine(self)
+        for one_company in companies:
+            one_company.set_engine(self)
+
+    def _set_up_trades(self):
+        pass
+
+    def _process_next_event(self):
+        """
+        Take the next event from the log and restore the state of its vessel.
+
+        :return: The next event and the recorded data from its execution.
+        :rtype: tuple[Event|None, EventExecutionData|None]
+        """
+        next_event, data = None, None
+        if self._world.do_events_exists():
+            _, _, next_event, data, vessel_state = self._world.get_next_event_record()
+            if vessel_state is not None:
+                vessel = next_event.vessel
+                location, load, is_logged = vessel_state
+                vessel.location = location
+                for one_cargo_type, amount in load.items():
+                    load_difference = amount - vessel.current_load(one_cargo_type)
+                    if load_difference > 0:
+                        vessel.load_cargo(one_cargo_type, load_difference)
+                    elif load_difference < 0:
+                        vessel.unload_cargo(one_cargo_type, -load_difference)
+                if is_logged:
+                    vessel.log_journey_log_event(next_event)
+        return next_event, data
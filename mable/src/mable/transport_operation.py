@@ -381,11 +381,21 @@ class Vessel(SimulationEngineAware):
     @property
     def schedule(self):
         """
-        :return: A copy of the vessel's current schedule.
+        :return: A copy of the vessel's current schedule. The copy shares the schedule's data until either is changed
+            (see :py:func:`mable.transportation_scheduling.Schedule.copy`).
         :rtype: Schedule
         """
         return self._schedule.copy()
 
+    @property
+    def schedule_view(self):
+        """
+        :return: A read-only view of the vessel's current schedule for callers that do not change the schedule.
+            The view reflects the progress of the vessel along the schedule.
+        :rtype: mable.transportation_scheduling.ScheduleView
+        """
+        return self._schedule.view()
+
     @property
     def _next_event(self):
         """
@@ -440,6 +450,24 @@ class Vessel(SimulationEngineAware):
         self._schedule = new_schedule
         self.start_next_event()
 
+    def reset_schedule(self, schedule):
+        """
+        **WARNING**: Part of internal simulation logic. Only allowed to be called by the simulation!
+
+        Replace the empty schedule of a vessel before the simulation starts, e.g. by a schedule of a different type
+        (see :py:func:`mable.simulation_generation.ClassFactory.generate_schedule`). In contrast to setting the
+        schedule, the event queue is not changed.
+
+        :param schedule: The new schedule.
+        :type schedule: Schedule
+        :raises ValueError: If the current schedule is not empty.
+        """
+        if len(self._schedule) > 0:
+            raise ValueError(f"The schedule of vessel {self.name} is not empty.")
+        self._schedule = schedule
+        if self._engine is not None:
+            self._schedule.set_engine(self._engine)
+
     def event_occurrence(self, event):
         """
         **WARNING**: Part of internal simulation logic. Only allowed to be called by the simulation!
@@ -791,7 +819,7 @@ class SimpleCompany(ShippingCompany[V]):
             j = 0
             while j < len(self._fleet) and not is_assigned:
                 current_vessel = self._fleet[j]
-                current_vessel_schedule = schedules.get(current_vessel, current_vessel.schedule)
+                current_vessel_schedule = schedules.get(current_vessel, current_vessel.schedule_view)
                 new_schedule = current_vessel_schedule.copy()
                 new_schedule.add_transportation(current_trade)
                 if new_schedule.verify_schedule():
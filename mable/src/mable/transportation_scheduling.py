@@ -6,6 +6,7 @@ from __future__ import annotations
 
 from enum import IntEnum
 import math
+import itertools
 from itertools import product
 from typing import TYPE_CHECKING, List, Tuple
 
@@ -24,6 +25,10 @@ if TYPE_CHECKING:
     from mable.shipping_market import Trade
 
 
+# The amount by which a cycle of the STN may be negative due to rounding errors and still be considered non-negative.
+NEGATIVE_CYCLE_TOLERANCE = 1e-9
+
+
 class TransportationSourceDestinationIndicator(IntEnum):
     PICK_UP = 0
     DROP_OFF = 1
@@ -51,6 +56,17 @@ class CurrentState:
     is_valid: bool = True
 
 
+@attrs.define(kw_only=True)
+class InsertionEvaluation:
+    """
+    The outcome of inserting a transportation into a schedule (see :py:func:`Schedule.evaluate_insertions`).
+    """
+    pick_up: int
+    drop_off: int
+    completion_time: float
+    added_travel_distance: float
+
+
 class Schedule(SimulationEngineAware):
     """
     The schedule of a vessel.
@@ -67,15 +83,24 @@ class Schedule(SimulationEngineAware):
         """
         super().__init__()
         if schedule is None:
-            self._stn = nx.DiGraph()
-            self._stn.add_node(0)
+            self._stn = self._generate_empty_stn()
         else:
             self._stn = schedule
+        # If True, the STN is shared with copies of the schedule and has to be copied before it is changed.
+        self._is_stn_shared = False
         self._vessel = vessel
         self._time_schedule_head = current_time
         self._creation_time = creation_time
         self._next_event = None
         self._last_event = None
+        # The shortest paths between all nodes of the STN (in the order of _get_distance_matrix) and whether the STN
+        # has no negative cycles. None if unknown. The shortest paths are only kept for consistent STNs. The matrix is
+        # never changed in place, so copies of the schedule can share it.
+        self._shortest_paths = None
+        self._is_time_consistent = None
+        if schedule is None:
+            self._shortest_paths = np.zeros((1, 1))
+            self._is_time_consistent = True
 
     @classmethod
     def init_with_engine(cls, vessel, current_time, engine):
@@ -83,6 +108,12 @@ class Schedule(SimulationEngineAware):
         schedule.set_engine(engine)
         return schedule
 
+    @staticmethod
+    def _generate_empty_stn():
+        stn = nx.DiGraph()
+        stn.add_node(0)
+        return stn
+
     @property
     def _number_tasks(self):
         task_indices = [n[0] for n in self._stn.nodes if isinstance(n, tuple)]
@@ -91,18 +122,67 @@ class Schedule(SimulationEngineAware):
 
     def copy(self):
         """
-        Create a copy that contains the reference to the vessel but creates a deep copy of the actual schedule.
+        Create a copy that contains the reference to the vessel but behaves like a deep copy of the actual schedule.
+
+        The copy is copy-on-write: the schedule and the copy share the STN until either of them is changed, e.g.
+        by adding a transportation or popping an event, at which point the changed schedule copies the STN.
 
         :return: The copy
         :rtype: Schedule
         """
-        copy_with_copy_stn = Schedule(
+        copy_with_shared_stn = self.__class__(
             self._vessel, current_time=self._time_schedule_head, creation_time=self._creation_time,
-            schedule=self._stn.copy())
-        copy_with_copy_stn.set_engine(self._engine)
-        return copy_with_copy_stn
+            schedule=self._stn)
+        copy_with_shared_stn.set_engine(self._engine)
+        copy_with_shared_stn._shortest_paths = self._shortest_paths
+        copy_with_shared_stn._is_time_consistent = self._is_time_consistent
+        copy_with_shared_stn._is_stn_shared = True
+        self._is_stn_shared = True
+        return copy_with_shared_stn
+
+    def view(self):
+        """
+        :return: A read-only view of the schedule.
+        :rtype: ScheduleView
+        """
+        return ScheduleView(self)
+
+    def _ensure_stn_is_not_shared(self):
+        """
+        Copy the STN if it is shared with copies of the schedule. Has to be called before the STN is changed.
+        """
+        if self._is_stn_shared:
+            self._stn = self._stn.copy()
+            self._is_stn_shared = False
+
+    def _invalidate_shortest_paths(self):
+        self._shortest_paths = None
+        self._is_time_consistent = None
+
+    def _has_node(self, node):
+        return node in self._stn
+
+    def _get_node_data(self, node):
+        """
+        :param node: The node.
+        :return: The data of the node, i.e. the trade and the location type for task nodes.
+        :rtype: dict
+        :raises KeyError: If the node does not exist.
+        """
+        return self._stn.nodes[node]
 
     def _shift_task_push(self, location, is_right_direction=True):
+        """
+        Move the task at the location one location on, first moving the tasks ahead of it out of the way.
+
+        Part of the networkx backend and only used by :py:meth:`_insert_task`.
+
+        :param location: The location of the task to shift.
+        :type location: int
+        :param is_right_direction: Whether to shift the tasks to later (True) or earlier (False) locations.
+        :type is_right_direction: bool
+        """
+        self._invalidate_shortest_paths()
         shift_amount = 1
         if not is_right_direction:
             shift_amount = - 1
@@ -118,6 +198,17 @@ class Schedule(SimulationEngineAware):
         nx.relabel_nodes(self._stn, node_label_mapping, copy=False)
 
     def _shift_task_pull(self, location, is_right_direction=True):
+        """
+        Move the task at the location one location on, then let the tasks behind it follow into the freed location.
+
+        Part of the networkx backend and only used by :py:meth:`_remove_first_node`.
+
+        :param location: The location of the task to shift.
+        :type location: int
+        :param is_right_direction: Whether to shift the tasks to later (True) or earlier (False) locations.
+        :type is_right_direction: bool
+        """
+        self._invalidate_shortest_paths()
         shift_amount = 1
         if not is_right_direction:
             shift_amount = - 1
@@ -273,26 +364,188 @@ class Schedule(SimulationEngineAware):
             location.
         :return:
         """
+        trade = self._get_time_window_trade(trade)
+        self._ensure_stn_is_not_shared()
+        previous_shortest_paths = self._shortest_paths
+        previous_is_time_consistent = self._is_time_consistent
+        if location_type == TransportationSourceDestinationIndicator.PICK_UP:
+            earliest_start = trade.earliest_pickup_clean
+            latest_finish = trade.latest_pickup_clean
+        else:
+            earliest_start = trade.earliest_drop_off_clean
+            latest_finish = trade.latest_drop_off_clean
+        removed_edges = self._insert_task(location, trade, location_type, cargo_transfer_time,
+                                          earliest_start, latest_finish)
+        self._update_shortest_paths(location, removed_edges, previous_shortest_paths, previous_is_time_consistent)
+
+    @staticmethod
+    def _get_time_window_trade(trade):
         if not isinstance(trade, TimeWindowTrade):
             trade = TimeWindowTrade(origin_port=trade.origin_port,
                                     destination_port=trade.destination_port,
                                     amount=trade.amount,
                                     cargo_type=trade.cargo_type,
-                                    time=trade.time)
+                                    time=trade.time,
+                                    trade_id=trade.trade_id)
+        return trade
+
+    def _insert_task(self, location, trade, location_type, cargo_transfer_time, earliest_start, latest_finish):
+        """
+        Insert the nodes and edges of a task into the STN.
+
+        :param location: The location of the task in the order of all tasks.
+        :type location: int
+        :param trade: The task's associated trade.
+        :type trade: TimeWindowTrade
+        :param location_type: Either pick-up or drop-off.
+        :type location_type: TransportationSourceDestinationIndicator
+        :param cargo_transfer_time: The time for cargo transfer.
+        :type cargo_transfer_time: float
+        :param earliest_start: The earliest time the task can start.
+        :type earliest_start: float
+        :param latest_finish: The latest time the task can start.
+        :type latest_finish: float
+        :return: The edges between the neighbouring tasks that were replaced by the task with their weights.
+        :rtype: list[tuple]
+        """
         self._add_task_notes(location, trade, location_type)
         possible_edges = [((location - 1, TransportationStartFinishIndicator.FINISH),
                            (location + 1, TransportationStartFinishIndicator.START)),
                           ((location + 1, TransportationStartFinishIndicator.START),
                            (location - 1, TransportationStartFinishIndicator.FINISH))]
+        removed_edges = [(u, v, self._stn[u][v]["weight"]) for u, v in possible_edges if self._stn.has_edge(u, v)]
         self._stn.remove_edges_from(possible_edges)
-        if location_type == TransportationSourceDestinationIndicator.PICK_UP:
-            earliest_start = trade.earliest_pickup_clean
-            latest_finish = trade.latest_pickup_clean
-        else:
-            earliest_start = trade.earliest_drop_off_clean
-            latest_finish = trade.latest_drop_off_clean
         self._add_task_edges(location, location_type, cargo_transfer_time,
                              earliest_start=earliest_start, latest_finish=latest_finish)
+        return removed_edges
+
+    def _get_edge_weight(self, u, v):
+        if self._stn.has_edge(u, v):
+            return self._stn[u][v]["weight"]
+        return math.inf
+
+    def _set_edge_weight(self, u, v, weight):
+        self._stn[u][v]["weight"] = weight
+
+    def _get_out_edges(self, node):
+        """
+        :return: The edges from the node as tuples of the node, the other node and the weight.
+        :rtype: Iterable[tuple]
+        """
+        return self._stn.out_edges(node, data="weight")
+
+    def _get_in_edges(self, node):
+        """
+        :return: The edges to the node as tuples of the other node, the node and the weight.
+        :rtype: Iterable[tuple]
+        """
+        return self._stn.in_edges(node, data="weight")
+
+    def _update_shortest_paths(self, location, removed_edges, previous_shortest_paths, previous_is_time_consistent):
+        """
+        Update the shortest paths after a task has been added to the STN by inserting the task's two nodes one
+        after the other, i.e. in O(n^2) instead of recomputing all shortest paths.
+
+        Adding a task also removes the edges between its neighbours. The update ignores these removals which is only
+        correct if each removed edge is implied by the path through the new task, e.g. if the travel times satisfy the
+        triangle inequality. Otherwise, the shortest paths are reset and computed from scratch when needed.
+
+        :param location: The location of the added task.
+        :type location: int
+        :param removed_edges: The edges between the neighbours that were removed with their weights.
+        :type removed_edges: list[tuple]
+        :param previous_shortest_paths: The shortest paths before the task was added.
+        :type previous_shortest_paths: np.ndarray | None
+        :param previous_is_time_consistent: The consistency before the task was added.
+        :type previous_is_time_consistent: bool | None
+        """
+        self._invalidate_shortest_paths()
+        if previous_is_time_consistent is None:
+            return
+        new_nodes = [(location, TransportationStartFinishIndicator.START),
+                     (location, TransportationStartFinishIndicator.FINISH)]
+        for u, v, weight in removed_edges:
+            weight_via_new_nodes = min(
+                self._get_edge_weight(u, a) + (0 if a == b else self._get_edge_weight(a, b)) + self._get_edge_weight(b, v)
+                for a in new_nodes for b in new_nodes)
+            if weight_via_new_nodes > weight:
+                return
+        if not previous_is_time_consistent:
+            # Adding constraints cannot resolve a negative cycle.
+            self._is_time_consistent = False
+            return
+        nodes_in_order = [0] + self._get_task_nodes()
+        new_node_positions = [nodes_in_order.index(one_node) for one_node in new_nodes]
+        # The old nodes keep their order, followed by the new nodes in the order in which they are inserted.
+        nodes_inserted_last = [n for i, n in enumerate(nodes_in_order) if i not in new_node_positions] + new_nodes
+        node_indices = {node: i for i, node in enumerate(nodes_inserted_last)}
+        shortest_paths = previous_shortest_paths
+        for one_new_node in new_nodes:
+            number_known_nodes = shortest_paths.shape[0]
+            out_nodes, out_weights = self._get_known_edges(self._get_out_edges(one_new_node), 1,
+                                                           node_indices, number_known_nodes)
+            in_nodes, in_weights = self._get_known_edges(self._get_in_edges(one_new_node), 0,
+                                                         node_indices, number_known_nodes)
+            shortest_paths = self._insert_node_into_shortest_paths(
+                shortest_paths, out_nodes, out_weights, in_nodes, in_weights)
+            if shortest_paths is None:
+                self._is_time_consistent = False
+                return
+        order = [node_indices[one_node] for one_node in nodes_in_order]
+        self._shortest_paths = shortest_paths[np.ix_(order, order)]
+        self._is_time_consistent = True
+
+    @staticmethod
+    def _get_known_edges(edges, other_node_position, node_indices, number_known_nodes):
+        """
+        :return: The indices of the other nodes of the edges and the weights for all edges whose other node is already
+            part of the shortest paths.
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        other_indices = []
+        weights = []
+        for one_edge in edges:
+            other_index = node_indices[one_edge[other_node_position]]
+            if other_index < number_known_nodes:
+                other_indices.append(other_index)
+                weights.append(one_edge[2])
+        return np.array(other_indices, dtype=int), np.array(weights, dtype=float)
+
+    @staticmethod
+    def _insert_node_into_shortest_paths(shortest_paths, out_nodes, out_weights, in_nodes, in_weights):
+        """
+        Add a node to the shortest paths of a graph without negative cycles.
+
+        :param shortest_paths: The shortest paths between the nodes of the graph.
+        :type shortest_paths: np.ndarray
+        :param out_nodes: The nodes to which the new node has edges.
+        :type out_nodes: np.ndarray
+        :param out_weights: The weights of the edges to the out nodes.
+        :type out_weights: np.ndarray
+        :param in_nodes: The nodes from which the new node has edges.
+        :type in_nodes: np.ndarray
+        :param in_weights: The weights of the edges from the in nodes.
+        :type in_weights: np.ndarray
+        :return: The shortest paths with the new node as the last node or None if the new node is part of a negative
+            cycle.
+        :rtype: np.ndarray | None
+        """
+        number_nodes = shortest_paths.shape[0]
+        distances_from_new_node = np.full(number_nodes, np.inf)
+        if len(out_nodes) > 0:
+            distances_from_new_node = np.min(out_weights[:, None] + shortest_paths[out_nodes, :], axis=0)
+        distances_to_new_node = np.full(number_nodes, np.inf)
+        if len(in_nodes) > 0:
+            distances_to_new_node = np.min(shortest_paths[:, in_nodes] + in_weights[None, :], axis=1)
+        if np.any(distances_from_new_node + distances_to_new_node < -NEGATIVE_CYCLE_TOLERANCE):
+            return None
+        extended_shortest_paths = np.empty((number_nodes + 1, number_nodes + 1))
+        np.minimum(shortest_paths, distances_to_new_node[:, None] + distances_from_new_node[None, :],
+                   out=extended_shortest_paths[:number_nodes, :number_nodes])
+        extended_shortest_paths[number_nodes, :number_nodes] = distances_from_new_node
+        extended_shortest_paths[:number_nodes, number_nodes] = distances_to_new_node
+        extended_shortest_paths[number_nodes, number_nodes] = 0
+        return extended_shortest_paths
 
     def _add_relocation_task(self, index):
         """
@@ -310,7 +563,7 @@ class Schedule(SimulationEngineAware):
         elif (
                 location_pick_up == 1
                 and len(self) > 0
-                and (1, TransportationStartFinishIndicator.START) not in self._stn):
+                and not self._has_node((1, TransportationStartFinishIndicator.START))):
             # TODO Write better error!
             raise ValueError("One or both schedule locations are not compatible with the current schedule.")
         elif location_pick_up > self._number_tasks + 1:
@@ -385,21 +638,16 @@ class Schedule(SimulationEngineAware):
                                   in product(range(2, self._number_tasks + 1),
                                              [TransportationStartFinishIndicator.START,
                                               TransportationStartFinishIndicator.FINISH])])
-            if (1, TransportationStartFinishIndicator.START) in self._stn:
-                edge_data = self._stn.get_edge_data((1, TransportationStartFinishIndicator.START), 0)
-                start_compensator = edge_data["weight"]
+            if self._has_node((1, TransportationStartFinishIndicator.START)):
+                start_compensator = self._get_edge_weight((1, TransportationStartFinishIndicator.START), 0)
                 previous_task = (1, TransportationStartFinishIndicator.START)
                 task_combinations = [(1, TransportationStartFinishIndicator.FINISH)] + task_combinations
             else:
-                edge_data = self._stn.get_edge_data((1, TransportationStartFinishIndicator.FINISH), 0)
                 previous_task = (1, TransportationStartFinishIndicator.FINISH)
-                finish_compensator = edge_data["weight"]
+                finish_compensator = self._get_edge_weight((1, TransportationStartFinishIndicator.FINISH), 0)
             for idx, indicator in task_combinations:
                 current_task = (idx, indicator)
-                edge_data = self._stn.get_edge_data(
-                    current_task,
-                    previous_task)
-                completion_time += edge_data["weight"]
+                completion_time += self._get_edge_weight(current_task, previous_task)
                 previous_task = current_task
         head_adjusted_finish_compensator = finish_compensator + self._time_schedule_head
         head_adjusted_start_compensator = start_compensator + self._time_schedule_head
@@ -423,39 +671,57 @@ class Schedule(SimulationEngineAware):
         return task_nodes
 
     def _get_distance_matrix(self):
+        """
+        :return: The STN as a dense matrix of the edge weights with node 0 first and the task nodes in order.
+            Non-edges are inf and the diagonal is 0.
+        :rtype: np.ndarray
+        """
         nodes_in_order = [0] + self._get_task_nodes()
-        matrix = nx.to_numpy_array(self._stn, nodes_in_order, nonedge=np.nan)
+        node_indices = {node: i for i, node in enumerate(nodes_in_order)}
+        matrix = np.full((len(nodes_in_order), len(nodes_in_order)), np.inf)
+        np.fill_diagonal(matrix, 0)
+        for u, v, weight in self._stn.edges(data="weight"):
+            i = node_indices[u]
+            j = node_indices[v]
+            matrix[i, j] = min(matrix[i, j], weight)
         return matrix
 
     def _get_node_locations(self):
-        nodes_world_locations = [self._stn.nodes[t]["trade"].origin_port
-                                 if self._stn.nodes[t]["location_type"] == TransportationSourceDestinationIndicator.PICK_UP
-                                 else self._stn.nodes[t]["trade"].destination_port
-                                 for t in sorted([n for n in self._stn.nodes if isinstance(n, tuple)])]
+        nodes_world_locations = [self._get_vessel_destination(self._get_node_data(t))
+                                 for t in self._get_task_nodes()]
         return nodes_world_locations
 
     def verify_schedule_time(self):
         """
         Verifies that the schedule's timing is possible. A schedule is valid is it has no negative cycles.
 
+        The shortest paths between all nodes of the STN are kept up to date when tasks are added
+        (see :py:func:`_update_shortest_paths`), so the check is immediate after adding tasks. Otherwise, negative
+        cycles are detected via Floyd–Warshall on the distance matrix of the STN
+        (see :py:func:`_get_distance_matrix`): there is a negative cycle iff the shortest path from a node to itself
+        becomes negative. Cycles that are negative by less than :py:const:`NEGATIVE_CYCLE_TOLERANCE` are considered
+        rounding errors.
+
         :return: True is the schedule is valid, False otherwise.
         :rtype: bool
         """
-        # TODO Going through all cycles seems like a bad idea but negative_edge_cycle seems to not work reliably.
-        # At least sometimes it is False despite there being a negative cycle
-        # has_negative_cycle = nx.negative_edge_cycle(self._stn)
-        has_negative_cycle = False
-        all_cycles = nx.simple_cycles(self._stn)
-        try:
-            while not has_negative_cycle:
-                cycle = next(all_cycles)
-                weight = sum(self._stn[u][v]['weight'] for u, v in zip(cycle, cycle[1:] + [cycle[0]]))
-                if weight < 0:
-                    has_negative_cycle = True
-        except StopIteration:
-            pass  # Nothing to do all cycles tested
-        is_valid_schedule = not has_negative_cycle
-        return is_valid_schedule
+        if self._is_time_consistent is None:
+            self._compute_shortest_paths()
+        return self._is_time_consistent
+
+    def _compute_shortest_paths(self):
+        """
+        Compute the shortest paths between all nodes of the STN and whether it is consistent from scratch.
+        """
+        distances = self._get_distance_matrix()
+        for k in range(distances.shape[0]):
+            np.minimum(distances, distances[:, k, None] + distances[None, k, :], out=distances)
+            if np.any(np.diagonal(distances) < -NEGATIVE_CYCLE_TOLERANCE):
+                self._shortest_paths = None
+                self._is_time_consistent = False
+                return
+        self._shortest_paths = distances
+        self._is_time_consistent = True
 
     def verify_schedule_cargo(self):
         """
@@ -469,7 +735,7 @@ class Schedule(SimulationEngineAware):
         i = 1
         valid_schedule = True
         while valid_schedule and i < self._number_tasks + 1:
-            current_task_node = self._stn.nodes[(i, TransportationStartFinishIndicator.FINISH)]
+            current_task_node = self._get_node_data((i, TransportationStartFinishIndicator.FINISH))
             current_task_type = current_task_node["location_type"]
             current_task_trade = current_task_node["trade"]
             try:
@@ -506,12 +772,250 @@ class Schedule(SimulationEngineAware):
         else:
             # +1 for starting at one (not zero indexed), +1 for finishing task after last task
             insertion_points_range_adjustment = 2
-            if (1, TransportationStartFinishIndicator.START) in self._stn.nodes:
+            if self._has_node((1, TransportationStartFinishIndicator.START)):
                 insertion_points = range(1, self._number_tasks + insertion_points_range_adjustment)
             else:
                 insertion_points = range(2, self._number_tasks + insertion_points_range_adjustment)
         return insertion_points
 
+    def evaluate_insertions(self, trade, pickup_points=None, dropoff_points=None):
+        """
+        Evaluate all insertions of a transportation into the schedule at once.
+
+        For every pair of a pick-up and a drop-off point the outcome is the same as copying the schedule, adding the
+        transportation via :py:func:`add_transportation` and checking the copy via :py:func:`verify_schedule` and
+        :py:func:`completion_time`. However, the STN of a schedule is a chain of tasks with release times, deadlines
+        and minimal gaps between consecutive tasks. Hence, the earliest times of the tasks before the pick-up, the
+        latest times of the tasks after the drop-off and the cargo loads are determined once and the tasks between the
+        pick-up and the drop-off are extended one task at a time, i.e. every pair takes constant time.
+
+        :param trade: The trade to transport.
+        :type trade: Trade
+        :param pickup_points: The pick-up points to consider. Default are all insertion points.
+        :type pickup_points: Iterable[int] | None
+        :param dropoff_points: The drop-off points to consider. Default are all insertion points. A pick-up point is
+            only combined with the drop-off points that are not before it.
+        :type dropoff_points: Iterable[int] | None
+        :return: The feasible insertions ordered by pick-up and then drop-off point.
+        :rtype: List[InsertionEvaluation]
+        :raises ValueError: If any pair of pick-up and drop-off points is not compatible with the schedule.
+        """
+        trade = self._get_time_window_trade(trade)
+        number_tasks = self._number_tasks
+        if pickup_points is None:
+            pickup_points = self.get_insertion_points()
+        if dropoff_points is None:
+            dropoff_points = self.get_insertion_points()
+        dropoff_points = sorted(dropoff_points)
+        for pick_up in pickup_points:
+            for drop_off in [pick_up] + [one_point for one_point in dropoff_points if one_point >= pick_up]:
+                self._ensure_location_validity(pick_up, drop_off)
+                if drop_off > number_tasks + 1:
+                    raise ValueError("One or both schedule locations are not compatible with the current schedule.")
+        cargo_levels = self._get_cargo_levels(trade.cargo_type)
+        if cargo_levels is None:
+            return []
+        levels, capacity = cargo_levels
+        is_level_valid = [True] + [0 <= one_level <= capacity for one_level in levels[1:]]
+        is_prefix_level_valid = list(itertools.accumulate(is_level_valid, lambda a, b: a and b))
+        is_suffix_level_valid = list(itertools.accumulate(reversed(is_level_valid + [True]),
+                                                          lambda a, b: a and b))[::-1]
+        if levels[-1] != 0:
+            return []
+        if len(self) == 0:
+            time_schedule_head = creation_time = self._engine.world.current_time
+        else:
+            time_schedule_head = self._time_schedule_head
+            creation_time = self._creation_time
+        # The STN as a chain of nodes 1, ..., n (0 is the origin) with the node's release time and deadline and the
+        # minimal gap to the previous node.
+        matrix = self._get_distance_matrix()
+        number_nodes = matrix.shape[0] - 1
+        releases = (-matrix[:, 0]).tolist()
+        deadlines = matrix[0, :].tolist()
+        gaps = [0.0, 0.0] + (-np.diagonal(matrix, offset=-1)[1:]).tolist()
+        earliest = [0.0] * (number_nodes + 1)
+        is_prefix_feasible = [True] * (number_nodes + 1)
+        for node in range(1, number_nodes + 1):
+            earliest[node] = releases[node]
+            if node > 1:
+                earliest[node] = max(releases[node], earliest[node - 1] + gaps[node])
+            is_prefix_feasible[node] = (is_prefix_feasible[node - 1]
+                                        and earliest[node] <= deadlines[node] + NEGATIVE_CYCLE_TOLERANCE)
+        latest = [math.inf] * (number_nodes + 2)
+        is_suffix_feasible = [True] * (number_nodes + 2)
+        for node in range(number_nodes, 0, -1):
+            latest[node] = deadlines[node]
+            if node < number_nodes:
+                latest[node] = min(deadlines[node], latest[node + 1] - gaps[node + 1])
+            is_suffix_feasible[node] = (is_suffix_feasible[node + 1]
+                                        and releases[node] <= latest[node] + NEGATIVE_CYCLE_TOLERANCE)
+        first_task_offset = 0
+        if not self._has_node((1, TransportationStartFinishIndicator.START)) and number_tasks > 0:
+            first_task_offset = 1
+
+        def get_finish_node(task_index):
+            return 2 * task_index - first_task_offset
+
+        network = self._engine.world.network
+        ports = ([network.get_vessel_location(self._vessel, self._engine.world.current_time)]
+                 + [self._get_vessel_destination(self._get_node_data((i, TransportationStartFinishIndicator.FINISH)))
+                    for i in range(1, number_tasks + 1)])
+        origin = trade.origin_port
+        destination = trade.destination_port
+        distances_to_origin = [network.get_distance(one_port, origin) for one_port in ports]
+        distances_from_origin = [network.get_distance(origin, one_port) for one_port in ports]
+        distances_to_destination = [network.get_distance(one_port, destination) for one_port in ports]
+        distances_from_destination = [network.get_distance(destination, one_port) for one_port in ports]
+        distances_between = [0] + [network.get_distance(ports[i - 1], ports[i]) for i in range(1, number_tasks + 1)]
+        distance_origin_destination = network.get_distance(origin, destination)
+        get_travel_time = self._vessel.get_travel_time
+        transfer_time = self._vessel.get_loading_time(trade.cargo_type, trade.amount)
+        pick_up_earliest = trade.earliest_pickup_clean
+        pick_up_latest = trade.latest_pickup_clean
+        drop_off_earliest = trade.earliest_drop_off_clean
+        drop_off_latest = trade.latest_drop_off_clean
+        total_gaps = sum(gaps[2:])
+        evaluations = []
+        for pick_up in pickup_points:
+            if pick_up == 1:
+                pick_up_release = max(get_travel_time(distances_to_origin[0]) + time_schedule_head, pick_up_earliest)
+                pick_up_start = pick_up_release
+                gaps_before_drop_off = 0
+            else:
+                previous_finish_node = get_finish_node(pick_up - 1)
+                if not is_prefix_feasible[previous_finish_node]:
+                    continue
+                pick_up_release = pick_up_earliest
+                travel_time_to_pick_up = get_travel_time(distances_to_origin[pick_up - 1])
+                pick_up_start = max(pick_up_release, earliest[previous_finish_node] + travel_time_to_pick_up)
+                gaps_before_drop_off = travel_time_to_pick_up
+                if pick_up <= number_tasks:
+                    gaps_before_drop_off -= gaps[get_finish_node(pick_up) - 1]
+            pick_up_finish = max(pick_up_earliest + transfer_time, pick_up_start + transfer_time)
+            if (pick_up_start > pick_up_latest + NEGATIVE_CYCLE_TOLERANCE
+                    or pick_up_finish > pick_up_latest + transfer_time + NEGATIVE_CYCLE_TOLERANCE
+                    or not is_prefix_level_valid[pick_up - 1]
+                    or levels[pick_up - 1] + trade.amount > capacity):
+                continue
+            if pick_up == 1:
+                first_node_is_start = True
+                first_node_release = pick_up_release
+            else:
+                first_node_is_start = first_task_offset == 0
+                first_node_release = releases[1]
+            # The tasks between pick-up and drop-off: the time of the last node if the first node has no predecessor,
+            # the sum of the gaps, the latest time of the first node and if the loads and times are feasible.
+            number_middle_tasks = 0
+            middle_time = None
+            middle_gaps = 0
+            middle_latest = math.inf
+            is_middle_feasible = True
+            middle_entry_time = None
+            if pick_up <= number_tasks:
+                middle_entry_time = pick_up_finish + get_travel_time(distances_from_origin[pick_up])
+            for drop_off in dropoff_points:
+                if drop_off < pick_up:
+                    continue
+                while number_middle_tasks < drop_off - pick_up:
+                    task_index = pick_up + number_middle_tasks
+                    finish_node = get_finish_node(task_index)
+                    for node in [finish_node - 1, finish_node]:
+                        if middle_time is None:
+                            middle_time = releases[node]
+                        else:
+                            middle_gaps += gaps[node]
+                            middle_time = max(releases[node], middle_time + gaps[node])
+                        middle_latest = min(middle_latest, deadlines[node] - middle_gaps)
+                        is_middle_feasible = (is_middle_feasible
+                                              and middle_time <= deadlines[node] + NEGATIVE_CYCLE_TOLERANCE)
+                    is_middle_feasible = is_middle_feasible and 0 <= levels[task_index] + trade.amount <= capacity
+                    number_middle_tasks += 1
+                if not is_middle_feasible:
+                    break
+                if drop_off == pick_up:
+                    travel_time_to_drop_off = get_travel_time(distance_origin_destination)
+                    drop_off_start = max(drop_off_earliest, pick_up_finish + travel_time_to_drop_off)
+                    added_gaps = gaps_before_drop_off + transfer_time + travel_time_to_drop_off
+                    added_travel_distance = distances_to_origin[pick_up - 1] + distance_origin_destination
+                else:
+                    if middle_entry_time > middle_latest + NEGATIVE_CYCLE_TOLERANCE:
+                        break
+                    if not is_level_valid[drop_off - 1]:
+                        continue
+                    middle_end_time = max(middle_time, middle_entry_time + middle_gaps)
+                    travel_time_to_drop_off = get_travel_time(distances_to_destination[drop_off - 1])
+                    drop_off_start = max(drop_off_earliest, middle_end_time + travel_time_to_drop_off)
+                    added_gaps = (gaps_before_drop_off + transfer_time + get_travel_time(distances_from_origin[pick_up])
+                                  + travel_time_to_drop_off)
+                    added_travel_distance = (distances_to_origin[pick_up - 1] + distances_from_origin[pick_up]
+                                             - distances_between[pick_up] + distances_to_destination[drop_off - 1])
+                drop_off_finish = max(drop_off_earliest + transfer_time, drop_off_start + transfer_time)
+                if (drop_off_start > drop_off_latest + NEGATIVE_CYCLE_TOLERANCE
+                        or drop_off_finish > drop_off_latest + transfer_time + NEGATIVE_CYCLE_TOLERANCE):
+                    continue
+                added_gaps += transfer_time
+                if drop_off <= number_tasks:
+                    next_start_node = get_finish_node(drop_off) - 1
+                    travel_time_from_drop_off = get_travel_time(distances_from_destination[drop_off])
+                    if (not is_suffix_feasible[next_start_node]
+                            or not is_suffix_level_valid[drop_off]
+                            or (drop_off_finish + travel_time_from_drop_off
+                                > latest[next_start_node] + NEGATIVE_CYCLE_TOLERANCE)):
+                        continue
+                    added_gaps += travel_time_from_drop_off
+                    added_travel_distance += distances_from_destination[drop_off] - distances_between[drop_off]
+                    if drop_off > pick_up:
+                        added_gaps -= gaps[next_start_node]
+                sum_gaps = total_gaps + added_gaps
+                completion_time = sum_gaps
+                if first_node_is_start and first_node_release > time_schedule_head:
+                    completion_time += first_node_release - time_schedule_head
+                elif not first_node_is_start and first_node_release > 0:
+                    completion_time += first_node_release - time_schedule_head
+                if sum_gaps > 0:
+                    completion_time += creation_time
+                evaluations.append(InsertionEvaluation(pick_up=pick_up, drop_off=drop_off,
+                                                       completion_time=completion_time,
+                                                       added_travel_distance=added_travel_distance))
+        return evaluations
+
+    def _get_cargo_levels(self, cargo_type):
+        """
+        Determine the load of a cargo type after every task of the schedule.
+
+        :param cargo_type: The cargo type.
+        :return: The load of the cargo type initially and after each task, and the capacity. None if the vessel cannot
+            carry the cargo type or the loading and unloading of any other cargo type is invalid.
+        :rtype: tuple[list[float], float] | None
+        """
+        cargo_hold = self._vessel.copy_hold()
+        if cargo_type not in cargo_hold.available_cargo_types():
+            return None
+        levels = [cargo_hold.get_current_load(cargo_type)]
+        for i in range(1, self._number_tasks + 1):
+            location_type, current_trade = self._get_node_info(
+                self._get_node_data((i, TransportationStartFinishIndicator.FINISH)))
+            if current_trade.cargo_type == cargo_type:
+                if location_type == TransportationSourceDestinationIndicator.PICK_UP:
+                    levels.append(levels[-1] + current_trade.amount)
+                else:
+                    levels.append(levels[-1] - current_trade.amount)
+            else:
+                levels.append(levels[-1])
+                try:
+                    if location_type == TransportationSourceDestinationIndicator.PICK_UP:
+                        cargo_hold.load_cargo(current_trade.cargo_type, current_trade.amount)
+                    else:
+                        cargo_hold.unload_cargo(current_trade.cargo_type, current_trade.amount)
+                except ValueError:
+                    return None
+        if any(cargo_hold.get_current_load(one_cargo_type) > 0
+               for one_cargo_type in cargo_hold.available_cargo_types()
+               if one_cargo_type != cargo_type):
+            return None
+        return levels, cargo_hold.get_capacity(cargo_type)
+
     def get_simple_schedule(self):
         """
         Produce a simple overview of the schedule in the form of a list with drop off/pick up indicator and
@@ -572,10 +1076,10 @@ class Schedule(SimulationEngineAware):
         :raises IndexError: If the index does not exist
         """
         task = (1, TransportationStartFinishIndicator.START)
-        if task not in self._stn:
+        if not self._has_node(task):
             task = (1, TransportationStartFinishIndicator.FINISH)
         if idx < 0:
-            num_nodes = len(self._stn.nodes)
+            num_nodes = len(self) + 1
             i = num_nodes + idx - 1  # - 1 for 0 is not a valid node.
             if i < 0:
                 raise IndexError(idx)
@@ -588,7 +1092,7 @@ class Schedule(SimulationEngineAware):
                 task = (task[0] + 1, TransportationStartFinishIndicator.START)
             i -= 1
         try:
-            node = self._stn.nodes[task]
+            node = self._get_node_data(task)
         except KeyError:
             raise IndexError(idx)
         return task, node
@@ -707,10 +1211,15 @@ class Schedule(SimulationEngineAware):
         first_node = None
         if self._number_tasks > 0:
             first_node = (1, TransportationStartFinishIndicator.START)
-            if first_node not in self._stn.nodes:
+            if not self._has_node(first_node):
                 first_node = (1, TransportationStartFinishIndicator.FINISH)
         return first_node
 
+    def _remove_first_node(self, first_node):
+        self._stn.remove_node(first_node)
+        if first_node == (1, TransportationStartFinishIndicator.FINISH):
+            self._shift_task_pull(2, False)
+
     def pop(self):
         """
         Pop the next scheduled location.
@@ -718,21 +1227,21 @@ class Schedule(SimulationEngineAware):
         :return: The next stop.
         """
         event = self.next()
+        self._ensure_stn_is_not_shared()
         self._last_event = event
         self._next_event = None
         no_node_shift_events = [IdleEvent, TravelEvent]
         next_event_is_no_shift_event = any(isinstance(event, one_no_shift_event_type)
                                            for one_no_shift_event_type in no_node_shift_events)
+        self._invalidate_shortest_paths()
         if not next_event_is_no_shift_event:
             first_node = self._get_first_node()
-            self._stn.remove_node(first_node)
-            if first_node == (1, TransportationStartFinishIndicator.FINISH):
-                self._shift_task_pull(2, False)
+            self._remove_first_node(first_node)
         self._time_schedule_head = event.time
         first_node = self._get_first_node()
         if first_node is not None:
             next_event = self.next()
-            self._stn[first_node][0]["weight"] = min(self._stn[first_node][0]["weight"], -next_event.time)
+            self._set_edge_weight(first_node, 0, min(self._get_edge_weight(first_node, 0), -next_event.time))
         return event
 
     def next(self):
@@ -744,3 +1253,308 @@ class Schedule(SimulationEngineAware):
         if self._next_event is None:
             self._next_event = self.get(0)
         return self._next_event
+
+
+class ScheduleView:
+    """
+    A read-only view of a schedule for callers that only inspect the schedule and therefore do not need a copy.
+    The view reflects changes to the schedule. Use :py:func:`copy` to obtain a schedule that can be changed.
+    """
+
+    __slots__ = ("_schedule",)
+
+    def __init__(self, schedule):
+        """
+        :param schedule: The schedule.
+        :type schedule: Schedule
+        """
+        self._schedule = schedule
+
+    def copy(self):
+        """
+        :return: A (copy-on-write) copy of the schedule.
+        :rtype: Schedule
+        """
+        return self._schedule.copy()
+
+    def completion_time(self):
+        """
+        See :py:func:`Schedule.completion_time`.
+        """
+        return self._schedule.completion_time()
+
+    def verify_schedule_time(self):
+        """
+        See :py:func:`Schedule.verify_schedule_time`.
+        """
+        return self._schedule.verify_schedule_time()
+
+    def verify_schedule_cargo(self):
+        """
+        See :py:func:`Schedule.verify_schedule_cargo`.
+        """
+        return self._schedule.verify_schedule_cargo()
+
+    def verify_schedule(self):
+        """
+        See :py:func:`Schedule.verify_schedule`.
+        """
+        return self._schedule.verify_schedule()
+
+    def get_insertion_points(self):
+        """
+        See :py:func:`Schedule.get_insertion_points`.
+        """
+        return self._schedule.get_insertion_points()
+
+    def get_simple_schedule(self):
+        """
+        See :py:func:`Schedule.get_simple_schedule`.
+        """
+        return self._schedule.get_simple_schedule()
+
+    def get_scheduled_trades(self):
+        """
+        See :py:func:`Schedule.get_scheduled_trades`.
+        """
+        return self._schedule.get_scheduled_trades()
+
+    def evaluate_insertions(self, trade, pickup_points=None, dropoff_points=None):
+        """
+        See :py:func:`Schedule.evaluate_insertions`.
+        """
+        return self._schedule.evaluate_insertions(trade, pickup_points, dropoff_points)
+
+    def next(self):
+        """
+        See :py:func:`Schedule.next`.
+        """
+        return self._schedule.next()
+
+    def get(self, idx, default=None):
+        return self._schedule.get(idx, default)
+
+    def __getitem__(self, idx):
+        return self._schedule[idx]
+
+    def __len__(self):
+        return len(self._schedule)
+
+
+class TaskEdgeColumn(IntEnum):
+    """
+    The columns of the edge weights of a task in an :py:class:`ArrayStn`.
+    """
+    START_RELEASE = 0
+    """The edge from the task's start to 0, i.e. the negative earliest start."""
+    START_DEADLINE = 1
+    """The edge from 0 to the task's start, i.e. the latest start."""
+    FINISH_RELEASE = 2
+    """The edge from the task's finish to 0, i.e. the negative earliest finish."""
+    FINISH_DEADLINE = 3
+    """The edge from 0 to the task's finish, i.e. the latest finish."""
+    TRANSFER = 4
+    """The edge from the task's finish to its start, i.e. the negative cargo transfer time."""
+    TRAVEL_TO_NEXT = 5
+    """The edge from the next task's start to the task's finish, i.e. the negative travel time. inf for the last task."""
+
+
+@attrs.define(kw_only=True)
+class ArrayStn:
+    """
+    The STN of an :py:class:`ArraySchedule` as the tasks in the order of the schedule and one row of edge weights per
+    task (see :py:class:`TaskEdgeColumn`). Edges with a weight of inf, i.e. from a task's start to its finish and from
+    a task's finish to the next task's start, are implicit.
+    """
+    trades: list = attrs.field(factory=list)
+    location_types: list = attrs.field(factory=list)
+    weights: np.ndarray = attrs.field(factory=lambda: np.empty((0, len(TaskEdgeColumn))))
+    has_first_start: bool = True
+
+    def copy(self):
+        """
+        :return: A copy of the STN that shares the trades.
+        :rtype: ArrayStn
+        """
+        return ArrayStn(trades=self.trades.copy(), location_types=self.location_types.copy(),
+                        weights=self.weights.copy(), has_first_start=self.has_first_start)
+
+
+class ArraySchedule(Schedule):
+    """
+    A schedule that stores its STN as arrays (see :py:class:`ArrayStn`) instead of a networkx graph.
+
+    Adding a task splices the arrays instead of relabelling all following nodes and copying a schedule only copies
+    the arrays. The nodes are labelled as in :py:class:`Schedule`, i.e. 0 and (task index, start or finish).
+    """
+
+    @staticmethod
+    def _generate_empty_stn():
+        return ArrayStn()
+
+    @property
+    def _number_tasks(self):
+        return len(self._stn.trades)
+
+    def __len__(self):
+        return 2 * self._number_tasks - (not self._stn.has_first_start)
+
+    def _has_node(self, node):
+        if node == 0:
+            return True
+        task_index, start_or_finish = node
+        return (1 <= task_index <= self._number_tasks
+                and (task_index > 1
+                     or start_or_finish == TransportationStartFinishIndicator.FINISH
+                     or self._stn.has_first_start))
+
+    def _get_node_data(self, node):
+        if not self._has_node(node):
+            raise KeyError(node)
+        if node == 0:
+            return {}
+        task_index = node[0] - 1
+        return {"trade": self._stn.trades[task_index], "location_type": self._stn.location_types[task_index]}
+
+    def _get_task_nodes(self):
+        task_nodes = [(task_index, start_or_finish)
+                      for task_index in range(1, self._number_tasks + 1)
+                      for start_or_finish in [TransportationStartFinishIndicator.START,
+                                              TransportationStartFinishIndicator.FINISH]]
+        if not self._stn.has_first_start:
+            task_nodes = task_nodes[1:]
+        return task_nodes
+
+    def _get_task_port(self, task_index):
+        """
+        :param task_index: The zero-based index of the task.
+        :type task_index: int
+        :return: The port at which the task takes place.
+        :rtype: Port
+        """
+        trade = self._stn.trades[task_index]
+        if self._stn.location_types[task_index] == TransportationSourceDestinationIndicator.PICK_UP:
+            return trade.origin_port
+        return trade.destination_port
+
+    def _get_task_travel_time(self, from_task_index, to_task_index):
+        travel_distance = self._engine.world.network.get_distance(self._get_task_port(from_task_index),
+                                                                  self._get_task_port(to_task_index))
+        return self._vessel.get_travel_time(travel_distance)
+
+    def _insert_task(self, location, trade, location_type, cargo_transfer_time, earliest_start, latest_finish):
+        stn = self._stn
+        task_index = location - 1
+        removed_edges = []
+        if 0 < task_index < self._number_tasks:
+            removed_edges.append(((location + 1, TransportationStartFinishIndicator.START),
+                                  (location - 1, TransportationStartFinishIndicator.FINISH),
+                                  stn.weights[task_index - 1, TaskEdgeColumn.TRAVEL_TO_NEXT]))
+        stn.trades.insert(task_index, trade)
+        stn.location_types.insert(task_index, location_type)
+        task_weights = np.empty(len(TaskEdgeColumn))
+        if location == 1:
+            vessel_location = self._engine.world.network.get_vessel_location(
+                self._vessel, self._engine.world.current_time)
+            travel_distance = self._engine.world.network.get_distance(vessel_location,
+                                                                      self._get_task_port(task_index))
+            arrival_time = self._vessel.get_travel_time(travel_distance) + self._time_schedule_head
+            task_weights[TaskEdgeColumn.START_RELEASE] = -max(arrival_time, earliest_start)
+        else:
+            task_weights[TaskEdgeColumn.START_RELEASE] = -earliest_start
+        task_weights[TaskEdgeColumn.START_DEADLINE] = latest_finish
+        task_weights[TaskEdgeColumn.FINISH_RELEASE] = -(earliest_start + cargo_transfer_time)
+        task_weights[TaskEdgeColumn.FINISH_DEADLINE] = latest_finish + cargo_transfer_time
+        task_weights[TaskEdgeColumn.TRANSFER] = -cargo_transfer_time
+        task_weights[TaskEdgeColumn.TRAVEL_TO_NEXT] = math.inf
+        stn.weights = np.insert(stn.weights, task_index, task_weights, axis=0)
+        if task_index > 0:
+            stn.weights[task_index - 1, TaskEdgeColumn.TRAVEL_TO_NEXT] = -self._get_task_travel_time(
+                task_index - 1, task_index)
+        if task_index + 1 < self._number_tasks:
+            stn.weights[task_index, TaskEdgeColumn.TRAVEL_TO_NEXT] = -self._get_task_travel_time(
+                task_index, task_index + 1)
+        return removed_edges
+
+    def _get_out_edges(self, node):
+        task_index, start_or_finish = node
+        task_weights = self._stn.weights[task_index - 1]
+        if start_or_finish == TransportationStartFinishIndicator.START:
+            edges = [(node, 0, task_weights[TaskEdgeColumn.START_RELEASE])]
+            if task_index > 1:
+                edges.append((node, (task_index - 1, TransportationStartFinishIndicator.FINISH),
+                              self._stn.weights[task_index - 2, TaskEdgeColumn.TRAVEL_TO_NEXT]))
+        else:
+            edges = [(node, 0, task_weights[TaskEdgeColumn.FINISH_RELEASE])]
+            start = (task_index, TransportationStartFinishIndicator.START)
+            if self._has_node(start):
+                edges.append((node, start, task_weights[TaskEdgeColumn.TRANSFER]))
+        return edges
+
+    def _get_in_edges(self, node):
+        task_index, start_or_finish = node
+        task_weights = self._stn.weights[task_index - 1]
+        if start_or_finish == TransportationStartFinishIndicator.START:
+            edges = [(0, node, task_weights[TaskEdgeColumn.START_DEADLINE]),
+                     ((task_index, TransportationStartFinishIndicator.FINISH), node,
+                      task_weights[TaskEdgeColumn.TRANSFER])]
+        else:
+            edges = [(0, node, task_weights[TaskEdgeColumn.FINISH_DEADLINE])]
+            if task_index < self._number_tasks:
+                edges.append(((task_index + 1, TransportationStartFinishIndicator.START), node,
+                              task_weights[TaskEdgeColumn.TRAVEL_TO_NEXT]))
+        return edges
+
+    def _get_edge_weight(self, u, v):
+        if u == 0:
+            edges = self._get_in_edges(v)
+        else:
+            edges = self._get_out_edges(u)
+        for one_u, one_v, weight in edges:
+            if one_u == u and one_v == v:
+                return float(weight)
+        return math.inf
+
+    def _set_edge_weight(self, u, v, weight):
+        if v != 0 or u == 0:
+            raise ValueError("Only the weights of the edges from a task to 0 can be set.")
+        if u[1] == TransportationStartFinishIndicator.START:
+            column = TaskEdgeColumn.START_RELEASE
+        else:
+            column = TaskEdgeColumn.FINISH_RELEASE
+        self._stn.weights[u[0] - 1, column] = weight
+
+    def _remove_first_node(self, first_node):
+        stn = self._stn
+        if first_node[1] == TransportationStartFinishIndicator.START:
+            stn.has_first_start = False
+        else:
+            del stn.trades[0]
+            del stn.location_types[0]
+            stn.weights = np.delete(stn.weights, 0, axis=0)
+            stn.has_first_start = True
+
+    def _get_distance_matrix(self):
+        number_tasks = self._number_tasks
+        weights = self._stn.weights
+        matrix = np.full((2 * number_tasks + 1, 2 * number_tasks + 1), np.inf)
+        np.fill_diagonal(matrix, 0)
+        starts = np.arange(1, 2 * number_tasks + 1, 2)
+        finishes = starts + 1
+        matrix[starts, 0] = weights[:, TaskEdgeColumn.START_RELEASE]
+        matrix[0, starts] = weights[:, TaskEdgeColumn.START_DEADLINE]
+        matrix[finishes, 0] = weights[:, TaskEdgeColumn.FINISH_RELEASE]
+        matrix[0, finishes] = weights[:, TaskEdgeColumn.FINISH_DEADLINE]
+        matrix[finishes, starts] = weights[:, TaskEdgeColumn.TRANSFER]
+        matrix[starts[1:], finishes[:-1]] = weights[:-1, TaskEdgeColumn.TRAVEL_TO_NEXT]
+        if not self._stn.has_first_start:
+            matrix = np.delete(np.delete(matrix, 1, axis=0), 1, axis=1)
+        return matrix
+
+    def get_simple_schedule(self):
+        return [(location_type.name, trade) for location_type, trade in zip(self._stn.location_types, self._stn.trades)]
+
+    def get_scheduled_trades(self):
+        return [trade
+                for location_type, trade in zip(self._stn.location_types, self._stn.trades)
+                if location_type == TransportationSourceDestinationIndicator.DROP_OFF]
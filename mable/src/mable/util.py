@@ -16,6 +16,9 @@ class JsonAble:
     Ensures that a class is transformable into a json. On default that means an objects __dict__ is json dumped.
     """
 
+    # No instance dictionary for subclasses that use slots, e.g. trades.
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
@@ -44,3 +44,8 @@ def test__calculate_penalty(mocker):
     penalties = environment._calculate_penalty(mock_simulation_engine, mock_metrics_observer)
     assert len(penalties) == 1
     assert penalties[company_id] == mock_vessel_2.propelling_engine.fuel.get_cost(None)
+
+
+def test_run_simulations_rejects_export_metrics(tmp_path):
+    with pytest.raises(ValueError):
+        environment.run_simulations(lambda: None, seeds=[0], output_directory=str(tmp_path), export_metrics=True)
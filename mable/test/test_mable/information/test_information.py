@@ -1,12 +1,16 @@
+import copy
 import csv
 from unittest.mock import PropertyMock
 
+import pytest
+
 from mable import global_setup
 from mable.cargo_bidding import TradingCompany
-from mable.competition.information import CompanyHeadquarters
+from mable.competition.information import CompanyHeadquarters, MarketAuthority
 from mable.extensions.fuel_emissions import VesselWithEngine, ConsumptionRate, VesselEngine, Fuel
 from mable.extensions.world_ports import LatLongPort, LatLongShippingNetwork, LatLongLocation
 from mable.simulation_de_serialisation import SimulationSpecification
+from mable.shipping_market import AuctionAllocationResult, AuctionLedger, Contract, TimeWindowTrade
 from mable.simulation_space.universe import OnJourney
 from mable.transport_operation import CargoCapacity
 
@@ -132,3 +136,29 @@ class TestCompanyHeadquarters:
         company_headquarters._engine.world._current_time = start_time + 1
         the_company = company.headquarters.get_companies()[0]
         assert the_company.fleet[0].location == port_singapore
+
+
+class TestMarketAuthority:
+
+    def test_contract_index(self, mocker):
+        company = mocker.MagicMock()
+        company.name = "1"
+        other_company = mocker.MagicMock()
+        trades = [TimeWindowTrade(origin_port="A", destination_port="B", amount=1, trade_id=i) for i in range(3)]
+        ledger = AuctionLedger([company, other_company])
+        ledger[company] = Contract(payment=5, trade=trades[0])
+        ledger[company] = Contract(payment=5, trade=trades[1])
+        ledger[other_company] = Contract(payment=5, trade=trades[2])
+        market_authority = MarketAuthority()
+        market_authority.add_allocation_results(AuctionAllocationResult(ledger, []))
+        trade_copy = copy.deepcopy(trades[1])
+        assert market_authority.is_trade_awarded(trade_copy, company)
+        assert not market_authority.is_trade_awarded(trades[2], company)
+        assert market_authority.get_contract(trade_copy, company) is ledger[company][1]
+        assert not market_authority.is_trade_fulfilled(trade_copy, company)
+        market_authority.trade_fulfilled(trade_copy, company)
+        assert market_authority.is_trade_fulfilled(trades[1], company)
+        assert ledger[company][1].fulfilled
+        assert not ledger[company][0].fulfilled
+        with pytest.raises(ValueError):
+            market_authority.trade_fulfilled(trades[2], company)
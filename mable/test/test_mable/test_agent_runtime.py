@@ -0,0 +1,219 @@
+"""
+Tests for agent_runtime module.
+"""
+
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pytest
+
+from mable.agent_runtime import ProcessAgentRuntime, ThreadAgentRuntime, OPERATION_INFORM, OPERATION_PRE_INFORM, \
+    OPERATION_RECEIVE
+from mable.engine import SimulationEngine
+from mable.event_management import EventQueue
+from mable.profiling import SimulationProfiler
+from mable.simulation_environment import World
+from mable.simulation_space.structure import UnitShippingNetwork
+from mable.simulation_space.universe import Port
+from mable.transport_operation import CargoCapacity, ShippingCompany, SimpleVessel
+
+
+class DummyCompany(ShippingCompany):
+
+    def __init__(self, fleet, name, delay=0, pre_inform_delay=0):
+        super().__init__(fleet, name)
+        self._delay = delay
+        self._pre_inform_delay = pre_inform_delay
+        self.number_informs = 0
+        self.pre_informed_trades = None
+
+    def pre_inform(self, trades, time_of_trades, *args, **kwargs):
+        time.sleep(self._pre_inform_delay)
+        self.pre_informed_trades = trades
+
+    def inform(self, trades, *args, **kwargs):
+        self.number_informs += 1
+        if self.number_informs == 1:
+            time.sleep(self._delay)
+        return [(self.name, os.getpid(), self._engine.world.current_time, self.number_informs, trades,
+                 self.pre_informed_trades)]
+
+    def receive(self, *args, **kwargs):
+        self._engine.add_new_schedules(self, {self.fleet[0]: "Schedule"}, self._engine.world.current_time)
+
+
+class DummyShipping:
+
+    @staticmethod
+    def get_trading_times():
+        return []
+
+
+def get_test_engine(agent_runtime, delays, pre_inform_delay=0, background_pre_inform=False):
+    ports = [Port("A", 0, 0), Port("B", 1, 1)]
+    world = World(UnitShippingNetwork(ports), EventQueue(), np.random.RandomState(0))
+    companies = []
+    for i, one_delay in enumerate(delays):
+        vessel = SimpleVessel([CargoCapacity("Oil", capacity=100, loading_rate=5)], ports[0], speed=10, name=f"V{i}")
+        companies.append(DummyCompany([vessel], f"Company {i}", delay=one_delay, pre_inform_delay=pre_inform_delay))
+    engine = SimulationEngine(world, companies, DummyShipping(), None, None, agent_runtime=agent_runtime,
+                              background_pre_inform=background_pre_inform)
+    world.set_engine(engine)
+    for one_company in companies:
+        one_company.set_engine(engine)
+    return engine
+
+
+class TestThreadAgentRuntime:
+
+    def test_run_operations(self):
+        engine = get_test_engine(ThreadAgentRuntime(), [0, 0.5])
+        results = engine.agent_runtime.run_operations(
+            OPERATION_INFORM, engine.shipping_companies, [(["T"],), (["T"],)], timeout=0.2)
+        assert results[0][0][:2] == ("Company 0", os.getpid())
+        assert results[1] is None
+
+    def test_persistent_loop_and_executor(self):
+        runtime = ThreadAgentRuntime()
+        engine = get_test_engine(runtime, [0, 0])
+        try:
+            runtime.run_operations(OPERATION_INFORM, engine.shipping_companies, [(["T"],), (["T"],)])
+            loop = runtime._loop
+            executor = runtime._executor
+            assert executor._max_workers == 2
+            runtime.run_operations(OPERATION_INFORM, engine.shipping_companies, [(["T"],), (["T"],)])
+            assert runtime._loop is loop
+            assert runtime._executor is executor
+        finally:
+            runtime.close()
+        assert runtime._loop is None
+
+    def test_executor_replaced_after_timeout(self):
+        runtime = ThreadAgentRuntime()
+        engine = get_test_engine(runtime, [0, 0.5])
+        try:
+            runtime.run_operations(OPERATION_INFORM, engine.shipping_companies, [(["T"],), (["T"],)], timeout=0.1)
+            executor = runtime._executor
+            results = runtime.run_operations(OPERATION_INFORM, engine.shipping_companies, [(["T"],), (["T"],)])
+            assert runtime._executor is not executor
+            assert results[1][0][3] == 2
+        finally:
+            runtime.close()
+
+    def test_background_operations(self):
+        runtime = ThreadAgentRuntime()
+        engine = get_test_engine(runtime, [0, 0], pre_inform_delay=0.3)
+        companies = engine.shipping_companies
+        try:
+            start_time = time.perf_counter()
+            runtime.start_operations(OPERATION_PRE_INFORM, companies, [(["T1"], 5), (["T2"], 5)])
+            assert time.perf_counter() - start_time < 0.3
+            assert all(c.pre_informed_trades is None for c in companies)
+            results = runtime.run_operations(OPERATION_INFORM, companies, [(["T1"],), (["T2"],)])
+            assert [r[0][5] for r in results] == [["T1"], ["T2"]]
+        finally:
+            runtime.close()
+
+    def test_background_operations_timeout(self):
+        runtime = ThreadAgentRuntime()
+        engine = get_test_engine(runtime, [0, 0], pre_inform_delay=0.5)
+        companies = engine.shipping_companies
+        try:
+            runtime.start_operations(OPERATION_PRE_INFORM, companies, [(["T1"], 5), (["T2"], 5)], timeout=0.1)
+            start_time = time.perf_counter()
+            results = runtime.run_operations(OPERATION_INFORM, companies, [(["T1"],), (["T2"],)])
+            assert time.perf_counter() - start_time < 0.4
+            assert [r[0][5] for r in results] == [None, None]
+        finally:
+            runtime.close()
+
+    def test_background_pre_inform_requires_isolation(self):
+        runtime = ThreadAgentRuntime()
+        try:
+            with pytest.raises(ValueError):
+                get_test_engine(runtime, [0], background_pre_inform=True)
+        finally:
+            runtime.close()
+
+
+class TestProcessAgentRuntime:
+
+    def test_run_operations(self):
+        runtime = ProcessAgentRuntime()
+        engine = get_test_engine(runtime, [0, 0])
+        companies = engine.shipping_companies
+        profiler = SimulationProfiler()
+        try:
+            engine.world.set_current_time(5)
+            results = runtime.run_operations(OPERATION_INFORM, companies, [(["T1"],), (["T2"],)], profiler=profiler)
+            assert [r[0][0] for r in results] == ["Company 0", "Company 1"]
+            assert all(r[0][1] != os.getpid() for r in results)
+            assert [r[0][2:5] for r in results] == [(5, 1, ["T1"]), (5, 1, ["T2"])]
+            assert profiler.entries["agents"]["inform"].count == 2
+            results = runtime.run_operations(OPERATION_INFORM, companies, [(["T3"],), (["T4"],)])
+            assert [r[0][3] for r in results] == [2, 2]
+            assert all(c.number_informs == 0 for c in companies)
+            runtime.run_operations(OPERATION_RECEIVE, companies[:1], [()])
+            assert engine.pop_new_schedules(companies[0]) == {5: {companies[0].fleet[0]: "Schedule"}}
+        finally:
+            runtime.close()
+
+    def test_timeout(self):
+        runtime = ProcessAgentRuntime(interrupt_grace_period=0.5)
+        engine = get_test_engine(runtime, [0, 60])
+        companies = engine.shipping_companies
+        try:
+            start_time = time.perf_counter()
+            results = runtime.run_operations(OPERATION_INFORM, companies, [(["T"],), (["T"],)], timeout=0.5)
+            assert time.perf_counter() - start_time < 5
+            assert results[0] is not None
+            assert results[1] is None
+            results = runtime.run_operations(OPERATION_INFORM, companies, [(["T"],), (["T"],)], timeout=5)
+            assert results[1][0][0] == "Company 1"
+        finally:
+            runtime.close()
+
+    def test_background_operations(self):
+        runtime = ProcessAgentRuntime()
+        engine = get_test_engine(runtime, [0, 0], pre_inform_delay=0.3)
+        companies = engine.shipping_companies
+        try:
+            start_time = time.perf_counter()
+            runtime.start_operations(OPERATION_PRE_INFORM, companies, [(["T1"], 5), (["T2"], 5)])
+            assert time.perf_counter() - start_time < 0.3
+            results = runtime.run_operations(OPERATION_INFORM, companies, [(["T1"],), (["T2"],)])
+            assert [r[0][5] for r in results] == [["T1"], ["T2"]]
+            assert all(c.pre_informed_trades is None for c in companies)
+        finally:
+            runtime.close()
+
+    def test_background_pre_inform(self):
+        runtime = ProcessAgentRuntime()
+        try:
+            engine = get_test_engine(runtime, [0], background_pre_inform=True)
+            assert engine.background_pre_inform
+        finally:
+            runtime.close()
+
+    def test_restore_closes_workers(self):
+        runtime = ProcessAgentRuntime()
+        engine = get_test_engine(runtime, [0, 0])
+        companies = engine.shipping_companies
+        try:
+            snapshot = engine.snapshot()
+            runtime.run_operations(OPERATION_INFORM, companies, [(["T1"],), (["T2"],)])
+            worker_processes = [one_worker.process for one_worker in runtime._workers.values()]
+            assert len(worker_processes) == 2
+            engine.restore(snapshot)
+            assert engine.agent_runtime is not runtime
+            assert not any(one_process.is_alive() for one_process in worker_processes)
+            assert multiprocessing.active_children() == []
+            results = engine.agent_runtime.run_operations(
+                OPERATION_INFORM, engine.shipping_companies, [(["T3"],), (["T4"],)])
+            assert [r[0][2:5] for r in results] == [(0, 1, ["T3"]), (0, 1, ["T4"])]
+        finally:
+            runtime.close()
+            engine.agent_runtime.close()
+        assert multiprocessing.active_children() == []
@@ -2,8 +2,13 @@
 Tests for engine module.
 """
 
+import numpy as np
+import pytest
+
 import mable.engine as sim_engine
-from mable.event_management import EventObserver, Event
+from mable.event_management import EventObserver, Event, CargoEvent, EventQueue, VesselEvent
+from mable.simulation_environment import World
+from mable.transport_operation import ShippingCompany
 
 
 class DummyObserver(EventObserver):
@@ -15,6 +20,15 @@ class DummyObserver(EventObserver):
         self.observations.append((event, data))
 
 
+class DummySubCargoEvent(CargoEvent):
+    pass
+
+
+class DummyCargoEventObserver(DummyObserver):
+
+    OBSERVED_EVENT_TYPES = (CargoEvent,)
+
+
 class TestSimulationEngine:
 
     def test_observer(self):
@@ -29,3 +43,161 @@ class TestSimulationEngine:
         assert test_observer.observations[0][0].time == 1
         assert test_observer.observations[0][0].info == "A"
         assert test_observer.observations[0][1] == "B"
+
+    def test_observer_event_types(self):
+        test_engine = sim_engine.SimulationEngine(None, None, None, None, None)
+        test_observer = DummyObserver()
+        test_cargo_observer = DummyCargoEventObserver()
+        test_engine.register_event_observer(test_observer)
+        test_engine.register_event_observer(test_cargo_observer)
+        test_engine.notify_event_observer(Event(1, "A"), None)
+        test_engine.notify_event_observer(CargoEvent(2), None)
+        test_engine.notify_event_observer(DummySubCargoEvent(3), None)
+        assert [e.time for e, _ in test_observer.observations] == [1, 2, 3]
+        assert [e.time for e, _ in test_cargo_observer.observations] == [2, 3]
+        test_engine.unregister_event_observer(test_cargo_observer)
+        test_engine.notify_event_observer(CargoEvent(4), None)
+        assert [e.time for e, _ in test_observer.observations] == [1, 2, 3, 4]
+        assert [e.time for e, _ in test_cargo_observer.observations] == [2, 3]
+
+    def test_find_company_for_vessel(self):
+        vessel_1, vessel_2, vessel_3 = object(), object(), object()
+        company_1 = ShippingCompany([vessel_1], "Company 1")
+        company_2 = ShippingCompany([vessel_2], "Company 2")
+        test_engine = sim_engine.SimulationEngine(None, [company_1, company_2], None, None, None)
+        assert test_engine.find_company_for_vessel(vessel_1) is company_1
+        assert test_engine.find_company_for_vessel(vessel_2) is company_2
+        with pytest.raises(ValueError):
+            test_engine.find_company_for_vessel(vessel_3)
+        company_2.fleet.append(vessel_3)
+        assert test_engine.find_company_for_vessel(vessel_3) is company_2
+
+    def test_find_company_for_reassigned_vessel(self):
+        vessel_1, vessel_2 = object(), object()
+        company_1 = ShippingCompany([vessel_1, vessel_2], "Company 1")
+        company_2 = ShippingCompany([], "Company 2")
+        test_engine = sim_engine.SimulationEngine(None, [company_1, company_2], None, None, None)
+        assert test_engine.find_company_for_vessel(vessel_2) is company_1
+        company_1.fleet.remove(vessel_2)
+        company_2.fleet.append(vessel_2)
+        assert test_engine.find_company_for_vessel(vessel_2) is company_2
+        assert test_engine.find_company_for_vessel(vessel_1) is company_1
+        company_2.fleet.remove(vessel_2)
+        with pytest.raises(ValueError):
+            test_engine.find_company_for_vessel(vessel_2)
+
+
+class DummyBatchObserver(DummyObserver):
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def notify_batch(self, engine, events_and_data):
+        self.batches.append([e.time for e, _ in events_and_data])
+        super().notify_batch(engine, events_and_data)
+
+
+class DummyVesselEvent(VesselEvent):
+
+    def event_action(self, engine):
+        pass
+
+    def location(self):
+        return None
+
+    def distance(self, engine):
+        return 0
+
+
+class DummyShipping:
+
+    @staticmethod
+    def get_trading_times():
+        return []
+
+
+def get_snapshot_test_engine():
+    world = World(None, EventQueue(), np.random.RandomState(0))
+    test_engine = sim_engine.SimulationEngine(world, [], DummyShipping(), None, None, pre_run_cmds=[])
+    world.set_engine(test_engine)
+    for one_time in range(1, 6):
+        world.event_queue.put(Event(one_time, f"Event {one_time}"))
+    test_engine.register_event_observer(DummyObserver())
+    return test_engine
+
+
+def get_observed_times(test_engine):
+    return [e.time for e, _ in test_engine.get_event_observers()[0].observations]
+
+
+class TestSimulationEngineSnapshot:
+
+    def test_run_until(self):
+        test_engine = get_snapshot_test_engine()
+        next_event = test_engine.run_until(lambda e: e.time >= 3)
+        assert next_event.time == 3
+        assert get_observed_times(test_engine) == [1, 2]
+        assert test_engine.run_until() is None
+        assert get_observed_times(test_engine) == [1, 2, 3, 4, 5]
+
+    def test_snapshot_restore(self):
+        test_engine = get_snapshot_test_engine()
+        test_engine.run_until(lambda e: e.time >= 3)
+        random_state = test_engine.world.random.get_state()[1].copy()
+        snapshot = test_engine.snapshot()
+        assert snapshot.time == 2
+        test_engine.world.random.rand()
+        test_engine.run()
+        assert get_observed_times(test_engine) == [1, 2, 3, 4, 5]
+        test_engine.restore(snapshot)
+        assert test_engine.world.current_time == 2
+        assert test_engine.event_queue.qsize() == 3
+        assert get_observed_times(test_engine) == [1, 2]
+        assert (test_engine.world.random.get_state()[1] == random_state).all()
+        test_engine.run()
+        assert get_observed_times(test_engine) == [1, 2, 3, 4, 5]
+        test_engine.restore(snapshot)
+        assert get_observed_times(test_engine) == [1, 2]
+
+    def test_fork(self):
+        test_engine = get_snapshot_test_engine()
+        test_engine.run_until(lambda e: e.time >= 3)
+        forked_engine = test_engine.fork()
+        assert forked_engine.world is not test_engine.world
+        forked_engine.run()
+        assert get_observed_times(forked_engine) == [1, 2, 3, 4, 5]
+        assert get_observed_times(test_engine) == [1, 2]
+        assert test_engine.event_queue.qsize() == 3
+
+
+class TestSimulationEngineBatch:
+
+    def test_step_batch(self):
+        world = World(None, EventQueue(), np.random.RandomState(0))
+        test_engine = sim_engine.SimulationEngine(world, [], DummyShipping(), None, None, pre_run_cmds=[],
+                                                  batch_events=True)
+        world.set_engine(test_engine)
+        vessel_1, vessel_2 = object(), object()
+        events = [Event(1), Event(1), DummyVesselEvent(2, vessel_1), DummyVesselEvent(2, vessel_2),
+                  DummyVesselEvent(2, vessel_1), Event(3)]
+        for one_event in events:
+            world.event_queue.put(one_event)
+        test_observer = DummyBatchObserver()
+        test_engine.register_event_observer(test_observer)
+        test_engine.run()
+        assert test_observer.batches == [[1, 1], [2, 2], [2], [3]]
+        assert [e for e, _ in test_observer.observations] == events
+
+    def test_run_until_batch(self):
+        world = World(None, EventQueue(), np.random.RandomState(0))
+        test_engine = sim_engine.SimulationEngine(world, [], DummyShipping(), None, None, pre_run_cmds=[],
+                                                  batch_events=True)
+        world.set_engine(test_engine)
+        for one_info in ["A", "B", "C"]:
+            world.event_queue.put(Event(1, one_info))
+        test_observer = DummyBatchObserver()
+        test_engine.register_event_observer(test_observer)
+        next_event = test_engine.run_until(lambda e: e.info == "C")
+        assert next_event.info == "C"
+        assert test_observer.batches == [[1, 1]]
@@ -2,7 +2,22 @@
 Tests for management module.
 """
 
+from queue import Empty
+
+import pytest
+
 import mable.event_management as em
+from mable.simulation_space.universe import Port
+
+
+class DummyWorld:
+
+    current_time = 0
+
+
+class DummyEngine:
+
+    world = DummyWorld()
 
 
 class TestEventQueue:
@@ -24,3 +39,87 @@ class TestEventQueue:
         return_event_3 = events.get()
         assert return_event_3.time == 5
         assert return_event_3.info == "Unload"
+
+    def test_queue_same_time_in_insertion_order(self):
+        events = em.EventQueue()
+        same_time_events = [em.Event(2, f"Event {i}") for i in range(5)]
+        events.put(em.Event(3, "Later"))
+        for one_event in same_time_events:
+            events.put(one_event)
+        for one_event in same_time_events:
+            assert events.get() is one_event
+        assert events.get().info == "Later"
+        assert events.empty()
+
+    def test_queue_remove(self):
+        event_1 = em.Event(1, "Load")
+        event_2 = em.Event(5, "Unload")
+        event_3 = em.Event(3, "New Cargo")
+        events = em.EventQueue()
+        events.put(event_1)
+        events.put(event_2)
+        events.put(event_3)
+        events.remove(event_1)
+        assert event_1 not in events
+        assert events.qsize() == 2
+        events.remove(em.Event(5, "Unload"))
+        assert event_2 not in events
+        assert events.qsize() == 1
+        assert events.get() is event_3
+        assert events.empty()
+
+    def test_queue_contains_and_getitem(self):
+        event_1 = em.Event(1, "Load")
+        events = em.EventQueue()
+        events.put(event_1)
+        assert event_1 in events
+        assert em.Event(1, "Load") in events
+        assert em.Event(1, "Unload") not in events
+        assert events[em.Event(1, "Load")] is event_1
+        with pytest.raises(ValueError):
+            _ = events[em.Event(2, "Load")]
+
+    def test_queue_compaction(self):
+        events = em.EventQueue()
+        kept_event = em.Event(0, "Keep")
+        events.put(kept_event)
+        removed_events = [em.Event(i + 1, "Remove") for i in range(200)]
+        for one_event in removed_events:
+            events.put(one_event)
+        events.remove(removed_events)
+        assert events.qsize() == 1
+        assert len(events._heap) <= 2 * events.qsize() + em.EventQueue.COMPACTION_MIN_REMOVED
+        assert events.get() is kept_event
+        with pytest.raises(Empty):
+            events.get()
+
+    def test_queue_purge(self):
+        vessel_1 = object()
+        vessel_2 = object()
+        vessel_1_events = [em.VesselEvent(i, vessel_1) for i in range(3)]
+        vessel_2_event = em.VesselEvent(1, vessel_2)
+        other_event = em.Event(2, "Other")
+        events = em.EventQueue()
+        events.set_engine(DummyEngine())
+        for one_event in vessel_1_events + [vessel_2_event, other_event]:
+            events.put(one_event)
+        events.purge(vessel_1)
+        assert events.qsize() == 2
+        assert all(one_event not in events for one_event in vessel_1_events)
+        assert events.get() is vessel_2_event
+        assert events.get() is other_event
+
+
+class TestEventInfo:
+
+    def test_info_built_on_access(self):
+        class DummyVessel:
+            name = "Vessel 1"
+        origin = Port("A", 0, 0)
+        destination = Port("B", 1, 1)
+        event = em.TravelEvent(1, DummyVessel(), origin, destination)
+        expected_info = f"{destination} travel (Vessel [name: Vessel 1]: {origin}->{destination})"
+        assert event.info == expected_info
+        assert event.info is event.info
+        event.info = "Other info"
+        assert event.info == "Other info"
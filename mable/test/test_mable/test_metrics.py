@@ -0,0 +1,40 @@
+"""
+Tests for metrics module.
+"""
+
+import pytest
+
+from mable.metrics import get_company_performance, aggregate_company_performance
+
+
+def get_exported_metrics(cost_a, payments_a, penalty_a, cost_b):
+    metrics = {
+        "company_names": {"0": "Company A", "1": "Company B"},
+        "company_metrics": {"0": {"fuel_cost": cost_a}, "1": {"fuel_cost": cost_b}},
+        "vessel_metrics": {},
+        "global_metrics": {
+            "auction_outcomes": [{"0": [{"payment": p} for p in payments_a]}, {"1": []}],
+            "penalty": {"0": penalty_a, "1": 0}
+        }
+    }
+    return metrics
+
+
+class TestCompanyPerformance:
+
+    def test_get_company_performance(self):
+        performance = get_company_performance(get_exported_metrics(10, [20, 30], 5, 7))
+        assert performance["0"] == {"name": "Company A", "cost": 10, "penalty": 5, "revenue": 50, "income": 35}
+        assert performance["1"] == {"name": "Company B", "cost": 7, "penalty": 0, "revenue": 0, "income": -7}
+
+    def test_aggregate_company_performance(self):
+        metrics_per_run = {
+            0: get_exported_metrics(10, [20, 30], 5, 7),
+            1: get_exported_metrics(20, [40], 0, 9)
+        }
+        summary = aggregate_company_performance(metrics_per_run)
+        assert summary["Company A"]["income"]["mean"] == pytest.approx(27.5)
+        assert summary["Company A"]["income"]["min"] == pytest.approx(20)
+        assert summary["Company A"]["income"]["max"] == pytest.approx(35)
+        assert summary["Company A"]["income"]["std"] == pytest.approx(7.5)
+        assert summary["Company B"]["cost"]["mean"] == pytest.approx(8)
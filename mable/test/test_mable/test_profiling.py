@@ -0,0 +1,94 @@
+"""
+Tests for profiling module.
+"""
+
+import copy
+import json
+
+import numpy as np
+
+import mable.engine as sim_engine
+from mable.event_management import Event, EventObserver, EventQueue
+from mable.profiling import (SimulationProfiler, PROFILE_SECTION_EVENTS, PROFILE_SECTION_OBSERVERS,
+                             PROFILE_SECTION_AGENTS, PROFILE_SECTION_COMPANIES)
+from mable.simulation_environment import World
+from mable.util import JsonAbleEncoder
+
+
+class DummyObserver(EventObserver):
+
+    def notify(self, engine, event, data):
+        pass
+
+
+class DummyShipping:
+
+    @staticmethod
+    def get_trading_times():
+        return []
+
+
+class DummyCompany:
+
+    def __init__(self, name):
+        self.name = name
+
+    def inform(self, trades):
+        return []
+
+
+class TestSimulationProfiler:
+
+    def test_measure(self):
+        profiler = SimulationProfiler()
+        for _ in range(3):
+            with profiler.measure("section", "key"):
+                pass
+        entry = profiler.entries["section"]["key"]
+        assert entry.count == 3
+        assert entry.wall_time >= 0
+        assert entry.cpu_time >= 0
+
+    def test_wrap(self):
+        profiler = SimulationProfiler()
+        company = DummyCompany("A")
+        inform = profiler.wrap(company.inform, (PROFILE_SECTION_AGENTS, "inform"),
+                               (PROFILE_SECTION_COMPANIES, "A.inform"))
+        assert inform([]) == []
+        assert profiler.entries[PROFILE_SECTION_AGENTS]["inform"].count == 1
+        assert profiler.entries[PROFILE_SECTION_COMPANIES]["A.inform"].count == 1
+
+    def test_to_json_and_copy(self):
+        profiler = SimulationProfiler()
+        profiler.add("section", "key", 2, 1)
+        profiler.add("section", "key", 3, 1)
+        profiler_copy = copy.deepcopy(profiler)
+        profiler_copy.add("section", "key", 1, 1)
+        exported = json.loads(json.dumps(profiler, cls=JsonAbleEncoder))
+        assert exported == {"section": {"key": {"count": 2, "wall_time": 5, "cpu_time": 2}}}
+        assert profiler_copy.entries["section"]["key"].count == 3
+
+
+class TestSimulationEngineProfile:
+
+    @staticmethod
+    def get_test_engine(profile):
+        world = World(None, EventQueue(), np.random.RandomState(0))
+        test_engine = sim_engine.SimulationEngine(world, [], DummyShipping(), None, None, pre_run_cmds=[],
+                                                  profile=profile)
+        world.set_engine(test_engine)
+        for one_time in range(1, 4):
+            world.event_queue.put(Event(one_time))
+        test_engine.register_event_observer(DummyObserver())
+        return test_engine
+
+    def test_profile(self):
+        test_engine = self.get_test_engine(profile=True)
+        test_engine.run()
+        assert test_engine.profiler.entries[PROFILE_SECTION_EVENTS]["Event"].count == 3
+        assert test_engine.profiler.entries[PROFILE_SECTION_OBSERVERS]["DummyObserver"].count == 3
+
+    def test_no_profile(self):
+        test_engine = self.get_test_engine(profile=False)
+        test_engine.run()
+        assert test_engine.profiler is None
@@ -1,4 +1,16 @@
-from mable.shipping_market import AuctionMarket, TimeWindowTrade
+import copy
+import pickle
+import time
+from types import SimpleNamespace
+
+import attrs
+import numpy as np
+import pytest
+
+from mable.shipping_market import AuctionLedger, AuctionMarket, Contract, ReadOnlyProxy, SecondPriceClearingEngine, \
+    Shipping, Trade, TimeWindowTrade, TradeStatus
+from mable.simulation_space.universe import Port
+from mable.profiling import SimulationProfiler
 from mable.transport_operation import Bid
 
 
@@ -13,6 +25,69 @@ class DummyShippingCompany:
         return bids
 
 
+class SlowDummyShippingCompany(DummyShippingCompany):
+
+    def __init__(self, name, bid_amount, delay=0.2):
+        super().__init__(name, bid_amount)
+        self._delay = delay
+
+    def inform(self, trades):
+        time.sleep(self._delay)
+        return super().inform(trades)
+
+
+class DummyShipping(Shipping):
+
+    def initialise_trades(self, *args, **kwargs):
+        self.add_to_all_trades(kwargs["trades"])
+
+
+class TestTrade:
+
+    def test_identity_by_trade_id(self):
+        trade = TimeWindowTrade(origin_port="A", destination_port="B", amount=1, time_window=[1, 2, 3, 4], trade_id=3)
+        trade_copy = copy.deepcopy(trade)
+        trade_copy.time_window = [0, 0, 0, 0]
+        assert trade_copy == trade
+        assert hash(trade_copy) == hash(trade)
+        assert Trade(origin_port="A", destination_port="B", amount=1, trade_id=3) == trade
+        other_trade = TimeWindowTrade(origin_port="A", destination_port="B", amount=1, time_window=[1, 2, 3, 4],
+                                      trade_id=4)
+        assert other_trade != trade
+        assert {trade: 1, other_trade: 2}[trade_copy] == 1
+        assert not hasattr(trade, "__dict__")
+
+    def test_identity_without_trade_id(self):
+        trade = TimeWindowTrade(origin_port="A", destination_port="B", amount=1, time_window=[1, 2, 3, 4])
+        assert TimeWindowTrade(origin_port="A", destination_port="B", amount=1, time_window=[1, 2, 3, 4]) == trade
+        assert TimeWindowTrade(origin_port="A", destination_port="B", amount=1, time_window=[1, 2, 3, 5]) != trade
+        assert Trade(origin_port="A", destination_port="B", amount=1) != trade
+        trade_with_id = copy.deepcopy(trade)
+        trade_with_id.trade_id = 0
+        assert trade_with_id != trade
+        trade_with_id.trade_id = 0
+        with pytest.raises(ValueError):
+            trade_with_id.trade_id = 1
+        assert trade_with_id.trade_id == 0
+
+
+class TestShipping:
+
+    def test_get_trades_sampling(self):
+        probabilities = np.random.RandomState(0).random_sample(100).tolist() + [0, 1]
+        trades = [TimeWindowTrade(origin_port="A", destination_port="B", amount=1, time=5, probability=p)
+                  for p in probabilities]
+        shipping = DummyShipping(trades=trades)
+        shipping.set_engine(SimpleNamespace(world=SimpleNamespace(random=np.random.RandomState(42))))
+        occurring_trades = shipping.get_trades(5)
+        # Same outcome as sampling each trade individually.
+        random = np.random.RandomState(42)
+        expected_realised = [bool(random.choice([0, 1], p=[1 - p, p])) for p in probabilities]
+        assert occurring_trades == [t for t, r in zip(trades, expected_realised) if r]
+        assert [t.status == TradeStatus.NOT_REALISED for t in trades] == [not r for r in expected_realised]
+        assert shipping.get_trades(5) is occurring_trades
+        assert shipping._engine.world.random.random_sample() == random.random_sample()
+
 
 class TestAuctionMarket:
 
@@ -30,7 +105,7 @@ class TestAuctionMarket:
             DummyShippingCompany("Y", 2)]
         # noinspection PyTypeChecker
         # DummyShippingCompany is OK for the test no need to warn that it is no TradingCompany
-        ledger = AuctionMarket.distribute_trades(time, trades, shipping_companies, timeout=60)
+        ledger = AuctionMarket().distribute_trades(time, trades, shipping_companies, timeout=60)
         sanitised_ledger = ledger.sanitised_ledger
         assert len(sanitised_ledger) == 3
         assert len(sanitised_ledger["X"]) == 1
@@ -45,7 +120,7 @@ class TestAuctionMarket:
         # Two companies
         # noinspection PyTypeChecker
         # DummyShippingCompany is OK for the test no need to warn that it is no TradingCompany
-        ledger = AuctionMarket.distribute_trades(time, trades, shipping_companies[1:], timeout=60)
+        ledger = AuctionMarket().distribute_trades(time, trades, shipping_companies[1:], timeout=60)
         sanitised_ledger = ledger.sanitised_ledger
         assert len(sanitised_ledger) == 2
         assert len(sanitised_ledger["Y"]) == 1
@@ -59,7 +134,7 @@ class TestAuctionMarket:
         # One company
         # noinspection PyTypeChecker
         # DummyShippingCompany is OK for the test no need to warn that it is no TradingCompany
-        ledger = AuctionMarket.distribute_trades(time, trades, shipping_companies[1:2], timeout=60)
+        ledger = AuctionMarket().distribute_trades(time, trades, shipping_companies[1:2], timeout=60)
         sanitised_ledger = ledger.sanitised_ledger
         assert len(sanitised_ledger) == 1
         assert len(sanitised_ledger["Z"]) == 1
@@ -100,26 +175,184 @@ class TestAuctionMarket:
         shipping_company_2.inform.return_value = [Bid(trade=one_trade, amount=10)]
         shipping_company_3.inform.return_value = [Bid(trade=one_trade, amount=15)]
         shipping_company_4.inform.return_value = [Bid(trade=one_trade, amount=20)]
-        ledger = AuctionMarket.distribute_trades(0, trades, companies, timeout=60)
+        ledger = AuctionMarket().distribute_trades(0, trades, companies, timeout=60)
         self.assert_winner(ledger.sanitised_ledger, "1", ["2", "3", "4"], 10)
         # 2
         shipping_company_1.inform.return_value = [Bid(trade=one_trade, amount=50)]
         shipping_company_2.inform.return_value = [Bid(trade=one_trade, amount=10)]
         shipping_company_3.inform.return_value = [Bid(trade=one_trade, amount=20)]
         shipping_company_4.inform.return_value = [Bid(trade=one_trade, amount=15)]
-        ledger = AuctionMarket.distribute_trades(0, trades, companies, timeout=60)
+        ledger = AuctionMarket().distribute_trades(0, trades, companies, timeout=60)
         self.assert_winner(ledger.sanitised_ledger, "2", ["1", "3", "4"], 15)
         # 3
         shipping_company_1.inform.return_value = [Bid(trade=one_trade, amount=19)]
         shipping_company_2.inform.return_value = [Bid(trade=one_trade, amount=50)]
         shipping_company_3.inform.return_value = [Bid(trade=one_trade, amount=15)]
         shipping_company_4.inform.return_value = [Bid(trade=one_trade, amount=20)]
-        ledger = AuctionMarket.distribute_trades(0, trades, companies, timeout=60)
+        ledger = AuctionMarket().distribute_trades(0, trades, companies, timeout=60)
         self.assert_winner(ledger.sanitised_ledger, "3", ["1", "2", "4"], 19)
         # 4
         shipping_company_1.inform.return_value = [Bid(trade=one_trade, amount=50)]
         shipping_company_2.inform.return_value = [Bid(trade=one_trade, amount=20)]
         shipping_company_3.inform.return_value = [Bid(trade=one_trade, amount=17)]
         shipping_company_4.inform.return_value = [Bid(trade=one_trade, amount=15)]
-        ledger = AuctionMarket.distribute_trades(0, trades, companies, timeout=60)
+        ledger = AuctionMarket().distribute_trades(0, trades, companies, timeout=60)
         self.assert_winner(ledger.sanitised_ledger, "4", ["1", "2", "3"], 17)
+
+    def test_distribute_trades_profiled(self):
+        trades = [TimeWindowTrade(origin_port="A", destination_port="B", amount=1, cargo_type="Oil", time=0)]
+        shipping_companies = [DummyShippingCompany("X", 1), DummyShippingCompany("Y", 2)]
+        profiler = SimulationProfiler()
+        # noinspection PyTypeChecker
+        # DummyShippingCompany is OK for the test no need to warn that it is no TradingCompany
+        ledger = AuctionMarket().distribute_trades(0, trades, shipping_companies, timeout=60, profiler=profiler)
+        assert ledger.sanitised_ledger["X"][0].payment == 2
+        assert profiler.entries["agents"]["inform"].count == 2
+        assert profiler.entries["companies"]["X.inform"].count == 1
+        assert profiler.entries["companies"]["Y.inform"].count == 1
+
+    def test_distribute_trades_concurrently(self):
+        trades = [TimeWindowTrade(origin_port="A", destination_port="B", amount=1, cargo_type="Oil", time=0)]
+        shipping_companies = [SlowDummyShippingCompany(f"C{i}", i + 1) for i in range(5)]
+        start_time = time.perf_counter()
+        # noinspection PyTypeChecker
+        # DummyShippingCompany is OK for the test no need to warn that it is no TradingCompany
+        ledger = AuctionMarket().distribute_trades(0, trades, shipping_companies, timeout=60)
+        assert time.perf_counter() - start_time < 0.2 * len(shipping_companies)
+        assert ledger.sanitised_ledger["C0"][0].payment == 2
+
+    def test_distribute_trades_timeout(self):
+        trades = [TimeWindowTrade(origin_port="A", destination_port="B", amount=1, cargo_type="Oil", time=0)]
+        shipping_companies = [DummyShippingCompany("X", 1), SlowDummyShippingCompany("Y", 0.5, delay=0.5)]
+        # noinspection PyTypeChecker
+        # DummyShippingCompany is OK for the test no need to warn that it is no TradingCompany
+        ledger = AuctionMarket().distribute_trades(0, trades, shipping_companies, timeout=0.1)
+        assert ledger.sanitised_ledger["X"][0].payment == 1
+        assert len(ledger.sanitised_ledger["Y"]) == 0
+
+    def test_distribute_trades_configured_clearing_engine(self):
+        class FirstPriceClearingEngine(SecondPriceClearingEngine):
+
+            def clear(self, bid_matrix):
+                winners, _ = super().clear(bid_matrix)
+                return winners, bid_matrix.min(axis=0)
+
+        trades = [TimeWindowTrade(origin_port="A", destination_port="B", amount=1, cargo_type="Oil", time=0)]
+        shipping_companies = [DummyShippingCompany("X", 1), DummyShippingCompany("Y", 2)]
+        market = AuctionMarket(clearing_engine=FirstPriceClearingEngine())
+        # noinspection PyTypeChecker
+        # DummyShippingCompany is OK for the test no need to warn that it is no TradingCompany
+        ledger = market.distribute_trades(0, trades, shipping_companies, timeout=60)
+        assert ledger.sanitised_ledger["X"][0].payment == 1
+
+    def test_distribute_trades_by_trade_id(self, mocker):
+        trades = [TimeWindowTrade(origin_port="A", destination_port="B", amount=1, cargo_type="Oil", time=0),
+                  TimeWindowTrade(origin_port="A", destination_port="B", amount=1, cargo_type="Oil", time=0)]
+        shipping = DummyShipping(trades=trades)
+        assert [t.trade_id for t in trades] == [0, 1]
+        with pytest.raises(ValueError):
+            shipping.add_to_all_trades(trades[:1])
+        unknown_trade = TimeWindowTrade(origin_port="A", destination_port="C", amount=1, cargo_type="Oil", time=0)
+        unknown_trade.trade_id = 2
+        shipping_company_1 = mocker.MagicMock()
+        shipping_company_1.name = "1"
+        shipping_company_2 = mocker.MagicMock()
+        shipping_company_2.name = "2"
+        # Bids on (equal) copies are matched to the trade with the same id.
+        shipping_company_1.inform.return_value = [Bid(trade=copy.deepcopy(trades[1]), amount=5),
+                                                  Bid(trade=unknown_trade, amount=1)]
+        shipping_company_2.inform.return_value = [Bid(trade=copy.deepcopy(trades[0]), amount=7),
+                                                  Bid(trade=copy.deepcopy(trades[1]), amount=10)]
+        ledger = AuctionMarket().distribute_trades(0, trades, [shipping_company_1, shipping_company_2], timeout=60)
+        sanitised_ledger = ledger.sanitised_ledger
+        assert len(sanitised_ledger["1"]) == 1
+        assert sanitised_ledger["1"][0].trade.trade_id == 1
+        assert sanitised_ledger["1"][0].payment == 10
+        assert len(sanitised_ledger["2"]) == 1
+        assert sanitised_ledger["2"][0].trade.trade_id == 0
+        assert sanitised_ledger["2"][0].payment == 7
+        # Only the lowest of several bids of one company is considered.
+        shipping_company_1.inform.return_value = [Bid(trade=trades[0], amount=5), Bid(trade=trades[0], amount=3)]
+        shipping_company_2.inform.return_value = [Bid(trade=trades[0], amount=4)]
+        ledger = AuctionMarket().distribute_trades(0, trades, [shipping_company_1, shipping_company_2], timeout=60)
+        sanitised_ledger = ledger.sanitised_ledger
+        assert sanitised_ledger["1"][0].payment == 4
+        assert len(sanitised_ledger["2"]) == 0
+
+
+class TestSecondPriceClearingEngine:
+
+    def test_clear(self):
+        inf = np.inf
+        bid_matrix = np.array([[5, inf, 3, inf, 2],
+                               [7, 4, 3, inf, 1],
+                               [6, inf, 8, inf, 2]])
+        winners, payments = SecondPriceClearingEngine().clear(bid_matrix)
+        assert winners.tolist() == [0, 1, 0, -1, 1]
+        assert payments[[0, 1, 2, 4]].tolist() == [6, 4, 3, 2]
+
+    def test_clear_single_company(self):
+        winners, payments = SecondPriceClearingEngine().clear(np.array([[5, np.inf]]))
+        assert winners.tolist() == [0, -1]
+        assert payments[0] == 5
+
+    def test_clear_empty(self):
+        winners, payments = SecondPriceClearingEngine().clear(np.full((0, 2), np.inf))
+        assert winners.tolist() == [-1, -1]
+
+
+class TestAuctionLedger:
+
+    def test_sanitised_ledger_view(self, mocker):
+        port_a = Port("A", 0, 0)
+        port_b = Port("B", 1, 1)
+        trade = TimeWindowTrade(origin_port=port_a, destination_port=port_b, amount=1, cargo_type="Oil", time=0)
+        company_1 = mocker.MagicMock()
+        company_1.name = "1"
+        company_2 = mocker.MagicMock()
+        company_2.name = "2"
+        ledger = AuctionLedger([company_1, company_2])
+        ledger[company_1] = Contract(payment=5, trade=trade)
+        view = ledger.sanitised_ledger_view
+        assert view is ledger.sanitised_ledger_view
+        assert dict(view) == {"1": (Contract(payment=5, trade=trade),), "2": ()}
+        assert view["1"][0].trade is not trade
+        assert view["1"][0].trade.origin_port is port_a
+        with pytest.raises(TypeError):
+            view["2"] = ()
+        assert pickle.loads(pickle.dumps(view))["1"][0].payment == 5
+        contract = view["1"][0]
+        assert type(contract) is ReadOnlyProxy
+        assert not isinstance(contract, Contract)
+        assert type(contract.trade) is ReadOnlyProxy
+        assert contract.trade == trade
+        assert contract.trade.latest_pickup is None
+        with pytest.raises(AttributeError):
+            contract.payment = 0
+        with pytest.raises(AttributeError):
+            contract.trade.time_window = [0, 0, 0, 0]
+        assert contract.trade.time_window == (None, None, None, None)
+        assert copy.deepcopy(contract) == contract
+        contract_copy = contract.copy()
+        assert type(contract_copy) is Contract
+        contract_copy.payment = 0
+        assert contract.payment == 5
+        company_contracts = ledger.get_trades_for_company_copy(company_1)
+        assert company_contracts[0] is not view["1"][0]
+        assert company_contracts[0].trade.destination_port is port_b
+
+    def test_read_only_proxy_methods(self):
+        @attrs.define
+        class Counter:
+            count: int = 0
+
+            def increment(self):
+                self.count += 1
+
+        proxy = ReadOnlyProxy(Counter())
+        with pytest.raises(AttributeError):
+            proxy.increment()
+        assert proxy.count == 0
+        counter_copy = proxy.copy()
+        counter_copy.increment()
+        assert counter_copy.count == 1
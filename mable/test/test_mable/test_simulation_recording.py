@@ -0,0 +1,124 @@
+"""
+Tests for simulation_recording module.
+"""
+
+import numpy as np
+import pytest
+
+from mable.engine import SimulationEngine
+from mable.event_management import Event, EventObserver, EventQueue, VesselEvent
+from mable.simulation_environment import World
+from mable.simulation_generation import ClassFactory
+from mable.simulation_recording import SimulationRecorder, SimulationReplayEngine, ReplayNetwork
+from mable.simulation_space.structure import UnitShippingNetwork
+from mable.simulation_space.universe import Port
+from mable.transport_operation import CargoCapacity, ShippingCompany, SimpleVessel
+
+
+class DummyObserver(EventObserver):
+
+    def __init__(self):
+        self.observations = []
+
+    def notify(self, engine, event, data):
+        location_name = None
+        if isinstance(event, VesselEvent):
+            location_name = event.vessel.location.name
+        self.observations.append((engine.world.current_time, type(event).__name__, event.info, location_name))
+
+
+class StateEvent(Event):
+
+    def __init__(self, time, state):
+        super().__init__(time, f"Event {time}")
+        self.state = state
+
+    def event_action(self, engine):
+        self.state.append(self.time)
+
+
+class StateObserver(EventObserver):
+
+    OBSERVED_EVENT_TYPES = (StateEvent,)
+
+    def __init__(self):
+        self.observations = []
+
+    def notify(self, engine, event, data):
+        self.observations.append(list(event.state))
+
+
+class DummyShipping:
+
+    @staticmethod
+    def get_trading_times():
+        return []
+
+
+def get_recorded_engine(file_path):
+    ports = [Port("A", 0, 0), Port("B", 1, 1)]
+    world = World(UnitShippingNetwork(ports), EventQueue(), np.random.RandomState(0))
+    vessel = SimpleVessel([CargoCapacity("Oil", capacity=100, loading_rate=5)], None, speed=10, name="V1")
+    company = ShippingCompany([vessel], "Company 1")
+    engine = SimulationEngine(world, [company], DummyShipping(), None, ClassFactory(), recorder=SimulationRecorder(file_path))
+    world.set_engine(engine)
+    world.network.set_engine(engine)
+    company.set_engine(engine)
+    for one_time in range(1, 4):
+        world.event_queue.put(Event(one_time, f"Event {one_time}"))
+    engine.register_event_observer(DummyObserver())
+    return engine
+
+
+class TestSimulationRecording:
+
+    def test_record_replay(self, tmp_path):
+        file_path = tmp_path / "recording.mablelog"
+        engine = get_recorded_engine(file_path)
+        engine.run()
+        assert not engine.recorder.is_recording
+        replay = SimulationReplayEngine(file_path)
+        replay_observer = DummyObserver()
+        replay.register_event_observer(replay_observer)
+        replay.run()
+        assert replay_observer.observations == engine.get_event_observers()[0].observations
+        assert len(replay_observer.observations) == 4
+        assert [c.name for c in replay.shipping_companies] == ["Company 1"]
+        replay_vessel = replay.shipping_companies[0].fleet[0]
+        assert replay_vessel.name == "V1"
+        assert replay_vessel.location == engine.shipping_companies[0].fleet[0].location
+        assert replay.find_company_for_vessel(replay_vessel) is replay.shipping_companies[0]
+        assert replay.world.current_time == 3
+
+    def test_record_replay_state_changes(self, tmp_path):
+        file_path = tmp_path / "recording.mablelog"
+        engine = get_recorded_engine(file_path)
+        state = []
+        for one_time in range(4, 7):
+            engine.world.event_queue.put(StateEvent(one_time, state))
+        engine.register_event_observer(StateObserver())
+        engine.run()
+        replay = SimulationReplayEngine(file_path)
+        replay_observer = StateObserver()
+        replay.register_event_observer(replay_observer)
+        replay.run()
+        assert replay_observer.observations[-3:] == [[4], [4, 5], [4, 5, 6]]
+        assert replay_observer.observations == engine.get_event_observers()[1].observations
+        replay_vessel = replay.shipping_companies[0].fleet[0]
+        assert replay.find_company_for_vessel(replay_vessel) is replay.shipping_companies[0]
+
+    def test_replay_no_recording(self, tmp_path):
+        file_path = tmp_path / "no_recording.mablelog"
+        file_path.write_bytes(b"")
+        with pytest.raises(ValueError):
+            SimulationReplayEngine(file_path)
+
+
+class TestReplayNetwork:
+
+    def test_get_distance(self):
+        network = ReplayNetwork([Port("A", 0, 0), Port("B", 1, 1)])
+        network.add_distances({("A", "B"): 5})
+        assert network.get_distance("A", network.get_port("B")) == 5
+        with pytest.raises(ValueError):
+            network.get_distance("B", "A")
@@ -5,6 +5,7 @@ Tests for STN module.
 import copy
 import pytest
 
+import networkx as nx
 import numpy as np
 
 from mable.engine import SimulationEngine
@@ -13,7 +14,7 @@ from mable.event_management import ArrivalEvent, CargoTransferEvent, IdleEvent,
 from mable.simulation_environment import World
 from mable.extensions.cargo_distributions import TimeWindowTrade
 from mable.extensions.fuel_emissions import VesselWithEngine, VesselEngine, Fuel, ConsumptionRate
-from mable.transportation_scheduling import (Schedule, TransportationStartFinishIndicator,
+from mable.transportation_scheduling import (Schedule, ArraySchedule, TransportationStartFinishIndicator,
                                              TransportationSourceDestinationIndicator)
 from mable.transport_operation import CargoCapacity, ShippingCompany
 
@@ -100,6 +101,69 @@ class StorageObserver(EventObserver):
         self._observed_events.append(event)
 
 
+def has_negative_simple_cycle(schedule):
+    """
+    Reference check for negative cycles in a schedule's STN by enumerating all simple cycles.
+    """
+    stn = schedule._stn
+    for cycle in nx.simple_cycles(stn):
+        if sum(stn[u][v]["weight"] for u, v in zip(cycle, cycle[1:] + [cycle[0]])) < 0:
+            return True
+    return False
+
+
+RANDOM_SCHEDULE_PORTS = ["A", "B", "C", "D"]
+
+
+def generate_random_trades(seed, schedule_types=(Schedule,), number_schedules=50, max_number_trades=3,
+                           max_amount=1, latest_time=120, vessel=None):
+    """
+    Generate random trades for random empty schedules.
+
+    For every schedule setting, random distances between the ports are drawn and one schedule per schedule type is
+    created for the same vessel and world. Then, up to max_number_trades random trades are generated which the
+    caller may add to the schedules.
+
+    :return: Per trade, the random state, the world, the schedules (one per schedule type) and the trade.
+    """
+    if vessel is None:
+        vessel = copy.deepcopy(VESSEL)
+        vessel.location = "A"
+    random = np.random.RandomState(seed)
+    for _ in range(number_schedules):
+        distances = {(p_1, p_2): random.randint(1, 30)
+                     for i, p_1 in enumerate(RANDOM_SCHEDULE_PORTS) for p_2 in RANDOM_SCHEDULE_PORTS[i + 1:]}
+        world = DummyWorld(distances)
+        engine = DummyEngine(world, DummyClassFactory())
+        schedules = []
+        for one_schedule_type in schedule_types:
+            schedule = one_schedule_type(vessel)
+            schedule.set_engine(engine)
+            schedules.append(schedule)
+        for _ in range(random.randint(1, max_number_trades + 1)):
+            origin, destination = random.choice(RANDOM_SCHEDULE_PORTS, 2, replace=False)
+            time_window = [None, None, None, None]
+            if random.random_sample() < 0.5:
+                time_window[1] = int(random.randint(0, latest_time // 2))
+            if random.random_sample() < 0.5:
+                time_window[3] = int(random.randint(0, latest_time))
+            trade = TimeWindowTrade(origin_port=origin, destination_port=destination,
+                                    amount=int(random.randint(1, max_amount + 1)), cargo_type="Oil",
+                                    time_window=time_window)
+            yield random, world, schedules, trade
+
+
+def add_transportation_randomly(random, schedules, trade):
+    """
+    Add a trade at the same random pick-up and drop-off points to all schedules.
+    """
+    insertion_points = schedules[0].get_insertion_points()
+    pick_up = int(random.choice(insertion_points))
+    drop_off = int(random.choice([i for i in insertion_points if i >= pick_up]))
+    for one_schedule in schedules:
+        one_schedule.add_transportation(trade, pick_up, drop_off)
+
+
 class TestSchedule:
 
     def test__get_distance_matrix(self):
@@ -237,6 +301,155 @@ class TestSchedule:
         schedule_invalid_5._add_task(1, trade_8, TransportationSourceDestinationIndicator.DROP_OFF, 0)
         schedule_invalid_5._add_task(2, trade_8, TransportationSourceDestinationIndicator.PICK_UP, 0)
         assert schedule_invalid_5.verify_schedule() is False
+        # The negative cycle detection is equivalent to enumerating all cycles.
+        for one_schedule in [schedule_valid_1, schedule_valid_2, schedule_valid_3, schedule_invalid_0,
+                             schedule_invalid_1, schedule_invalid_2, schedule_invalid_3, schedule_invalid_4,
+                             schedule_invalid_5]:
+            assert one_schedule.verify_schedule_time() is not has_negative_simple_cycle(one_schedule)
+
+    def test_verify_schedule_time_random(self):
+        schedules = {}
+        for random, _, (schedule,), trade in generate_random_trades(0):
+            add_transportation_randomly(random, [schedule], trade)
+            schedules[id(schedule)] = schedule
+        for one_schedule in schedules.values():
+            assert one_schedule.verify_schedule_time() is not has_negative_simple_cycle(one_schedule)
+
+    def test_incremental_shortest_paths(self):
+        # Verifying right after adding a trade uses the incrementally updated shortest paths.
+        number_consistent_schedules = 0
+        for random, _, (schedule,), trade in generate_random_trades(1):
+            add_transportation_randomly(random, [schedule], trade)
+            is_time_consistent = schedule.verify_schedule_time()
+            assert is_time_consistent is not has_negative_simple_cycle(schedule)
+            number_consistent_schedules += is_time_consistent
+        assert number_consistent_schedules > 0
+
+    @staticmethod
+    def assert_equivalent_schedules(schedule, array_schedule):
+        assert len(array_schedule) == len(schedule)
+        assert array_schedule.get_simple_schedule() == schedule.get_simple_schedule()
+        assert (sorted(id(t) for t in array_schedule.get_scheduled_trades())
+                == sorted(id(t) for t in schedule.get_scheduled_trades()))
+        assert list(array_schedule.get_insertion_points()) == list(schedule.get_insertion_points())
+        assert array_schedule.completion_time() == pytest.approx(schedule.completion_time())
+        assert array_schedule.verify_schedule_time() is schedule.verify_schedule_time()
+        assert array_schedule.verify_schedule_cargo() is schedule.verify_schedule_cargo()
+        events = [array_schedule[i] for i in range(len(array_schedule))]
+        assert [(type(e), e.time) for e in events] == [(type(e), e.time) for e in schedule]
+
+    def test_array_schedule_equivalence(self):
+        for random, _, (schedule, array_schedule), trade in generate_random_trades(
+                2, schedule_types=(Schedule, ArraySchedule), number_schedules=30, max_number_trades=7, max_amount=9):
+            if len(schedule) > 0 and random.random_sample() < 0.3:
+                assert array_schedule.pop().time == schedule.pop().time
+            else:
+                add_transportation_randomly(random, [schedule, array_schedule], trade)
+            self.assert_equivalent_schedules(schedule, array_schedule)
+            array_schedule_copy = array_schedule.copy()
+            assert isinstance(array_schedule_copy, ArraySchedule)
+            self.assert_equivalent_schedules(schedule.copy(), array_schedule_copy)
+
+    def test_array_schedule_copy_is_independent(self):
+        schedule = ArraySchedule(VESSEL)
+        schedule.set_engine(DummyEngine(DummyWorld()))
+        schedule.add_transportation(DUMMY_TRADE)
+        schedule_copy = schedule.copy()
+        schedule_copy.add_transportation(DUMMY_TRADE)
+        assert len(schedule) == 4
+        assert len(schedule_copy) == 8
+
+    @pytest.mark.parametrize("schedule_type", [Schedule, ArraySchedule])
+    def test_copy_on_write(self, schedule_type):
+        trade_1, trade_2, trade_3, trade_4, vessel, schedule = self.get_pop_setup([None, None, None, None])
+        schedule = schedule_type(vessel)
+        schedule.set_engine(DummyEngine(DummyWorld(), DummyClassFactory()))
+        schedule.add_transportation(trade_1)
+        schedule_copy = schedule.copy()
+        assert schedule_copy._stn is schedule._stn
+        schedule_copy.add_transportation(trade_2)
+        assert schedule_copy._stn is not schedule._stn
+        assert schedule.get_simple_schedule() == [("PICK_UP", trade_1), ("DROP_OFF", trade_1)]
+        assert len(schedule_copy) == 8
+        schedule_copy_2 = schedule.copy()
+        schedule.pop()
+        assert len(schedule) == 3
+        assert len(schedule_copy_2) == 4
+        assert schedule_copy_2.verify_schedule_time()
+        np.testing.assert_array_equal(schedule_copy_2._get_distance_matrix(),
+                                      schedule_copy_2.copy()._get_distance_matrix())
+
+    def test_schedule_view(self):
+        schedule = Schedule(VESSEL)
+        schedule.set_engine(DummyEngine(DummyWorld()))
+        view = schedule.view()
+        schedule.add_transportation(DUMMY_TRADE)
+        assert len(view) == 4
+        assert view.get_simple_schedule() == schedule.get_simple_schedule()
+        assert view.completion_time() == schedule.completion_time()
+        assert view.verify_schedule()
+        assert not hasattr(view, "add_transportation")
+        schedule_copy = view.copy()
+        schedule_copy.add_transportation(DUMMY_TRADE)
+        assert len(view) == 4
+
+    @staticmethod
+    def get_route_distance(schedule, world, vessel):
+        route = [vessel.location] + [
+            trade.origin_port if location_type == "PICK_UP" else trade.destination_port
+            for location_type, trade in schedule.get_simple_schedule()]
+        return sum(world.get_distance(p_1, p_2) for p_1, p_2 in zip(route, route[1:]))
+
+    @pytest.mark.parametrize("schedule_type", [Schedule, ArraySchedule])
+    def test_evaluate_insertions(self, schedule_type):
+        vessel = VesselWithEngine([CargoCapacity("Oil", capacity=20, loading_rate=5)], "A", speed=1,
+                                  propelling_engine=VESSEL.propelling_engine, name="Small")
+        number_feasible_insertions = 0
+        for random, world, (schedule,), trade in generate_random_trades(
+                3, schedule_types=(schedule_type,), number_schedules=30, max_number_trades=5, max_amount=11,
+                latest_time=160, vessel=vessel):
+            insertion_points = list(schedule.get_insertion_points())
+            expected = []
+            for pick_up in insertion_points:
+                for drop_off in insertion_points:
+                    if drop_off >= pick_up:
+                        new_schedule = schedule.copy()
+                        new_schedule.add_transportation(trade, pick_up, drop_off)
+                        if new_schedule.verify_schedule():
+                            expected.append((pick_up, drop_off, new_schedule.completion_time(),
+                                             self.get_route_distance(new_schedule, world, vessel)
+                                             - self.get_route_distance(schedule, world, vessel)))
+            evaluations = schedule.evaluate_insertions(trade)
+            assert [(e.pick_up, e.drop_off) for e in evaluations] == [e[:2] for e in expected]
+            for one_evaluation, one_expected in zip(evaluations, expected):
+                assert one_evaluation.completion_time == pytest.approx(one_expected[2])
+                assert one_evaluation.added_travel_distance == pytest.approx(one_expected[3])
+            number_feasible_insertions += len(expected)
+            if len(expected) > 0 and random.random_sample() < 0.8:
+                pick_up, drop_off = expected[random.randint(len(expected))][:2]
+                schedule.add_transportation(trade, pick_up, drop_off)
+            elif len(schedule) > 0:
+                schedule.pop()
+        assert number_feasible_insertions > 0
+
+    def test_evaluate_insertions_points(self):
+        schedule = Schedule(VESSEL)
+        schedule.set_engine(DummyEngine(DummyWorld()))
+        schedule.add_transportation(DUMMY_TRADE)
+        evaluations = schedule.evaluate_insertions(DUMMY_TRADE, pickup_points=[2], dropoff_points=[1, 2, 3])
+        assert [(e.pick_up, e.drop_off) for e in evaluations] == [(2, 2), (2, 3)]
+        with pytest.raises(ValueError):
+            schedule.evaluate_insertions(DUMMY_TRADE, pickup_points=[5])
+
+    def test_shortest_paths_invalidated_on_pop(self):
+        trade_1, trade_2, trade_3, trade_4, vessel, schedule = self.get_pop_setup([None, None, None, None])
+        schedule.add_transportation(trade_1)
+        schedule.add_transportation(trade_2)
+        assert schedule._is_time_consistent is True
+        schedule.pop()
+        assert schedule._is_time_consistent is None
+        assert schedule.verify_schedule_time()
+        assert schedule._shortest_paths.shape == (len(schedule._stn), len(schedule._stn))
 
     @staticmethod
     def get_pop_setup(setting):